@@ -0,0 +1,70 @@
+"""Compare the scalar and NumPy array paths of mymath.basic and mymath.geometry.
+
+Usage:
+    python bench_arrays.py [SIZE ...]
+
+For each size (1e3 to 1e8 float64 elements by default) times every
+function three ways, in nanoseconds per element:
+
+- a Python loop calling the scalar function once per element (only up to
+  LOOP_LIMIT elements; beyond that it takes minutes and gigabytes of
+  Python floats),
+- one call on the arrays, allocating the result,
+- one call on the arrays with a preallocated `out=` array, reused across
+  repeats.
+
+The 1e8 size needs about 3.5 GB of memory.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from mymath import basic, geometry
+
+LOOP_LIMIT = 1_000_000
+
+
+def timed(function, elements):
+    """Return the best time of a few runs of a function, in nanoseconds per element."""
+    repeat = max(1, min(100, 10_000_000 // elements))
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best / elements * 1e9
+
+
+def main(sizes):
+    print(f"{'function':<18} {'size':>12} {'loop ns':>9} {'array ns':>9} {'out= ns':>9} {'speedup':>8}")
+    for size in sizes:
+        rng = np.random.default_rng(42)
+        first = rng.uniform(0, 100, size)
+        second = rng.uniform(0, 100, size)
+        out = np.empty(size)
+        cases = [
+            ("square", basic.square, (first,)),
+            ("double", basic.double, (first,)),
+            ("add", basic.add, (first, second)),
+            ("area_of_rectangle", geometry.area_of_rectangle, (first, second)),
+            ("area_of_circle", geometry.area_of_circle, (first,)),
+        ]
+        for name, function, arrays in cases:
+            loop = ""
+            if size <= LOOP_LIMIT:
+                values = [array.tolist() for array in arrays]
+                loop_ns = timed(lambda: [function(*pair) for pair in zip(*values)], size)
+                loop = f"{loop_ns:>9.1f}"
+                del values
+            array_ns = timed(lambda: function(*arrays), size)
+            out_ns = timed(lambda: function(*arrays, out=out), size)
+            speedup = f"{loop_ns / out_ns:>7.0f}x" if loop else ""
+            print(f"{name:<18} {size:>12,} {loop:>9} {array_ns:>9.2f} {out_ns:>9.2f} {speedup:>8}")
+        del first, second, out
+
+
+if __name__ == "__main__":
+    main([int(float(size)) for size in sys.argv[1:]] or [10**exponent for exponent in range(3, 9)])
@@ -0,0 +1,56 @@
+"""Check that importing mymath stays within an import-time budget.
+
+Usage:
+    python bench_import.py [BUDGET_US]
+
+Starts RUNS fresh interpreters with `-X importtime -c "import mymath"`,
+reads the cumulative time of the `mymath` line from each report and
+compares the median with BUDGET_US microseconds (default 1500). Exits
+with status 1 when the budget is exceeded, so it can run as a check in
+CI, and prints what first use of each submodule costs for reference.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 15
+DEFAULT_BUDGET_US = 1500
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_time(statement, module):
+    """Return the cumulative import time of a module, in microseconds, when
+    running a statement in a fresh interpreter with -X importtime."""
+    report = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], cwd=HERE, capture_output=True, text=True, check=True
+    ).stderr
+    # Lines look like "import time:       683 |        683 | mymath"; the
+    # imported name is indented by its nesting level
+    for line in report.splitlines():
+        fields = line.split("|")
+        if line.startswith("import time:") and len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise RuntimeError(f"{module} was not imported by {statement!r}")
+
+
+def median_import_time(statement, module):
+    """Return the median of RUNS measurements of `import_time`."""
+    return statistics.median(import_time(statement, module) for _ in range(RUNS))
+
+
+def main(budget):
+    package = median_import_time("import mymath", "mymath")
+    print(f"{'import mymath':<34} {package:>8,.0f} us (budget {budget:,} us)")
+    for name in ("basic", "geometry", "stats", "streaming", "parallel"):
+        first_use = median_import_time(f"import mymath; mymath.{name}", f"mymath.{name}")
+        print(f"{'first use of mymath.' + name:<34} {first_use:>8,.0f} us")
+    if package > budget:
+        print(f"FAIL: import mymath took {package:,.0f} us, over the {budget:,} us budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_US))
@@ -0,0 +1,79 @@
+"""Measure how mymath.parallel reductions scale with the number of processes.
+
+Usage:
+    python bench_parallel.py [SIZE [WORKERS ...]]
+
+Writes SIZE (default 100M, 800 MB) log-normal float64 numbers to a `.npy`
+file, memory-maps it and times `total`, `describe` and `median` on 1, 2,
+4, ... processes up to the CPU count (or the given worker counts), against
+single-process NumPy (`np.sum`, `np.var` and `np.median`, which needs a
+copy of the data to partition). Each result is checked against NumPy.
+
+Speedups are relative to one worker; near-linear scaling needs as many
+idle cores as workers and a file that stays in the page cache.
+"""
+
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from mymath import parallel
+
+
+def timed(function):
+    """Return the result of a function and its run time in seconds."""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def worker_counts():
+    """Return 1, 2, 4, ... up to and including the CPU count."""
+    cpus = os.cpu_count() or 1
+    counts = [2 ** power for power in range(cpus.bit_length()) if 2 ** power < cpus]
+    return counts + [cpus]
+
+
+def main(size, counts):
+    path = os.path.join(tempfile.mkdtemp(), "numbers.npy")
+    try:
+        rng = np.random.default_rng(42)
+        data = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(size,))
+        for start in range(0, size, parallel.CHUNK_SIZE * 16):
+            stop = min(start + parallel.CHUNK_SIZE * 16, size)
+            data[start:stop] = rng.lognormal(3, 1, stop - start)
+        data.flush()
+        numbers = parallel.load(path)
+        print(f"{size:,} numbers, {numbers.nbytes / 2**20:,.0f} MB, {os.cpu_count()} CPUs")
+
+        expected_total, numpy_total = timed(lambda: np.sum(numbers))
+        expected_variance, numpy_variance = timed(lambda: np.var(numbers))
+        expected_median, numpy_median = timed(lambda: np.median(numbers))
+        print(f"\n{'reduction':<10} {'workers':>8} {'seconds':>8} {'speedup':>8}")
+        print(f"{'total':<10} {'NumPy':>8} {numpy_total:>8.2f}")
+        print(f"{'describe':<10} {'NumPy':>8} {numpy_variance:>8.2f}")
+        print(f"{'median':<10} {'NumPy':>8} {numpy_median:>8.2f}")
+
+        reductions = [
+            ("total", lambda workers: parallel.total(numbers, workers), expected_total),
+            ("describe", lambda workers: parallel.describe(numbers, workers).variance(), expected_variance),
+            ("median", lambda workers: parallel.median(numbers, workers), expected_median),
+        ]
+        for name, reduction, expected in reductions:
+            single = None
+            for workers in counts:
+                result, elapsed = timed(lambda: reduction(workers))
+                single = single or elapsed
+                assert math.isclose(result, expected, rel_tol=1e-9), (name, result, expected)
+                print(f"{name:<10} {workers:>8} {elapsed:>8.2f} {single / elapsed:>7.2f}x")
+    finally:
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 100_000_000, [int(count) for count in sys.argv[2:]] or worker_counts())
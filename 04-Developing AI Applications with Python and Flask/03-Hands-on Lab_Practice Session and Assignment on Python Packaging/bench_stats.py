@@ -0,0 +1,80 @@
+"""Compare the mymath median and summary statistics strategies.
+
+Usage:
+    python bench_stats.py [SIZE ...]
+
+For each size (100k, 1M and 4M numbers by default) times:
+
+- the median by sorting a copy (what `stats.median` used to do, in place),
+  by selection (`stats.median`, exact) and by a t-digest fed from a
+  generator (`streaming.TDigest`, estimated, bounded memory),
+- mean, variance, min and max over a generator with `RunningStats`, one
+  number at a time and a chunk at a time, against the same figures from
+  `statistics` on a materialized list,
+
+and the peak memory (tracemalloc) of the streaming passes, which must
+not grow with the size.
+"""
+
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from mymath import stats
+from mymath.streaming import RunningStats, TDigest
+
+CHUNK_SIZE = 65536
+
+
+def numbers(size, seed=42):
+    """Yield `size` log-normally distributed numbers (a skewed, latency-like sample)."""
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield rng.lognormvariate(3, 1)
+
+
+def chunks(size, seed=42):
+    """Yield the same numbers as `numbers`, CHUNK_SIZE at a time in lists."""
+    stream = numbers(size, seed)
+    while chunk := [number for _, number in zip(range(CHUNK_SIZE), stream)]:
+        yield chunk
+
+
+def measure(function):
+    """Return the result of a function, its run time in seconds and its peak traced memory in MB."""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def main(sizes):
+    print(f"{'size':>10} {'method':<34} {'seconds':>8} {'peak MB':>8} {'result':>12}")
+    for size in sizes:
+        data = list(numbers(size))
+        exact = statistics.median(data)
+        rows = [
+            ("median, sorted copy", lambda: statistics.median(data)),
+            ("median, selection", lambda: stats.median(data)),
+            ("median, t-digest over a generator", lambda: TDigest(numbers(size)).median()),
+            ("variance, statistics on a list", lambda: statistics.pvariance(data)),
+            ("variance, Welford over a generator", lambda: RunningStats(numbers(size)).variance()),
+            ("variance, RunningStats by chunks", lambda: RunningStats.from_chunks(chunks(size)).variance()),
+        ]
+        for label, function in rows:
+            result, elapsed, peak = measure(function)
+            print(f"{size:>10,} {label:<34} {elapsed:>8.2f} {peak:>8.1f} {result:>12.4f}")
+        estimate = TDigest(numbers(size)).median()
+        rank = sum(number < estimate for number in data) / size
+        print(f"{size:>10,} {'t-digest median rank error':<34} {'':>8} {'':>8} {rank - 0.5:>12.5f}")
+        assert stats.median(data) == exact
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [100_000, 1_000_000, 4_000_000])
@@ -1,3 +1,28 @@
-from . import basic
-from . import stats
-from . import geometry
\ No newline at end of file
+# Submodules, each imported on first use (e.g. mymath.stats.mean(...)), so that
+# `import mymath` costs almost nothing and only the code actually used is loaded
+SUBMODULES = ("arrays", "basic", "geometry", "parallel", "stats", "streaming")
+
+__all__ = list(SUBMODULES)
+
+
+def __getattr__(name):
+    """
+    This function imports a submodule the first time it is accessed as an
+    attribute of the package; the import then stores it on the package, so
+    later accesses do not come back here.
+
+    :param name: the attribute name
+    """
+    if name in SUBMODULES:
+        # Like an import statement (and unlike importlib.import_module), this
+        # goes through the import that -X importtime reports
+        __import__(f"{__name__}.{name}")
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    """
+    This function lists the package's attributes, including the submodules
+    not imported yet.
+    """
+    return sorted({*globals(), *SUBMODULES})
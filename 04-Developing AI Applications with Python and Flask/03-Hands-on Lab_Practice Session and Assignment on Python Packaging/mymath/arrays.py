@@ -0,0 +1,38 @@
+import sys
+
+# Types answered by the plain Python arithmetic without any further check
+SCALAR_TYPES = (int, float, complex, bool)
+# Sequences and buffers whose operators already mean something else
+# (e.g. double([1, 2]) is [1, 2, 1, 2]), so they are never converted
+PYTHON_SEQUENCES = (str, bytes, bytearray, list, tuple)
+
+
+def as_array(value):
+    """
+    This function returns the given value as a NumPy array if it is an array
+    or a buffer (an array.array, a memoryview, ...), and None otherwise.
+
+    NumPy is only imported when an array or a buffer is given, so scalar
+    callers do not need it, nor pay for importing it.
+
+    :param value: a number, a NumPy array or an object with the buffer protocol
+    """
+    if type(value) in SCALAR_TYPES or isinstance(value, PYTHON_SEQUENCES):
+        return None
+    # An existing array means NumPy is loaded already; check for one first
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and type(value) is numpy.ndarray:
+        return value
+    # Imported here: most callers pass floats and ints and never get this far
+    import numbers
+
+    if isinstance(value, numbers.Number):  # e.g. numpy.float64 or Fraction
+        return None
+    if not hasattr(value, "__array__") and not hasattr(value, "__array_interface__"):
+        try:
+            memoryview(value)
+        except TypeError:
+            return None
+    import numpy
+
+    return numpy.asarray(value)
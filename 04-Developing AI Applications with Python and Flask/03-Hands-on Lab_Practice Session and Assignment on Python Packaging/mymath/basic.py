@@ -1,17 +1,60 @@
-def square(number):
+from .arrays import SCALAR_TYPES, as_array
+
+
+def square(number, out=None):
     """
     This function returns the square of a given number
+
+    Given a NumPy array or a buffer, it returns the element-wise squares
+    in one vectorized call.
+
+    :param number: a number, a NumPy array or a buffer
+    :param out: optional array to write the result into, instead of allocating one
     """
-    return number ** 2
+    if out is None and type(number) in SCALAR_TYPES:
+        return number ** 2
+    array = as_array(number)
+    if array is None and out is None:
+        return number ** 2
+    import numpy
+
+    return numpy.square(number if array is None else array, out=out)
 
-def double(number):
+def double(number, out=None):
     """
     This function returns twice the value of a given number
+
+    Given a NumPy array or a buffer, it returns the element-wise doubles
+    in one vectorized call.
+
+    :param number: a number, a NumPy array or a buffer
+    :param out: optional array to write the result into, instead of allocating one
     """
-    return number * 2
+    if out is None and type(number) in SCALAR_TYPES:
+        return number * 2
+    array = as_array(number)
+    if array is None and out is None:
+        return number * 2
+    import numpy
+
+    return numpy.multiply(number if array is None else array, 2, out=out)
 
-def add(a, b):
+def add(a, b, out=None):
     """
     This function returns the sum of given numbers
+
+    If either is a NumPy array or a buffer, it returns the element-wise sums
+    in one vectorized call (a number is added to every element).
+
+    :param a: a number, a NumPy array or a buffer
+    :param b: a number, a NumPy array or a buffer
+    :param out: optional array to write the result into, instead of allocating one
     """
-    return a + b
\ No newline at end of file
+    if out is None and type(a) in SCALAR_TYPES and type(b) in SCALAR_TYPES:
+        return a + b
+    array_a, array_b = as_array(a), as_array(b)
+    if array_a is None and array_b is None and out is None:
+        return a + b
+    import numpy
+
+    return numpy.add(a if array_a is None else array_a, b if array_b is None else array_b, out=out)
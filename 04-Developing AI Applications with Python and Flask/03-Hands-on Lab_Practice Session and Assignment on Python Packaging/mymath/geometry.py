@@ -1,17 +1,49 @@
 import math
-def area_of_rectangle(b, h):
+
+from .arrays import SCALAR_TYPES, as_array
+
+
+def area_of_rectangle(b, h, out=None):
     """
     This function returns the area of a rectangle
-    
+
+    If either side is a NumPy array or a buffer, it returns the areas of
+    all the rectangles in one vectorized call.
+
     :param b: base (with) of the rectangle
     :param h: Height of the rectangle
+    :param out: optional array to write the areas into, instead of allocating one
     """
-    return(b * h)
+    if out is None and type(b) in SCALAR_TYPES and type(h) in SCALAR_TYPES:
+        return(b * h)
+    array_b, array_h = as_array(b), as_array(h)
+    if array_b is None and array_h is None and out is None:
+        return(b * h)
+    import numpy
 
-def area_of_circle(r):
+    return numpy.multiply(b if array_b is None else array_b, h if array_h is None else array_h, out=out)
+
+def area_of_circle(r, out=None):
     """
     This function returns the area of a circle
-    
+
+    If the radius is a NumPy array or a buffer, it returns the areas of all
+    the circles in one vectorized call. Integer radii give float64 areas.
+
     :param r: radius of the circle
+    :param out: optional array to write the areas into, instead of allocating one;
+        with it, no temporary array is allocated either
     """
-    return((math.pi)*(r**2))
\ No newline at end of file
+    if out is None and type(r) in SCALAR_TYPES:
+        return((math.pi)*(r**2))
+    array = as_array(r)
+    if array is None and out is None:
+        return((math.pi)*(r**2))
+    import numpy
+
+    radii = r if array is None else array
+    if out is None:
+        out = numpy.empty(numpy.shape(radii), numpy.result_type(radii, math.pi))
+    # Square into the output, then scale it there: r**2 and pi * r**2 share one array
+    numpy.multiply(radii, radii, out=out)
+    return numpy.multiply(out, math.pi, out=out)
@@ -0,0 +1,286 @@
+import contextlib
+import math
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .streaming import RunningStats
+
+# Elements reduced by one task; a chunk of float64 is 8 MB
+CHUNK_SIZE = 1 << 20
+# Rows a chunk is split into by `total`, which adds them with compensation per column
+SUM_ROWS = 256
+# Buckets of each histogram pass of `median` and `quantile`
+HISTOGRAM_BINS = 4096
+# Once this few numbers are left around the wanted ranks, they are selected directly
+GATHER_LIMIT = 1 << 20
+
+
+def load(path, dtype="<f8"):
+    """
+    This function memory-maps a numeric file without reading it.
+
+    The result can be given to the functions of this module, whose workers
+    then map the same file instead of receiving a copy of the data.
+
+    :param path: a `.npy` file, or a raw binary file of `dtype` numbers
+    :param dtype: the type of the numbers of a raw file (ignored for `.npy`,
+        whose header gives it); little-endian float64 by default
+    """
+    if os.fspath(path).endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return np.memmap(path, dtype=dtype, mode="r")
+
+def total(numbers, workers=None):
+    """
+    This function returns the sum of the given numbers, computed in parallel.
+
+    Both the numbers of each chunk and the partial sums of the chunks are added
+    with Neumaier's compensated summation, so cancellation (large numbers of
+    opposite signs) does not swamp the small ones.
+
+    :param numbers: a NumPy array (possibly memory-mapped, see `load`), a buffer
+        or a list of numbers
+    :param workers: the number of processes, the number of CPUs by default
+    """
+    with _pool(numbers, workers) as (run, length):
+        return _neumaier(part for partial in run(_chunk_sum) for part in partial)
+
+def mean(numbers, workers=None):
+    """
+    This function returns the mean of the given numbers, computed in parallel.
+
+    :param numbers: a NumPy array (possibly memory-mapped), a buffer or a list
+    :param workers: the number of processes, the number of CPUs by default
+    """
+    with _pool(numbers, workers) as (run, length):
+        if not length:
+            raise ZeroDivisionError("mean of empty data")
+        return _neumaier(part for partial in run(_chunk_sum) for part in partial) / length
+
+def describe(numbers, workers=None):
+    """
+    This function returns the count, mean, variance, minimum and maximum of the
+    given numbers as a RunningStats, computed in parallel: each chunk gets its
+    own accumulator, and they are merged.
+
+    :param numbers: a NumPy array (possibly memory-mapped), a buffer or a list
+    :param workers: the number of processes, the number of CPUs by default
+    """
+    result = RunningStats()
+    with _pool(numbers, workers) as (run, length):
+        for chunk in run(_chunk_stats):
+            result.merge(chunk)
+    return result
+
+def median(numbers, workers=None):
+    """
+    This function returns the exact median of the given numbers, computed in
+    parallel. With an even count, it is the average of the two middle numbers.
+
+    :param numbers: a NumPy array (possibly memory-mapped), a buffer or a list of
+        finite numbers
+    :param workers: the number of processes, the number of CPUs by default
+    """
+    with _pool(numbers, workers) as (run, length):
+        if not length:
+            raise IndexError("median of empty data")
+        values = _select(run, length, [(length - 1) // 2, length // 2])
+    return (values[0] + values[1]) / 2 if length % 2 == 0 else values[0]
+
+def quantile(numbers, q, workers=None):
+    """
+    This function returns the exact q-quantile of the given numbers, computed in
+    parallel, interpolated like `mymath.stats.quantile`.
+
+    :param numbers: a NumPy array (possibly memory-mapped), a buffer or a list of
+        finite numbers
+    :param q: the quantile, between 0 and 1
+    :param workers: the number of processes, the number of CPUs by default
+    """
+    if not 0 <= q <= 1:
+        raise ValueError(f"Quantile out of range: {q}")
+    with _pool(numbers, workers) as (run, length):
+        if not length:
+            raise ValueError("quantile of empty data")
+        h = (length - 1) * q
+        low, high = _select(run, length, [math.floor(h), math.ceil(h)])
+    return low + (high - low) * (h - math.floor(h)) if high != low else low
+
+
+@contextlib.contextmanager
+def _pool(numbers, workers):
+    """
+    This function shares the numbers with a pool of worker processes.
+
+    A memory-mapped array is shared by its file; anything else is copied once
+    into a shared memory block. Workers attach to it by name, so no array is
+    ever pickled; they receive chunk bounds and send back small results.
+
+    It yields a function running a chunk function on every chunk, in order, and
+    the number of numbers.
+    """
+    array = np.asarray(numbers)
+    if array.ndim != 1:
+        array = array.reshape(-1)
+    block = None
+    # A slice of a memory-mapped array is copied: its offset in the file is not known
+    if isinstance(numbers, np.memmap) and isinstance(numbers.base, mmap.mmap) and numbers.ndim == 1:
+        source = ("file", numbers.filename, array.dtype.str, numbers.offset, len(array))
+    else:
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+        source = ("memory", block.name, array.dtype.str, 0, len(array))
+    bounds = [(start, min(start + CHUNK_SIZE, len(array))) for start in range(0, len(array), CHUNK_SIZE)]
+    try:
+        with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+
+            def run(function, *args):
+                tasks = [executor.submit(function, source, start, stop, *args) for start, stop in bounds]
+                return [task.result() for task in tasks]
+
+            yield run, len(array)
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
+
+# Arrays already attached by this worker process, by source
+_attached = {}
+
+def _attach(source):
+    """
+    This function returns the shared numbers as an array, in a worker process.
+    """
+    if source not in _attached:
+        kind, name, dtype, offset, length = source
+        if kind == "file":
+            _attached[source] = (None, np.memmap(name, dtype=dtype, mode="r", offset=offset, shape=(length,)))
+        else:
+            block = shared_memory.SharedMemory(name=name)
+            _attached[source] = (block, np.ndarray((length,), dtype, buffer=block.buf))
+    return _attached[source][1]
+
+def _chunk_sum(source, start, stop):
+    """
+    This function returns the sum of one chunk as two floats, the rounded sum
+    and what rounding it lost, so that no precision is lost between chunks.
+
+    The chunk is added as SUM_ROWS rows at once, keeping per column the error
+    of every addition (Knuth's two-sum, the branch-free form of Neumaier's
+    correction); the column sums and errors are then added exactly.
+    """
+    chunk = _attach(source)[start:stop].astype(np.float64, copy=False)
+    width = len(chunk) // SUM_ROWS
+    result = np.zeros(width)
+    compensation = np.zeros(width)
+    updated, part, error = np.empty(width), np.empty(width), np.empty(width)
+    for row in chunk[:width * SUM_ROWS].reshape(SUM_ROWS, width):
+        np.add(result, row, out=updated)
+        # error = (result - (updated - part)) + (row - part), with part = updated - result
+        np.subtract(updated, result, out=part)
+        np.subtract(updated, part, out=error)
+        np.subtract(result, error, out=error)
+        compensation += error
+        np.subtract(row, part, out=part)
+        compensation += part
+        result, updated = updated, result
+    parts = [*result.tolist(), *compensation.tolist(), *chunk[width * SUM_ROWS:].tolist()]
+    rounded = math.fsum(parts)
+    return rounded, math.fsum([*parts, -rounded])
+
+def _chunk_range(source, start, stop):
+    """
+    This function returns the smallest and the largest number of one chunk.
+    """
+    chunk = _attach(source)[start:stop]
+    return float(np.min(chunk)), float(np.max(chunk))
+
+def _chunk_stats(source, start, stop):
+    """
+    This function returns a RunningStats of one chunk, computed with NumPy.
+    """
+    chunk = _attach(source)[start:stop].astype(np.float64, copy=False)
+    chunk_mean = float(np.mean(chunk))
+    squares = float(np.sum(np.square(chunk - chunk_mean)))
+    return RunningStats.from_moments(len(chunk), chunk_mean, squares, float(np.min(chunk)), float(np.max(chunk)))
+
+def _chunk_histogram(source, start, stop, low, high):
+    """
+    This function counts the numbers of one chunk in [low, high) per bucket, the
+    buckets being HISTOGRAM_BINS equal parts of the range. A number on a bucket
+    edge, as computed by numpy.linspace(low, high, HISTOGRAM_BINS + 1), goes to
+    the bucket it starts.
+    """
+    chunk = _attach(source)[start:stop]
+    chunk = chunk[(chunk >= low) & (chunk < high)]
+    return np.histogram(chunk, bins=HISTOGRAM_BINS, range=(low, high))[0]
+
+def _chunk_counts(source, start, stop, low, high):
+    """
+    This function returns the distinct numbers of one chunk in [low, high), and
+    how many times each occurs.
+    """
+    chunk = _attach(source)[start:stop]
+    return np.unique(chunk[(chunk >= low) & (chunk < high)], return_counts=True)
+
+def _select(run, length, ranks):
+    """
+    This function returns the numbers of the given ranks, as if all the numbers
+    were sorted.
+
+    Each rank is narrowed down by histogram passes: all workers count their
+    numbers per bucket of a range [low, high) known to hold it, the counts are
+    added up and the range becomes the bucket holding the rank (ranks in the
+    same range share the pass). Once few numbers, or few distinct numbers, are
+    left in the range, the workers send them with their counts, so the result
+    is exact and the data is never gathered in one process.
+    """
+    ranges = run(_chunk_range)
+    # Checked per chunk: min() and max() skip a NaN unless it comes first
+    if not all(math.isfinite(bound) for bounds in ranges for bound in bounds):
+        raise ValueError("median and quantiles need finite numbers")
+    low = min(minimum for minimum, _ in ranges)
+    high = max(maximum for _, maximum in ranges)
+    # Each rank's range, with the count of numbers below it and inside it
+    pending = {rank: (low, float(np.nextafter(high, math.inf)), 0, length) for rank in ranks}
+    result = {}
+    while pending:
+        groups = {}
+        for rank, state in pending.items():
+            groups.setdefault(state, []).append(rank)
+        pending = {}
+        for (low, high, below, inside), group in groups.items():
+            edges = np.linspace(low, high, HISTOGRAM_BINS + 1)
+            if inside <= GATHER_LIMIT or np.any(edges[:-1] >= edges[1:]):
+                values, counts = zip(*run(_chunk_counts, low, high))
+                values, positions = np.unique(np.concatenate(values), return_inverse=True)
+                cumulative = below + np.cumsum(np.bincount(positions, weights=np.concatenate(counts)))
+                for rank in group:
+                    result[rank] = float(values[np.searchsorted(cumulative, rank, side="right")])
+                continue
+            cumulative = below + np.cumsum(np.sum(run(_chunk_histogram, low, high), axis=0))
+            for rank in group:
+                bucket = int(np.searchsorted(cumulative, rank, side="right"))
+                before = int(cumulative[bucket - 1]) if bucket else below
+                pending[rank] = (float(edges[bucket]), float(edges[bucket + 1]), before, int(cumulative[bucket]) - before)
+    return [result[rank] for rank in ranks]
+
+def _neumaier(values):
+    """
+    This function returns the sum of the given floats with Neumaier's
+    compensated summation, which keeps the low-order bits lost by each addition.
+    """
+    result = 0.0
+    compensation = 0.0
+    for value in values:
+        updated = result + value
+        if abs(result) >= abs(value):
+            compensation += (result - updated) + value
+        else:
+            compensation += (value - updated) + result
+        result = updated
+    return result + compensation
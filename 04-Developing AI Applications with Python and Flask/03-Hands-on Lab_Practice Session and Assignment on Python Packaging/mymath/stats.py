@@ -1,40 +1,133 @@
-def mean(numbers):
+import math
+import random
+
+# Parts of at most this many numbers are sorted instead of partitioned further
+SORT_THRESHOLD = 32
+
+
+def mean(numbers, workers=None):
     """
-    This function returns the mean of the given list of numbers.
+    This function returns the mean of the given numbers.
     The mean is calculated as the sum of all numbers divided by the count of numbers.
+
+    :param numbers: any iterable of numbers (a list, a generator, a file's lines
+        converted to numbers, ...); it is read once and not stored
+    :param workers: to compute it on this many processes, with mymath.parallel
+        (numbers must then be an array, e.g. a memory-mapped file, or a list)
     """
-    # Calculate the mean by summing all the numbers and dividing by the length of the list.
-    # 'sum(numbers)' computes the total of all numbers in the list.
-    # 'len(numbers)' gives the count of numbers in the list.
-    # The mean (or average) is the total sum divided by the number of elements.
-    return sum(numbers) / len(numbers)  # Return the mean value.
+    if workers is not None:
+        from . import parallel
+
+        return parallel.mean(numbers, workers)
+    # Lists, tuples and other sized collections can be read twice: the
+    # built-in sum is several times faster than the loop below.
+    if hasattr(numbers, "__len__"):
+        return sum(numbers) / len(numbers)
+    # Add the numbers up and count them in the same pass, so that iterables
+    # which cannot be read twice (or do not fit in memory) are supported.
+    total = 0
+    count = 0
+    for number in numbers:
+        total += number
+        count += 1
+    # An empty input raises ZeroDivisionError, as sum([]) / len([]) does.
+    return total / count  # Return the mean value.
 
-def median(numbers):
+def median(numbers, workers=None):
     """
-    This function returns the median of the given list of numbers.
+    This function returns the median of the given numbers.
     The median is the middle value when the numbers are sorted.
     If there is an even number of observations, it returns the average of the two middle numbers.
+
+    The numbers are not sorted: the middle values are found by selection,
+    which takes linear time on average, and the caller's list is left unchanged.
+
+    :param numbers: any iterable of numbers
+    :param workers: to compute it on this many processes, with mymath.parallel
+        (numbers must then be an array, e.g. a memory-mapped file, or a list)
+    """
+    if workers is not None:
+        from . import parallel
+
+        return parallel.median(numbers, workers)
+    # Copy the numbers, so the caller's list is not reordered.
+    data = list(numbers)
+    count = len(data)
+    if count % 2 == 0:
+        # Find the two middle numbers in one selection and average them.
+        middle = select(data, [count // 2 - 1, count // 2])
+        return (middle[count // 2] + middle[count // 2 - 1]) / 2
+    # Otherwise the median is the middle number itself.
+    return select(data, [count // 2])[count // 2]
+
+def quantile(numbers, q):
+    """
+    This function returns the exact q-quantile of the given numbers.
+    Between two numbers the result is interpolated linearly (as NumPy's default
+    "linear" method does), so quantile(numbers, 0.5) is the median.
+
+    :param numbers: any iterable of numbers (copied once, never modified)
+    :param q: the quantile, between 0 and 1, or a list of quantiles; all of them
+        are found in the same selection
+    """
+    data = list(numbers)
+    if not data:
+        raise ValueError("quantile of empty data")
+    wanted = q if isinstance(q, (list, tuple)) else [q]
+    positions = []
+    for value in wanted:
+        if not 0 <= value <= 1:
+            raise ValueError(f"Quantile out of range: {value}")
+        # The quantile lies between the numbers of rank floor(h) and ceil(h)
+        h = (len(data) - 1) * value
+        positions.append((h, math.floor(h), math.ceil(h)))
+    ranks = select(data, [rank for _, low, high in positions for rank in (low, high)])
+    results = []
+    for h, low, high in positions:
+        if low == high:
+            results.append(ranks[low])
+        else:
+            results.append(ranks[low] + (ranks[high] - ranks[low]) * (h - low))
+    return results if isinstance(q, (list, tuple)) else results[0]
+
+def select(numbers, ranks):
+    """
+    This function returns the numbers of the given ranks, as if the numbers
+    were sorted (rank 0 is the smallest), without sorting them.
+
+    It partitions around random pivots and only keeps the part holding a wanted
+    rank (quickselect), which takes linear time on average. Like introselect, it
+    falls back to sorting a part that bad pivots did not shrink quickly enough,
+    so the worst case is O(n log n) instead of quadratic.
+
+    :param numbers: a list of numbers; it is not modified
+    :param ranks: the ranks to find
+    :return: a dictionary of rank to number
     """
-    # Sort the list of numbers in ascending order.
-    # Sorting is necessary to find the median, as the median depends on the order of values.
-    numbers.sort()
-
-    # Check if the number of elements in the list is even.
-    # len(numbers) % 2 == 0 evaluates to True if the list has an even number of elements.
-    if len(numbers) % 2 == 0:
-        # If the list has an even number of elements, find the two middle numbers.
-        # 'len(numbers) // 2' computes the index of the second middle element in a zero-indexed list.
-        # 'len(numbers) // 2 - 1' computes the index of the first middle element.
-        median1 = numbers[len(numbers) // 2]  # The higher index of the two middle values.
-        median2 = numbers[len(numbers) // 2 - 1]  # The lower index of the two middle values.
-        
-        # Calculate the median by taking the average of the two middle numbers.
-        # This is done by adding the two middle values and dividing by 2.
-        mymedian = (median1 + median2) / 2  # Average of the two middle values.
-    else:
-        # If the list has an odd number of elements, return the middle number.
-        # 'len(numbers) // 2' computes the index of the middle element.
-        mymedian = numbers[len(numbers) // 2]  # The middle value for lists with an odd number of elements.
-
-    # Return the calculated median value.
-    return mymedian
\ No newline at end of file
+    result = {}
+    wanted = sorted(set(ranks))
+    if wanted and not 0 <= wanted[0] <= wanted[-1] < len(numbers):
+        raise IndexError(f"Rank out of range for {len(numbers)} numbers")
+    # Each part is (numbers, wanted ranks, rank of its smallest number, partitions left)
+    parts = [(numbers, wanted, 0, 2 * max(len(numbers), 1).bit_length())]
+    while parts:
+        data, wanted, offset, budget = parts.pop()
+        if not wanted:
+            continue
+        if len(data) <= SORT_THRESHOLD or budget == 0:
+            data = sorted(data)
+            for rank in wanted:
+                result[rank] = data[rank - offset]
+            continue
+        pivot = random.choice(data)
+        lows = [number for number in data if number < pivot]
+        highs = [number for number in data if number > pivot]
+        # Ranks [first_equal, first_high) hold numbers equal to the pivot
+        first_equal = offset + len(lows)
+        first_high = offset + len(data) - len(highs)
+        parts.append((lows, [rank for rank in wanted if rank < first_equal], offset, budget - 1))
+        parts.append((highs, [rank for rank in wanted if rank >= first_high], first_high, budget - 1))
+        for rank in wanted:
+            if first_equal <= rank < first_high:
+                result[rank] = pivot
+    return result
@@ -0,0 +1,284 @@
+import math
+
+# Default compression of a TDigest: it keeps at most about this many centroids
+DEFAULT_COMPRESSION = 100
+
+
+class RunningStats:
+    """
+    This class accumulates the count, mean, variance, minimum and maximum of
+    a stream of numbers in a single pass, using Welford's updates.
+
+    Only five numbers are kept, whatever the length of the stream. Two
+    accumulators can be merged, so chunks of the data can be processed
+    separately (or in parallel) and combined afterwards.
+    """
+
+    def __init__(self, numbers=()):
+        """
+        This function creates an accumulator and adds the given numbers to it.
+
+        :param numbers: any iterable of numbers
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared differences from the mean
+        self.min = math.inf
+        self.max = -math.inf
+        self.update(numbers)
+
+    def add(self, number):
+        """
+        This function adds one number to the accumulator.
+
+        :param number: the number
+        """
+        self.count += 1
+        delta = number - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (number - self.mean)
+        if number < self.min:
+            self.min = number
+        if number > self.max:
+            self.max = number
+
+    def update(self, numbers):
+        """
+        This function adds numbers to the accumulator.
+
+        A list (or other sequence) is treated as one chunk: its own mean and
+        variance are computed in two fast passes and merged in, which is
+        quicker and at least as accurate as adding the numbers one by one.
+        Other iterables are read one number at a time, and not stored.
+
+        :param numbers: any iterable of numbers
+        """
+        if hasattr(numbers, "__len__") and hasattr(numbers, "__getitem__"):
+            if len(numbers):
+                self.merge(RunningStats.from_sequence(numbers))
+            return
+        for number in numbers:
+            self.add(number)
+
+    @classmethod
+    def from_sequence(cls, numbers):
+        """
+        This function returns an accumulator of a non-empty sequence of numbers,
+        computed in two passes (the mean, then the squared differences from it).
+
+        :param numbers: a sequence of numbers, e.g. a list or a chunk of a file
+        """
+        chunk_mean = math.fsum(numbers) / len(numbers)
+        squares = math.fsum((number - chunk_mean) ** 2 for number in numbers)
+        return cls.from_moments(len(numbers), chunk_mean, squares, min(numbers), max(numbers))
+
+    @classmethod
+    def from_moments(cls, count, mean, squares, minimum, maximum):
+        """
+        This function returns an accumulator of numbers summarized elsewhere,
+        e.g. by NumPy in another process, ready to be merged.
+
+        :param count: how many numbers there are
+        :param mean: their mean
+        :param squares: the sum of their squared differences from the mean
+        :param minimum: the smallest number
+        :param maximum: the largest number
+        """
+        summary = cls()
+        summary.count = count
+        summary.mean = mean
+        summary._m2 = squares
+        summary.min = minimum
+        summary.max = maximum
+        return summary
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        This function returns an accumulator of all the numbers of a chunked
+        source, e.g. a file read a block at a time; only one chunk needs to be
+        in memory.
+
+        :param chunks: an iterable of iterables of numbers
+        """
+        total = cls()
+        for chunk in chunks:
+            total.update(chunk)
+        return total
+
+    def merge(self, other):
+        """
+        This function adds all the numbers of another accumulator to this one
+        (Chan et al.'s parallel update), as if they had been added here.
+
+        :param other: a RunningStats
+        :return: this accumulator
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof=0):
+        """
+        This function returns the variance of the numbers added so far.
+
+        :param ddof: 0 for the population variance, 1 for the sample variance
+        """
+        if self.count <= ddof:
+            raise ValueError(f"variance needs more than {ddof} numbers")
+        return self._m2 / (self.count - ddof)
+
+    def stdev(self, ddof=0):
+        """
+        This function returns the standard deviation of the numbers added so far.
+
+        :param ddof: 0 for the population, 1 for the sample standard deviation
+        """
+        return math.sqrt(self.variance(ddof))
+
+
+class TDigest:
+    """
+    This class estimates the median and other quantiles of a stream of
+    numbers in bounded memory (Dunning's merging t-digest).
+
+    Numbers are summarized by at most about `compression` centroids (a mean
+    and a weight each). Centroids are kept small near the extremes, so tail
+    quantiles such as 0.01 or 0.99 are estimated more precisely than the
+    middle ones; with the default compression the error is typically well
+    below 1% of the rank. Digests can be merged, like RunningStats.
+    """
+
+    def __init__(self, numbers=(), compression=DEFAULT_COMPRESSION):
+        """
+        This function creates a digest and adds the given numbers to it.
+
+        :param numbers: any iterable of numbers
+        :param compression: the accuracy: more centroids, more memory, less error
+        """
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._centroids = []  # Sorted (mean, weight) pairs
+        self._buffer = []  # Numbers not merged into the centroids yet
+        self._buffer_size = 10 * compression
+        self.update(numbers)
+
+    def add(self, number):
+        """
+        This function adds one number to the digest.
+
+        :param number: the number
+        """
+        self._buffer.append(number)
+        if len(self._buffer) >= self._buffer_size:
+            self._flush()
+
+    def update(self, numbers):
+        """
+        This function adds numbers to the digest.
+
+        :param numbers: any iterable of numbers
+        """
+        for number in numbers:
+            self._buffer.append(number)
+            if len(self._buffer) >= self._buffer_size:
+                self._flush()
+
+    def merge(self, other):
+        """
+        This function adds all the numbers summarized by another digest to this one.
+
+        :param other: a TDigest
+        :return: this digest
+        """
+        other._flush()
+        self._flush(other._centroids, other.count, other.min, other.max)
+        return self
+
+    def quantile(self, q):
+        """
+        This function returns an estimate of the q-quantile of the numbers added so far.
+
+        :param q: the quantile, between 0 and 1 (0.5 for the median)
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile out of range: {q}")
+        self._flush()
+        if self.count == 0:
+            raise ValueError("quantile of empty data")
+        centroids = self._centroids
+        target = q * self.count
+        # Each centroid's mean sits at the middle of its weight; interpolate
+        # between neighbouring centroids, and towards min/max at the ends.
+        mean, weight = centroids[0]
+        if target < weight / 2:
+            return self.min + (mean - self.min) * target / (weight / 2)
+        cumulative = 0
+        for (mean, weight), (next_mean, next_weight) in zip(centroids, centroids[1:]):
+            left = cumulative + weight / 2
+            right = cumulative + weight + next_weight / 2
+            if target < right:
+                return mean + (next_mean - mean) * (target - left) / (right - left)
+            cumulative += weight
+        mean, weight = centroids[-1]
+        center = self.count - weight / 2
+        return mean + (self.max - mean) * min((target - center) / (weight / 2), 1)
+
+    def median(self):
+        """
+        This function returns an estimate of the median of the numbers added so far.
+        """
+        return self.quantile(0.5)
+
+    def _flush(self, centroids=(), count=0, minimum=math.inf, maximum=-math.inf):
+        """
+        This function merges the buffered numbers, and the given centroids, into
+        the digest's centroids.
+        """
+        if self._buffer:
+            count += len(self._buffer)
+            minimum = min(minimum, min(self._buffer))
+            maximum = max(maximum, max(self._buffer))
+        if not count:
+            return
+        items = sorted([*self._centroids, *centroids, *((number, 1) for number in self._buffer)])
+        self._buffer = []
+        self.count += count
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+        # Merge neighbours while the merged centroid stays within the size the
+        # scale function allows at its quantile: k(q) = d/(2 pi) asin(2q - 1)
+        # may grow by at most 1 across a centroid.
+        scale = self.compression / (2 * math.pi)
+
+        def weight_limit(weight_before):
+            k = scale * math.asin(2 * weight_before / self.count - 1) + 1
+            if k >= scale * math.pi / 2:
+                return self.count
+            return self.count * (math.sin(k / scale) + 1) / 2
+
+        merged = []
+        mean, weight = items[0]
+        weight_before = 0
+        limit = weight_limit(0)
+        for next_mean, next_weight in items[1:]:
+            if weight_before + weight + next_weight <= limit:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                merged.append((mean, weight))
+                weight_before += weight
+                limit = weight_limit(weight_before)
+                mean, weight = next_mean, next_weight
+        merged.append((mean, weight))
+        self._centroids = merged
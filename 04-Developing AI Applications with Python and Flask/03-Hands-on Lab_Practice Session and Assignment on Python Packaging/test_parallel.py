@@ -0,0 +1,77 @@
+import math
+import os
+import tempfile
+import unittest
+from multiprocessing import shared_memory
+from unittest import mock
+
+import numpy as np
+
+from mymath import parallel, stats
+
+
+class TestParallelReductions(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        # An odd count, repeated values and cancelling magnitudes
+        self.numbers = np.concatenate([rng.lognormal(size=30001), np.round(rng.normal(size=9000), 1), [1e16, -1e16]])
+        # Several chunks and histogram passes without a large array
+        for name, value in (("CHUNK_SIZE", 4096), ("GATHER_LIMIT", 1000)):
+            patcher = mock.patch.object(parallel, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_results_match_numpy(self):
+        numbers = self.numbers
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(parallel.total(numbers, workers), math.fsum(numbers))
+                self.assertAlmostEqual(parallel.mean(numbers, workers), math.fsum(numbers) / len(numbers), places=12)
+                self.assertEqual(parallel.median(numbers, workers), float(np.median(numbers)))
+                self.assertEqual(parallel.median(numbers[:-1], workers), float(np.median(numbers[:-1])))
+                self.assertEqual(parallel.quantile(numbers, 0.9, workers), float(np.quantile(numbers, 0.9)))
+                summary = parallel.describe(numbers, workers)
+                self.assertEqual(summary.count, len(numbers))
+                self.assertTrue(math.isclose(summary.variance(), float(np.var(numbers)), rel_tol=1e-9))
+
+    def test_memory_mapped_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "numbers.npy")
+            np.save(path, self.numbers)
+            mapped = parallel.load(path)
+            self.assertIsInstance(mapped, np.memmap)
+            self.assertEqual(parallel.total(mapped, 2), math.fsum(self.numbers))
+            self.assertEqual(parallel.median(mapped, 2), float(np.median(self.numbers)))
+            del mapped
+
+    def test_lists_and_small_inputs(self):
+        self.assertEqual(parallel.median([3.0, 1.0, 2.0], 1), 2.0)
+        self.assertEqual(parallel.median([4.0], 1), 4.0)
+        self.assertEqual(parallel.total([0.1] * 10, 1), math.fsum([0.1] * 10))
+        self.assertEqual(stats.median([5.0, 1.0], workers=1), 3.0)
+        self.assertEqual(parallel.total([], 1), 0.0)
+        with self.assertRaises(ZeroDivisionError):
+            parallel.mean([], 1)
+        with self.assertRaises(IndexError):
+            parallel.median([], 1)
+
+    def test_shared_memory_is_released_after_an_error(self):
+        names = []
+        create = shared_memory.SharedMemory
+
+        def record(*args, **kwargs):
+            block = create(*args, **kwargs)
+            if kwargs.get("create"):
+                names.append(block.name)
+            return block
+
+        with mock.patch.object(parallel.shared_memory, "SharedMemory", side_effect=record):
+            with self.assertRaises(ValueError):
+                parallel.median(np.append(self.numbers, math.nan), 2)
+        self.assertEqual(len(names), 1)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=names[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import random
+import statistics
+import unittest
+
+import numpy as np
+
+from mymath import stats
+from mymath.streaming import RunningStats, TDigest
+
+
+def sample(size, seed=1):
+    """Return `size` log-normal numbers, with a few repeated values."""
+    rng = random.Random(seed)
+    return [round(rng.lognormvariate(0, 1), 3) for _ in range(size)]
+
+
+class TestRunningStats(unittest.TestCase):
+    def assertMatches(self, summary, numbers):
+        self.assertEqual(summary.count, len(numbers))
+        self.assertAlmostEqual(summary.mean, statistics.fmean(numbers), places=9)
+        self.assertAlmostEqual(summary.variance(), statistics.pvariance(numbers), places=9)
+        self.assertAlmostEqual(summary.variance(ddof=1), statistics.variance(numbers), places=9)
+        self.assertAlmostEqual(summary.stdev(ddof=1), float(np.std(numbers, ddof=1)), places=9)
+        self.assertEqual((summary.min, summary.max), (min(numbers), max(numbers)))
+
+    def test_lists_and_generators_give_the_same_figures(self):
+        numbers = sample(10000)
+        self.assertMatches(RunningStats(numbers), numbers)
+        self.assertMatches(RunningStats(number for number in numbers), numbers)
+
+    def test_merged_chunks_match_the_whole(self):
+        numbers = sample(10000)
+        chunks = [numbers[start:start + 777] for start in range(0, len(numbers), 777)]
+        self.assertMatches(RunningStats.from_chunks(chunks), numbers)
+        merged = RunningStats(iter(numbers[:3000])).merge(RunningStats(numbers[3000:]))
+        self.assertMatches(merged.merge(RunningStats()), numbers)
+
+    def test_large_offset_keeps_the_variance(self):
+        numbers = [1e9 + number for number in sample(1000)]
+        self.assertAlmostEqual(RunningStats(iter(numbers)).variance(), statistics.pvariance(numbers), places=6)
+
+    def test_empty_and_single_inputs(self):
+        empty = RunningStats(iter(()))
+        self.assertEqual(empty.count, 0)
+        with self.assertRaises(ValueError):
+            empty.variance()
+        single = RunningStats(iter([4.5]))
+        self.assertEqual((single.count, single.mean, single.min, single.max), (1, 4.5, 4.5, 4.5))
+        self.assertEqual(single.variance(), 0.0)
+        with self.assertRaises(ValueError):
+            single.variance(ddof=1)
+
+
+class TestTDigest(unittest.TestCase):
+    def assertRankError(self, estimate, numbers, q, tolerance=0.01):
+        """Check that an estimate lies within `tolerance` of the q-quantile's rank."""
+        ordered = np.sort(numbers)
+        low = np.searchsorted(ordered, estimate, side="left") / len(ordered)
+        high = np.searchsorted(ordered, estimate, side="right") / len(ordered)
+        self.assertLessEqual(low - tolerance, q)
+        self.assertGreaterEqual(high + tolerance, q)
+
+    def test_quantiles_of_a_generator_are_close(self):
+        numbers = sample(50000)
+        digest = TDigest(number for number in numbers)
+        self.assertEqual(digest.count, len(numbers))
+        for q in (0, 0.01, 0.25, 0.5, 0.75, 0.99, 1):
+            with self.subTest(q=q):
+                self.assertRankError(digest.quantile(q), numbers, q)
+        self.assertEqual(digest.quantile(0), min(numbers))
+        self.assertEqual(digest.quantile(1), max(numbers))
+
+    def test_merged_digests_are_close(self):
+        numbers = sample(50000)
+        digest = TDigest(numbers[:20000]).merge(TDigest(numbers[20000:]))
+        self.assertEqual(digest.count, len(numbers))
+        self.assertRankError(digest.median(), numbers, 0.5)
+
+    def test_empty_and_single_inputs(self):
+        with self.assertRaises(ValueError):
+            TDigest(iter(())).median()
+        self.assertEqual(TDigest(iter([7.0])).median(), 7.0)
+        with self.assertRaises(ValueError):
+            TDigest([1.0]).quantile(1.5)
+
+
+class TestSelection(unittest.TestCase):
+    def test_median_matches_statistics(self):
+        for size in (1, 2, 3, 33, 1000, 1001):
+            numbers = sample(size, seed=size)
+            with self.subTest(size=size):
+                self.assertEqual(stats.median(numbers), statistics.median(numbers))
+                self.assertEqual(stats.median(number for number in numbers), statistics.median(numbers))
+
+    def test_median_leaves_the_input_unchanged(self):
+        numbers = sample(1000)
+        copy = list(numbers)
+        stats.median(numbers)
+        self.assertEqual(numbers, copy)
+
+    def test_duplicates_and_sorted_input(self):
+        for numbers in ([5.0] * 1000, list(range(1000)), list(range(1000, 0, -1)), [1, 2] * 500):
+            with self.subTest(numbers=numbers[:3]):
+                self.assertEqual(stats.median(numbers), statistics.median(numbers))
+
+    def test_quantile_matches_numpy(self):
+        numbers = sample(2001)
+        quantiles = [0, 0.1, 0.5, 0.9, 0.999, 1]
+        self.assertEqual(stats.quantile(numbers, 0.25), float(np.quantile(numbers, 0.25)))
+        for result, expected in zip(stats.quantile(numbers, quantiles), np.quantile(numbers, quantiles)):
+            self.assertAlmostEqual(result, float(expected), places=12)
+
+    def test_select_ranks(self):
+        numbers = sample(500)
+        ordered = sorted(numbers)
+        self.assertEqual(stats.select(numbers, [0, 250, 499]), {0: ordered[0], 250: ordered[250], 499: ordered[499]})
+        with self.assertRaises(IndexError):
+            stats.select(numbers, [500])
+
+    def test_empty_input(self):
+        with self.assertRaises(IndexError):
+            stats.median([])
+        with self.assertRaises(IndexError):
+            stats.median(iter(()))
+        with self.assertRaises(ValueError):
+            stats.quantile([], 0.5)
+        with self.assertRaises(ZeroDivisionError):
+            stats.mean(iter(()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,4 @@
+from . import backends
+from . import locking
+from . import search
+from . import store
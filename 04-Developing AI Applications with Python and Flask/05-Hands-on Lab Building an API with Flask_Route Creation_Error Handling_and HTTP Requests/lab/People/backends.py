@@ -0,0 +1,482 @@
+import contextlib
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock; the memory and SQLite stores still work there
+    fcntl = None
+
+from .store import PersonStore
+
+
+class LogStore:
+    """
+    Person store persisted as an append-only record log plus an id index.
+
+    `people.log` holds one JSON record per line and is never rewritten.
+    `people.idx` is a sequence of fixed-size entries (UUID bytes, log offset,
+    record length); a length of 0 marks a deletion. Opening the store only
+    replays the small index file, and records are decoded lazily from a
+    read-only memory map of the log, so every worker process shares the same
+    pages from the OS cache instead of holding its own copy on the heap.
+
+    Writers take an exclusive `flock` on the index and append to both
+    files. Before every operation the store reads any index entries other
+    processes appended since the last call, so workers never diverge.
+    `flock` does not exclude threads sharing the file, so a thread lock
+    guards writes and index replays within a process; lookups are single
+    dictionary reads and need no lock. Listeners run inside the write, so
+    they see changes one at a time and in log order.
+    """
+
+    ENTRY = struct.Struct("<16sQI")
+
+    def __init__(self, directory, fsync=False):
+        """
+        Open (or create) a log store in the given directory.
+
+        Args:
+            directory (str): Directory holding `people.log` and `people.idx`.
+            fsync (bool): Flush writes to disk before returning from `add`
+                and `remove`.
+
+        Raises:
+            RuntimeError: If the platform has no `fcntl` file locks.
+        """
+        if fcntl is None:
+            raise RuntimeError("The log store needs fcntl file locks, which this platform lacks")
+        os.makedirs(directory, exist_ok=True)
+        self._log = open(os.path.join(directory, "people.log"), "a+b")
+        self._idx = open(os.path.join(directory, "people.idx"), "a+b")
+        self._fsync = fsync
+        self._index = {}
+        self._seen = 0
+        self._map = None
+        self._listeners = []
+        self._thread_lock = threading.RLock()
+        self.refresh()
+
+    def close(self):
+        """
+        Release the memory map and close both files.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._log.close()
+        self._idx.close()
+
+    def __len__(self):
+        """Return the number of live entries in the id index."""
+        self.refresh()
+        return len(self._index)
+
+    def __contains__(self, person_id):
+        """Check whether the id is in the index."""
+        self.refresh()
+        return str(person_id) in self._index
+
+    def __iter__(self):
+        """Yield the stored people in insertion order."""
+        self.refresh()
+        for offset, length in list(self._index.values()):
+            yield self._read(offset, length)
+
+    def subscribe(self, callback):
+        """
+        Register a function called after every insert or delete, including
+        changes made by other processes.
+
+        Args:
+            callback (callable): Called as `callback(person_id, person)`,
+                with `person` set to None for deletions.
+        """
+        self._listeners.append(callback)
+
+    def get(self, person_id):
+        """Return the person with the given id, or None."""
+        self.refresh()
+        location = self._index.get(str(person_id))
+        if location is None:
+            return None
+        return self._read(*location)
+
+    def add(self, person):
+        """
+        Append a new person to the log.
+
+        Raises:
+            ValueError: If the id is missing, not a UUID or already present.
+        """
+        if "id" not in person:
+            raise ValueError("Person has no 'id'")
+        key = self._key(person["id"])
+        record = json.dumps(person, separators=(",", ":")).encode() + b"\n"
+        with self._locked():
+            person_id = str(person["id"])
+            if person_id in self._index:
+                raise ValueError(f"Person with ID {person_id} already exists")
+            self._log.seek(0, os.SEEK_END)
+            offset = self._log.tell()
+            self._log.write(record)
+            self._append(key, offset, len(record) - 1)
+            self._index[person_id] = (offset, len(record) - 1)
+            self._notify(person_id, person)
+        return person
+
+    def add_many(self, people):
+        """
+        Append a batch of people with a single lock, write and flush.
+
+        Returns:
+            list: One entry per person, None if it was stored or the error
+                message explaining why it was rejected.
+        """
+        errors = []
+        accepted = []
+        with self._locked():
+            self._log.seek(0, os.SEEK_END)
+            offset = self._log.tell()
+            records = bytearray()
+            entries = bytearray()
+            for person in people:
+                try:
+                    if "id" not in person:
+                        raise ValueError("Person has no 'id'")
+                    key = self._key(person["id"])
+                    person_id = str(person["id"])
+                    if person_id in self._index:
+                        raise ValueError(f"Person with ID {person_id} already exists")
+                except ValueError as e:
+                    errors.append(str(e))
+                    continue
+                record = json.dumps(person, separators=(",", ":")).encode()
+                location = (offset + len(records), len(record))
+                records += record + b"\n"
+                entries += self.ENTRY.pack(key, *location)
+                self._index[person_id] = location
+                accepted.append((person_id, person))
+                errors.append(None)
+            if accepted:
+                self._log.write(records)
+                self._log.flush()
+                self._idx.seek(0, os.SEEK_END)
+                self._idx.write(entries)
+                self._idx.flush()
+                if self._fsync:
+                    os.fsync(self._log.fileno())
+                    os.fsync(self._idx.fileno())
+                self._seen += len(entries)
+            for person_id, person in accepted:
+                self._notify(person_id, person)
+        return errors
+
+    def remove(self, person_id):
+        """
+        Record the deletion of a person in the index.
+
+        Returns:
+            dict or None: The removed person, or None if the id is unknown.
+        """
+        person_id = str(person_id)
+        with self._locked():
+            location = self._index.pop(person_id, None)
+            if location is None:
+                return None
+            self._append(self._key(person_id), 0, 0)
+            self._notify(person_id, None)
+        return self._read(*location)
+
+    @staticmethod
+    def _key(person_id):
+        """
+        Return the 16 index bytes of a UUID string.
+
+        Raises:
+            ValueError: If the id is not a valid UUID.
+        """
+        return uuid.UUID(str(person_id)).bytes
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        Take the thread and cross-process write locks and catch up with
+        other writers.
+        """
+        with self._thread_lock:
+            fcntl.flock(self._idx, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                yield
+            finally:
+                fcntl.flock(self._idx, fcntl.LOCK_UN)
+
+    def _append(self, key, offset, length):
+        """
+        Write one index entry; the log record must already be written.
+        """
+        self._log.flush()
+        self._idx.seek(0, os.SEEK_END)
+        self._idx.write(self.ENTRY.pack(key, offset, length))
+        self._idx.flush()
+        if self._fsync:
+            os.fsync(self._log.fileno())
+            os.fsync(self._idx.fileno())
+        self._seen += self.ENTRY.size
+
+    def refresh(self):
+        """
+        Apply index entries appended since the last call.
+        """
+        size = os.fstat(self._idx.fileno()).st_size
+        size -= size % self.ENTRY.size
+        if size <= self._seen:
+            return
+        with self._thread_lock:
+            if size <= self._seen:
+                return
+            with mmap.mmap(self._idx.fileno(), size, access=mmap.ACCESS_READ) as view:
+                entries = view[self._seen:size]
+            self._seen = size
+            for key, offset, length in self.ENTRY.iter_unpack(entries):
+                person_id = str(uuid.UUID(bytes=key))
+                if length:
+                    self._index[person_id] = (offset, length)
+                else:
+                    self._index.pop(person_id, None)
+                if self._listeners:
+                    self._notify(person_id, self._read(offset, length) if length else None)
+
+    def _read(self, offset, length):
+        """
+        Decode one record from the memory-mapped log.
+        """
+        view = self._map
+        if view is None or offset + length > len(view):
+            with self._thread_lock:
+                if self._map is None or offset + length > len(self._map):
+                    # The log grew since it was mapped; map it again. The old
+                    # map is not closed: other threads may still be reading
+                    # it, and it is released once the last of them is done.
+                    self._log.flush()
+                    size = os.fstat(self._log.fileno()).st_size
+                    self._map = mmap.mmap(self._log.fileno(), size, access=mmap.ACCESS_READ)
+                view = self._map
+        return json.loads(view[offset:offset + length])
+
+    def _notify(self, person_id, person):
+        """Pass a change on to every subscribed listener."""
+        for callback in self._listeners:
+            callback(person_id, person)
+
+
+class SqliteStore:
+    """
+    Person store persisted in a local SQLite database.
+
+    Triggers keep the row count in a `meta` table and record every insert
+    and delete in a `changes` table, so `len()` is a single lookup and each
+    worker can replay the changes made by the others.
+    """
+
+    SCHEMA = """
+        PRAGMA journal_mode = WAL;
+        CREATE TABLE IF NOT EXISTS people (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            body TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL,
+            deleted INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        INSERT OR IGNORE INTO meta VALUES ('count', 0);
+        CREATE TRIGGER IF NOT EXISTS people_insert AFTER INSERT ON people BEGIN
+            UPDATE meta SET value = value + 1 WHERE key = 'count';
+            INSERT INTO changes (id, deleted) VALUES (NEW.id, 0);
+        END;
+        CREATE TRIGGER IF NOT EXISTS people_delete AFTER DELETE ON people BEGIN
+            UPDATE meta SET value = value - 1 WHERE key = 'count';
+            INSERT INTO changes (id, deleted) VALUES (OLD.id, 1);
+        END;
+    """
+
+    def __init__(self, path):
+        """
+        Open (or create) a SQLite store.
+
+        Args:
+            path (str): Path of the database file.
+        """
+        self._path = path
+        self._local = threading.local()
+        self._listeners = []
+        self._refresh_lock = threading.Lock()
+        self._db.executescript(self.SCHEMA)
+        self._seen = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    @property
+    def _db(self):
+        """
+        Return this thread's connection, opening it on first use.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def __len__(self):
+        """Return the trigger-maintained row count."""
+        return self._db.execute("SELECT value FROM meta WHERE key = 'count'").fetchone()[0]
+
+    def __contains__(self, person_id):
+        """Check whether a person with the given id is stored."""
+        return self._db.execute("SELECT 1 FROM people WHERE id = ?", (str(person_id),)).fetchone() is not None
+
+    def __iter__(self):
+        """Yield the stored people in insertion order."""
+        for (body,) in self._db.execute("SELECT body FROM people ORDER BY seq"):
+            yield json.loads(body)
+
+    def subscribe(self, callback):
+        """
+        Register a function called after every insert or delete, including
+        changes made by other processes.
+
+        Args:
+            callback (callable): Called as `callback(person_id, person)`,
+                with `person` set to None for deletions.
+        """
+        self._listeners.append(callback)
+
+    def get(self, person_id):
+        """Return the person with the given id, or None."""
+        self.refresh()
+        return self._fetch(person_id)
+
+    def add(self, person):
+        """
+        Insert a new person.
+
+        Raises:
+            ValueError: If the id is missing or already present.
+        """
+        if "id" not in person:
+            raise ValueError("Person has no 'id'")
+        person_id = str(person["id"])
+        try:
+            self._db.execute("INSERT INTO people (id, body) VALUES (?, ?)", (person_id, json.dumps(person)))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Person with ID {person_id} already exists")
+        self.refresh()
+        return person
+
+    def add_many(self, people):
+        """
+        Insert a batch of people in a single transaction.
+
+        Returns:
+            list: One entry per person, None if it was stored or the error
+                message explaining why it was rejected.
+        """
+        errors = []
+        db = self._db
+        db.execute("BEGIN")
+        try:
+            for person in people:
+                if "id" not in person:
+                    errors.append("Person has no 'id'")
+                    continue
+                person_id = str(person["id"])
+                try:
+                    db.execute("INSERT INTO people (id, body) VALUES (?, ?)", (person_id, json.dumps(person)))
+                    errors.append(None)
+                except sqlite3.IntegrityError:
+                    errors.append(f"Person with ID {person_id} already exists")
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        self.refresh()
+        return errors
+
+    def remove(self, person_id):
+        """
+        Delete a person.
+
+        Returns:
+            dict or None: The removed person, or None if the id is unknown.
+        """
+        row = self._db.execute("DELETE FROM people WHERE id = ? RETURNING body", (str(person_id),)).fetchone()
+        self.refresh()
+        return json.loads(row[0]) if row else None
+
+    def refresh(self):
+        """
+        Pass changes recorded since the last call on to the listeners.
+
+        One thread replays at a time, so listeners see every change once
+        and in order.
+        """
+        if not self._listeners:
+            return
+        with self._refresh_lock:
+            rows = self._db.execute(
+                "SELECT seq, id, deleted FROM changes WHERE seq > ? ORDER BY seq", (self._seen,)
+            ).fetchall()
+            for seq, person_id, deleted in rows:
+                self._seen = seq
+                person = None if deleted else self._fetch(person_id)
+                if deleted or person is not None:
+                    for callback in self._listeners:
+                        callback(person_id, person)
+
+    def _fetch(self, person_id):
+        """
+        Return a person without replaying pending changes.
+        """
+        row = self._db.execute("SELECT body FROM people WHERE id = ?", (str(person_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+def open_store(spec, seed=()):
+    """
+    Open the person store described by `spec`.
+
+    Args:
+        spec (str): "memory", "log:<directory>" or "sqlite:<path>".
+        seed (iterable): People inserted when the store is empty.
+
+    Returns:
+        PersonStore, LogStore or SqliteStore: The opened store.
+
+    Raises:
+        ValueError: If the spec names an unknown backend.
+    """
+    kind, _, location = spec.partition(":")
+    if kind == "memory":
+        return PersonStore(seed)
+    if kind == "log":
+        store = LogStore(location)
+    elif kind == "sqlite":
+        store = SqliteStore(location)
+    else:
+        raise ValueError(f"Unknown person store: {spec}")
+    if len(store) == 0:
+        for person in seed:
+            # Another worker may be seeding the same store concurrently
+            try:
+                store.add(person)
+            except ValueError:
+                pass
+    return store
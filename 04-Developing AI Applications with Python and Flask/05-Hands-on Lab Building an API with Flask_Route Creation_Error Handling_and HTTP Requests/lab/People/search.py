@@ -0,0 +1,157 @@
+from itertools import islice
+
+from .locking import RWLock, read_locked, write_locked
+
+
+class NameIndex:
+    """
+    Trigram inverted index over the casefolded first and last names of people.
+
+    Each trigram of a name maps to an ordered set (a dict with `None` values)
+    of the ids of people whose name contains it. A query of three characters
+    or more only looks at the shortest posting list among its trigrams, so
+    the cost follows the number of candidates rather than the dataset size.
+    Queries shorter than a trigram match so many people that scanning the
+    names in order and stopping at the requested page is just as cheap.
+
+    Searches hold a readers-writer lock shared and updates hold it
+    exclusively, so store listeners can update the index from any thread.
+    """
+
+    N = 3
+
+    def __init__(self, people=None):
+        """
+        Create an index, optionally built from an iterable of people.
+
+        Args:
+            people (iterable, optional): Person dictionaries with an 'id' key.
+        """
+        self._postings = {}
+        self._names = {}
+        self._lock = RWLock()
+        for person in people or ():
+            self.add(person)
+
+    def __len__(self):
+        """
+        Return the number of indexed people.
+
+        Returns:
+            int: Number of ids in the index.
+        """
+        return len(self._names)
+
+    @staticmethod
+    def _fold(person):
+        """
+        Return the casefolded names of a person used for matching.
+
+        Args:
+            person (dict): Person record.
+
+        Returns:
+            tuple: Casefolded first and last names.
+        """
+        return tuple(str(person.get(key) or "").casefold() for key in ("first_name", "last_name"))
+
+    def _grams(self, text):
+        """
+        Return the distinct trigrams of a string.
+
+        Args:
+            text (str): Casefolded text.
+
+        Returns:
+            set: Substrings of length `N`.
+        """
+        return {text[i:i + self.N] for i in range(len(text) - self.N + 1)}
+
+    @write_locked
+    def add(self, person):
+        """
+        Index a person's names.
+
+        Args:
+            person (dict): Person record containing an 'id' key.
+        """
+        person_id = str(person["id"])
+        if person_id in self._names:
+            self.remove(person_id)
+        names = self._fold(person)
+        self._names[person_id] = names
+        for gram in set().union(*(self._grams(name) for name in names)):
+            self._postings.setdefault(gram, {})[person_id] = None
+
+    @write_locked
+    def remove(self, person_id):
+        """
+        Drop a person from the index.
+
+        Args:
+            person_id (str): Unique identifier of the person.
+        """
+        person_id = str(person_id)
+        names = self._names.pop(person_id, None)
+        if names is None:
+            return
+        for gram in set().union(*(self._grams(name) for name in names)):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.pop(person_id, None)
+                if not posting:
+                    del self._postings[gram]
+
+    @write_locked
+    def update(self, person_id, person):
+        """
+        Apply a change reported by a person store.
+
+        Args:
+            person_id (str): Unique identifier of the changed person.
+            person (dict or None): The new record, or None if it was deleted.
+        """
+        if person is None:
+            self.remove(person_id)
+        else:
+            self.add(person)
+
+    @read_locked
+    def search(self, query, limit=20, offset=0):
+        """
+        Find people whose first or last name contains the query.
+
+        Matches are returned in the order people were indexed.
+
+        Args:
+            query (str): Text to look for (case-insensitive).
+            limit (int): Maximum number of ids to return.
+            offset (int): Number of matches to skip.
+
+        Returns:
+            tuple:
+                list: Ids of the matching people on the requested page.
+                bool: True if more matches follow this page.
+        """
+        query = query.casefold()
+        grams = self._grams(query)
+        if grams:
+            postings = [self._postings.get(gram) for gram in grams]
+            if not all(postings):
+                return [], False
+            postings.sort(key=len)
+            candidates = postings[0]
+            others = postings[1:]
+        else:
+            candidates = self._names
+            others = []
+
+        names = self._names
+        matches = (
+            person_id for person_id in candidates
+            if all(person_id in posting for posting in others)
+            and any(query in name for name in names[person_id])
+        )
+        # Fetch one extra match to know whether another page exists
+        page = list(islice(matches, offset, offset + limit + 1))
+        return page[:limit], len(page) > limit
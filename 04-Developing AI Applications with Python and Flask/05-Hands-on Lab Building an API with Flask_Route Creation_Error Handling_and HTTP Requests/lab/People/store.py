@@ -0,0 +1,200 @@
+from .locking import RWLock, write_locked
+
+
+class PersonStore:
+    """
+    Ordered collection of people with a dictionary index by id.
+
+    Records are kept in insertion order in a list, and an index maps each
+    person's `id` to its slot in that list, so lookups, inserts and deletes
+    run in O(1). Deleted slots are left as `None` (tombstones) and the list
+    is compacted once more than half of it is empty.
+
+    Every change holds a readers-writer lock exclusively, so inserts,
+    deletes and compactions stay atomic; listeners run inside the write.
+    Lookups take no lock at all and never wait for a write: the list and
+    the index are published together as one `_state` tuple, changes only
+    append to them or clear entries (each a single atomic step), and a
+    compaction builds a new pair and swaps it in. A reader keeps using the
+    pair it started with, which stays consistent.
+
+    The persistent backends in `People.backends` expose the same interface,
+    so the routes work with any of them.
+    """
+
+    def __init__(self, people=None):
+        """
+        Create a store, optionally seeded with an iterable of people.
+
+        Args:
+            people (iterable, optional): Person dictionaries with an 'id' key.
+
+        Raises:
+            ValueError: If a person has no id or an id appears twice.
+        """
+        # (records, index): read with one attribute load, replaced as a whole
+        self._state = ([], {})
+        self._count = 0
+        self._listeners = []
+        self._lock = RWLock()
+        for person in people or ():
+            self.add(person)
+
+    def __len__(self):
+        """
+        Return the number of people currently stored.
+
+        Returns:
+            int: Maintained record counter (no scan).
+        """
+        return self._count
+
+    def __contains__(self, person_id):
+        """
+        Check whether a person with the given id is stored.
+
+        Args:
+            person_id (str): Unique identifier of the person.
+
+        Returns:
+            bool: True if the id is in the index.
+        """
+        return str(person_id) in self._state[1]
+
+    def __iter__(self):
+        """
+        Iterate over the stored people in insertion order.
+
+        Iteration does not take the lock, so a long export never blocks
+        writers; people added or removed meanwhile may or may not be seen.
+
+        Yields:
+            dict: Each live person record.
+        """
+        # Compaction swaps in a new list, so keep walking the one we started on
+        for person in self._state[0]:
+            if person is not None:
+                yield person
+
+    @write_locked
+    def subscribe(self, callback):
+        """
+        Register a function called after every insert or delete.
+
+        Args:
+            callback (callable): Called as `callback(person_id, person)`,
+                with `person` set to None for deletions.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, person_id, person):
+        """
+        Pass a change on to every subscribed listener.
+        """
+        for callback in self._listeners:
+            callback(person_id, person)
+
+    def refresh(self):
+        """
+        Pick up changes made outside this process.
+
+        Nothing to do for an in-memory store; persistent backends replay
+        the changes other workers made.
+        """
+
+    def get(self, person_id):
+        """
+        Return the person with the given id.
+
+        Args:
+            person_id (str): Unique identifier of the person.
+
+        Returns:
+            dict or None: The person if found, otherwise None.
+        """
+        records, index = self._state
+        slot = index.get(str(person_id))
+        if slot is None:
+            return None
+        return records[slot]
+
+    @write_locked
+    def add(self, person):
+        """
+        Insert a new person at the end of the store.
+
+        Args:
+            person (dict): Person record containing an 'id' key.
+
+        Returns:
+            dict: The stored person.
+
+        Raises:
+            ValueError: If the id is missing or already present.
+        """
+        if "id" not in person:
+            raise ValueError("Person has no 'id'")
+        person_id = str(person["id"])
+        records, index = self._state
+        if person_id in index:
+            raise ValueError(f"Person with ID {person_id} already exists")
+        # Append before indexing, so a reader never finds a slot past the end
+        records.append(person)
+        index[person_id] = len(records) - 1
+        self._count += 1
+        self._notify(person_id, person)
+        return person
+
+    @write_locked
+    def add_many(self, people):
+        """
+        Insert a batch of people, skipping the ones that are rejected.
+
+        Args:
+            people (list): Person dictionaries with an 'id' key.
+
+        Returns:
+            list: One entry per person, None if it was stored or the error
+                message explaining why it was rejected.
+        """
+        errors = []
+        for person in people:
+            try:
+                self.add(person)
+                errors.append(None)
+            except ValueError as e:
+                errors.append(str(e))
+        return errors
+
+    @write_locked
+    def remove(self, person_id):
+        """
+        Delete the person with the given id.
+
+        Args:
+            person_id (str): Unique identifier of the person to delete.
+
+        Returns:
+            dict or None: The removed person, or None if the id is unknown.
+        """
+        records, index = self._state
+        slot = index.pop(str(person_id), None)
+        if slot is None:
+            return None
+        person = records[slot]
+        records[slot] = None
+        self._count -= 1
+        # Reclaim tombstones once they make up more than half of the list
+        if self._count < len(records) // 2:
+            self._compact()
+        self._notify(str(person_id), None)
+        return person
+
+    def _compact(self):
+        """
+        Drop tombstones from the record list and rebuild the id index.
+
+        The new list and index are built aside and published together.
+        """
+        records = [person for person in self._state[0] if person is not None]
+        self._state = (records, {str(person["id"]): slot for slot, person in enumerate(records)})
@@ -0,0 +1,67 @@
+"""Compare the indexed `/name_search` lookup against the original linear scan.
+
+Usage:
+    python bench_name_search.py [SIZE ...]
+
+Builds synthetic datasets (10k, 100k and 1M people by default) and times
+both approaches for a handful of queries, fetching the first page of 20
+matches like the endpoint does.
+"""
+
+import random
+import sys
+import time
+import uuid
+
+from People.search import NameIndex
+
+SYLLABLES = ["an", "be", "ca", "do", "el", "fer", "gi", "ho", "is", "ja", "ka", "li", "mo", "nu", "or", "pa", "ri", "sa", "tu", "vy"]
+QUERIES = ["fer", "lisa", "dory", "zzzz", "an"]
+REPEAT = 20
+
+
+def make_people(size, seed=42):
+    """Generate `size` people with random syllable-based names."""
+    rng = random.Random(seed)
+
+    def name():
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+    return [{"id": str(uuid.UUID(int=rng.getrandbits(128))), "first_name": name(), "last_name": name()} for _ in range(size)]
+
+
+def linear_scan(people, query, limit=20):
+    """Original approach: lowercase every name on every request."""
+    matches = []
+    for person in people:
+        if query.lower() in person["first_name"].lower() or query.lower() in person["last_name"].lower():
+            matches.append(person["id"])
+            if len(matches) == limit:
+                break
+    return matches
+
+
+def timed(func, *args):
+    """Return the mean time of `func(*args)` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main(sizes):
+    print(f"{'size':>9} {'query':>6} {'scan ms':>10} {'index ms':>10} {'speedup':>8}")
+    for size in sizes:
+        people = make_people(size)
+        start = time.perf_counter()
+        index = NameIndex(people)
+        print(f"{size:>9} built index in {time.perf_counter() - start:.2f}s")
+        for query in QUERIES:
+            assert linear_scan(people, query) == index.search(query)[0]
+            scan = timed(linear_scan, people, query)
+            indexed = timed(index.search, query)
+            print(f"{size:>9} {query:>6} {scan:>10.3f} {indexed:>10.3f} {scan / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
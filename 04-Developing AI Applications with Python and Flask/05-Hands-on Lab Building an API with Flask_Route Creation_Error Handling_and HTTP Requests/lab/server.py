@@ -1,10 +1,17 @@
-from flask import Flask, make_response, request
+import json
+import os
+import threading
+import uuid
+
+from flask import Flask, Response, make_response, request, stream_with_context
 import requests
+from People.backends import open_store
+from People.search import NameIndex
 
 # Create an instance of the Flask app
 app = Flask(__name__)
 
-data = [
+SAMPLE_PEOPLE = [
     {
         "id": "3b58aade-8415-49dd-88db-8d7bce14932a",
         "first_name": "Tanya",
@@ -62,6 +69,86 @@ data = [
     }
 ]
 
+# Number of NDJSON lines validated and inserted together by /person/bulk
+BULK_BATCH_SIZE = 1000
+
+# Open the person store selected by PEOPLE_STORE: "memory" (default),
+# "log:<directory>" or "sqlite:<path>". Empty stores are seeded with the sample people.
+data = open_store(os.environ.get("PEOPLE_STORE", "memory"), SAMPLE_PEOPLE)
+
+# Trigram index over first and last names, built on first use so startup
+# does not have to decode every stored record
+name_index = None
+name_index_lock = threading.Lock()
+
+
+def get_name_index():
+    """
+    Return the name index, building it from `data` on first use.
+
+    The index subscribes to the store so inserts and deletes (including
+    those made by other workers on a shared store) keep it up to date.
+    Only one request builds it; changes reported while it reads the store
+    are held back and applied once the build is done, so a person deleted
+    meanwhile is not left in the index.
+
+    Returns:
+        NameIndex: The name index.
+    """
+    global name_index
+    if name_index is None:
+        with name_index_lock:
+            # Another request may have built it while we waited
+            if name_index is None:
+                index = NameIndex()
+                pending = []
+                pending_lock = threading.Lock()
+
+                def update(person_id, person):
+                    with pending_lock:
+                        if pending is not None:
+                            pending.append((person_id, person))
+                            return
+                    index.update(person_id, person)
+
+                data.subscribe(update)
+                for person in data:
+                    index.add(person)
+                with pending_lock:
+                    for person_id, person in pending:
+                        index.update(person_id, person)
+                    pending = None
+                name_index = index
+    else:
+        # Replay changes other workers made since the last request
+        data.refresh()
+    return name_index
+
+
+def check_person(person):
+    """
+    Check that a person can be stored, whichever backend holds the data.
+
+    Ids must be UUIDs in their canonical lowercase form: the log store
+    indexes the 16 bytes of the UUID, and `DELETE /person/<uuid>` only
+    matches UUIDs, so every backend accepts the same ids.
+
+    Args:
+        person: Decoded JSON body of one person.
+
+    Raises:
+        ValueError: If the person is not an object or its id is not a UUID.
+    """
+    if not isinstance(person, dict) or "id" not in person:
+        raise ValueError("Invalid input parameter")
+    try:
+        valid = str(uuid.UUID(person["id"])) == person["id"]
+    except (TypeError, ValueError, AttributeError):
+        valid = False
+    if not valid:
+        raise ValueError("Person 'id' must be a lowercase UUID")
+
+
 # Define a route for the root URL ("/")
 @app.route("/")
 def index():
@@ -107,6 +194,7 @@ def index_explicit():
 def get_data():
     try:
         # Check if 'data' exists and has a length greater than 0
+        # (len() reads the store's maintained counter, no scan)
         if data and len(data) > 0:
             # Return a JSON response with a message indicating the length of the data
             return {"message": f"Data of length {len(data)} found"}
@@ -123,15 +211,22 @@ def get_data():
 @app.route("/name_search")
 def name_search():
     """
-    Find a person in the database based on the provided query parameter.
+    Find people whose first or last name contains the provided query parameter.
+
+    Matches come from the name index, one page at a time, selected with the
+    optional `limit` (default 20, max 100) and `offset` (default 0) parameters.
+
     Returns:
-        json: Person if found, with status of 200
+        json: Matching people, with status of 200
         404: If not found
         400: If the argument 'q' is missing
-        422: If the argument 'q' is present but invalid (e.g., empty or numeric)
+        422: If the argument 'q' is present but invalid (e.g., empty or numeric),
+             or if 'limit'/'offset' are not valid
     """
     # Get the argument 'q' from the query parameters of the request
     query = request.args.get('q')
+    limit = request.args.get('limit', "20")
+    offset = request.args.get('offset', "0")
 
     #Check if the query parameter 'q' is missing
     if query is None:
@@ -140,11 +235,24 @@ def name_search():
     # Check if the query parameter is present but invalid (e.g., empty or numeric)
     if query.strip() == "" or query.isdigit():
         return {"message": "Invalid input parameter"}, 422
-    
-    # Iterate through the 'data' list to look for the person whose first name matches the query
-    for person in data:
-        if query.lower() in person["first_name"].lower():
-            return person, 200
+
+    # Check that the paging parameters are integers within range
+    if not limit.isdigit() or not offset.isdigit():
+        return {"message": "Invalid paging parameter"}, 422
+    limit, offset = int(limit), int(offset)
+    if not 1 <= limit <= 100:
+        return {"message": "Invalid paging parameter"}, 422
+
+    # Look the query up in the name index instead of scanning 'data'
+    person_ids, has_more = get_name_index().search(query, limit=limit, offset=offset)
+    if person_ids:
+        return {
+            # Skip people deleted between the index lookup and the fetch
+            "results": [person for person in map(data.get, person_ids) if person is not None],
+            "limit": limit,
+            "offset": offset,
+            "next_offset": offset + limit if has_more else None,
+        }, 200
 
     # If no match is found, return a JSON response with a message indicating the person was not found and a 404 Not Found status code    
     return {"message": "Person not Found"}, 404
@@ -153,7 +261,7 @@ def name_search():
 @app.route("/count")
 def count():
     """
-    Return the number of items in the global `data` list.
+    Return the number of items in the global `data` store.
 
     If `data` is defined, returns a JSON response containing the count
     and an HTTP 200 status code.
@@ -178,10 +286,10 @@ def count():
 @app.route("/person/<uuid>")
 def find_by_uuid(uuid):
     """
-    Find and return a person from the 'data' list by their UUID.
+    Find and return a person from the 'data' store by their UUID.
 
-    Iterates through the `data` list searching for a person whose
-    'd' field matches the provided UUID.
+    Looks the UUID up in the store's id index, so the cost does not
+    depend on how many people are stored.
 
     Args:
         uuid (str): Unique identifier of the person to search for.
@@ -196,11 +304,10 @@ def find_by_uuid(uuid):
                 dict: JSON error message.
                 int: HTTP status code 404.
     """
-    # Iterate through the 'data' list to search for a person with a matching ID
-    for person in data:
-        # Check if the 'id' field matches the UUID parameter
-        if person["id"] == str(uuid):
-            return person, 200
+    # Look up the person by ID through the store's index
+    person = data.get(str(uuid))
+    if person is not None:
+        return person, 200
 
     # If no matching person is found, return 404
     return {"message": "Person not found"}, 404
@@ -210,12 +317,11 @@ def find_by_uuid(uuid):
 @app.route("/person/<uuid:id>", methods=["DELETE"])
 def delete_person(id):
     """
-    Delete a person from the `data` list by their UUID.
+    Delete a person from the `data` store by their UUID.
 
-    Searches through the `data` list for a person whose `id` field
-    matches the provided identifier. If found, removes the person
-    from the list and returns a success message with HTTP status
-    code 200.
+    Removes the person whose `id` field matches the provided identifier
+    through the store's index. If found, returns a success message with
+    HTTP status code 200.
 
     If no matching person is found, returns an error message with
     HTTP status code 404.
@@ -228,12 +334,9 @@ def delete_person(id):
             dict: JSON success or error message.
             int: HTTP status code (200 or 404).
     """
-    for person in data:
-        if person["id"] == str(id):
-            # Remove the person from the data list
-            data.remove(person)
-
-            return {"message": "Person with ID deleted"}, 200
+    # Remove the person from the data store
+    if data.remove(str(id)) is not None:
+        return {"message": "Person with ID deleted"}, 200
 
     # If no person with the given ID is found
     return {"message": "Person not found"}, 404
@@ -242,37 +345,124 @@ def delete_person(id):
 @app.route("/person", methods=["POST"])
 def add_by_uuid():
     """
-    Add a new person to the global `data` list using JSON from the request.
+    Add a new person to the global `data` store using JSON from the request.
 
     Expects a JSON payload containing the person's information.
-    If the payload is missing or invalid, returns an error message
-    with HTTP status code 422 (Unprocessable Entity).
+    If the payload is missing, invalid or its `id` is not a UUID, returns
+    an error message with HTTP status code 422 (Unprocessable Entity).
 
-    Attempts to append the new person to the `data` list. If the
-    `data` variable is not defined, returns an error message with
-    with HTTP status code 500 (Internal Server Error).
+    Attempts to insert the new person into the `data` store. If a person
+    with the same `id` already exists, returns an error message with HTTP
+    status code 409 (Conflict). If the `data` variable is not defined,
+    returns an error message with HTTP status code 500 (Internal Server
+    Error).
 
     On success, returns the ID of the newly created person.
 
     Returns:
         tuple:
             dict: JSON response message.
-            int: HTTP status code (200, 422, or 500).
+            int: HTTP status code (200, 409, 422, or 500).
     """
     new_person = request.json
 
-    if not new_person:
-        return {"message": "Invalid input parameter"}, 422
+    try:
+        check_person(new_person)
+    except ValueError as e:
+        return {"message": str(e)}, 422
 
-    # Code to validate new_person omitted
+    # Reject duplicate IDs through the store's index
     try:
-        data.append(new_person)
+        if new_person["id"] in data:
+            return {"message": "Person with ID already exists"}, 409
+        data.add(new_person)
+    except ValueError as e:
+        return {"message": str(e)}, 422
     except NameError:
         return {"message": "data not defined"}, 500
 
     return {"message": f"{new_person['id']}"}, 200
 
 
+@app.route("/person/bulk", methods=["POST"])
+def bulk_add_people():
+    """
+    Import people from a newline-delimited JSON (NDJSON) request body.
+
+    The body is read as a stream, one JSON object per line, and people are
+    inserted into the `data` store in batches of `BULK_BATCH_SIZE`. Lines
+    that are not valid JSON objects with a UUID `id`, or that the store rejects
+    (e.g. duplicate IDs), are reported without aborting the import.
+
+    The response is streamed as NDJSON too: one `{"line", "message"}` object
+    per rejected line, followed by a summary `{"imported", "failed"}` line.
+
+    Returns:
+        Response: Streamed NDJSON report with HTTP status code 200.
+    """
+
+    counts = {"imported": 0, "failed": 0}
+
+    def report(line_number, message):
+        # Count a rejected line and format its NDJSON report
+        counts["failed"] += 1
+        return json.dumps({"line": line_number, "message": message}) + "\n"
+
+    def parse(line):
+        # Return the person on the line, or raise ValueError
+        try:
+            person = json.loads(line)
+        except ValueError:
+            raise ValueError("Invalid JSON")
+        check_person(person)
+        return person
+
+    def flush(batch):
+        # Insert one batch and report the people the store rejected
+        errors = data.add_many([person for _, person in batch])
+        for (line_number, _), error in zip(batch, errors):
+            if error is None:
+                counts["imported"] += 1
+            else:
+                yield report(line_number, error)
+
+    def generate():
+        batch = []
+        for line_number, line in enumerate(request.stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                batch.append((line_number, parse(line)))
+            except ValueError as e:
+                yield report(line_number, str(e))
+            if len(batch) >= BULK_BATCH_SIZE:
+                yield from flush(batch)
+                batch = []
+        yield from flush(batch)
+        yield json.dumps(counts) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@app.route("/person/export")
+def export_people():
+    """
+    Export every person in the `data` store as newline-delimited JSON.
+
+    Records are serialized one at a time by a generator, so memory use does
+    not grow with the size of the store.
+
+    Returns:
+        Response: Streamed NDJSON body with HTTP status code 200.
+    """
+
+    def generate():
+        for person in data:
+            yield json.dumps(person) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
 @app.errorhandler(404)
 def api_not_found(error):
     """
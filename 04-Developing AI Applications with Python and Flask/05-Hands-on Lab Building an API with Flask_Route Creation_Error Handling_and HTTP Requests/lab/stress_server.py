@@ -0,0 +1,117 @@
+"""Hammer the people API with concurrent reads and writes.
+
+Usage:
+    python stress_server.py [REQUESTS_PER_THREAD]
+
+Runs 1, 2, 4, 8 and 16 threads against the app's test client. Each thread
+adds people (20% of requests), deletes people it added (10%) and reads
+the rest of the time: lookups by id, name searches, counts and full
+exports. Afterwards it checks that:
+
+- no request failed with a server error or returned inconsistent data,
+- the store holds exactly the seeded people plus those added and not deleted,
+- every id appears once, and the export lists them all,
+- the name index holds the same people as the store.
+
+Throughput is printed per thread count. Set PEOPLE_STORE as for the server
+to stress a persistent backend.
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+
+import server
+
+THREADS = [1, 2, 4, 8, 16]
+NAMES = ["Tanya", "Ferdy", "Lilla", "Abdel", "Corby", "Stress", "Worker"]
+
+
+def worker(seed, requests, errors, counts):
+    """Send `requests` random requests; record failures and net additions."""
+    rng = random.Random(seed)
+    client = server.app.test_client()
+    added = []
+    for _ in range(requests):
+        roll = rng.random()
+        if roll < 0.2:
+            person = {"id": str(uuid.UUID(int=rng.getrandbits(128))), "first_name": rng.choice(NAMES), "last_name": "Stress"}
+            response = client.post("/person", json=person)
+            if response.status_code == 200:
+                added.append(person["id"])
+        elif roll < 0.3 and added:
+            person_id = added.pop(rng.randrange(len(added)))
+            response = client.delete(f"/person/{person_id}")
+            if response.status_code != 200:
+                errors.append(f"DELETE {person_id}: {response.status_code}")
+        elif roll < 0.6 and added:
+            person_id = rng.choice(added)
+            response = client.get(f"/person/{person_id}")
+            if response.status_code != 200 or response.json["id"] != person_id:
+                errors.append(f"GET {person_id}: {response.status_code}")
+        elif roll < 0.8:
+            response = client.get("/name_search", query_string={"q": rng.choice(NAMES)[:3]})
+            if response.status_code == 200 and None in response.json["results"]:
+                errors.append("name_search returned a deleted person")
+        elif roll < 0.95:
+            response = client.get("/count")
+        else:
+            response = client.get("/person/export")
+            # A torn record would fail to decode
+            for line in response.get_data().splitlines():
+                json.loads(line)
+        if response.status_code >= 500:
+            errors.append(f"{response.request.method} {response.request.path}: {response.status_code} {response.get_data(as_text=True)}")
+    counts.append(len(added))
+
+
+def check(expected):
+    """Return the broken invariants after a run."""
+    problems = []
+    ids = [person["id"] for person in server.data]
+    if len(ids) != len(set(ids)):
+        problems.append("duplicate ids in the store")
+    if len(ids) != expected or len(server.data) != expected:
+        problems.append(f"store holds {len(ids)} people (len {len(server.data)}), expected {expected}")
+    exported = server.app.test_client().get("/person/export").get_data().splitlines()
+    if len(exported) != expected:
+        problems.append(f"export lists {len(exported)} people, expected {expected}")
+    index = server.get_name_index()
+    if len(index) != len(ids):
+        problems.append(f"name index holds {len(index)} people, store {len(ids)}")
+    return problems
+
+
+def run(threads, requests):
+    """Run one round; return requests per second and the broken invariants."""
+    start_count = len(server.data)
+    errors, counts = [], []
+    workers = [threading.Thread(target=worker, args=(seed, requests, errors, counts)) for seed in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return threads * requests / elapsed, errors + check(start_count + sum(counts))
+
+
+def main(requests):
+    # Build the name index up front so it follows every change of the run
+    server.get_name_index()
+    print(f"{'threads':>8} {'requests/s':>11} {'people':>8} {'problems':>9}")
+    failed = False
+    for threads in THREADS:
+        rate, problems = run(threads, requests)
+        print(f"{threads:>8} {rate:>11,.0f} {len(server.data):>8,} {len(problems):>9}")
+        for problem in problems[:10]:
+            print(f"    {problem}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -1 +1,3 @@
-from . import mathematics
\ No newline at end of file
+from . import cache
+from . import expressions
+from . import mathematics
@@ -0,0 +1,88 @@
+import collections
+import threading
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe mapping that evicts the least recently used entry.
+
+    Keeps hit, miss and eviction counters, so the hit rate of the hot keys
+    can be watched. A cache with `maxsize` 0 stores nothing.
+    """
+
+    def __init__(self, maxsize):
+        """
+        Create an empty cache.
+
+        Parameters:
+            maxsize: Largest number of entries kept
+        """
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        """
+        Returns the number of entries
+        """
+        return len(self._entries)
+
+    def get(self, key, record=True):
+        """
+        Looks a key up and marks it as recently used.
+
+        Parameters:
+            key: The key
+            record: Whether the lookup counts as a hit or a miss; a second
+                lookup for the same request should not
+
+        Returns:
+            The cached value, or None if the key is not cached
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += record
+                return None
+            self._entries.move_to_end(key)
+            self._hits += record
+            return value
+
+    def put(self, key, value):
+        """
+        Stores a value, evicting the least recently used entry when full.
+
+        Parameters:
+            key: The key
+            value: The value (not None)
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: 'size', 'maxsize', 'hits', 'misses', 'evictions' and
+                'hit_rate' (hits per lookup, 0 before the first one)
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,142 @@
+import ast
+import functools
+
+from .mathematics import summation, subtraction, multiplication
+
+# Longest expression accepted
+MAX_EXPRESSION_LENGTH = 1000
+# Deepest nesting of operations accepted; compiling and evaluating recurse once
+# per level, so this keeps both well under Python's recursion limit
+MAX_DEPTH = 200
+# Number of compiled expressions kept by `compile_expression`
+EXPRESSION_CACHE_SIZE = 256
+
+# Infix operators and function-call spellings of the supported operations
+OPERATORS = {ast.Add: summation, ast.Sub: subtraction, ast.Mult: multiplication}
+FUNCTIONS = {"sum": summation, "sub": subtraction, "mul": multiplication}
+
+
+class Expression:
+    """
+    A parsed arithmetic expression, ready to evaluate.
+
+    The syntax tree is turned into nested Python closures once, so
+    evaluating only calls the operations. Each variable may be bound to
+    a number or to a NumPy array, in which case the whole expression is
+    evaluated element-wise in one pass.
+    """
+
+    def __init__(self, text, evaluate, variables):
+        """
+        Wrap a compiled expression.
+
+        Parameters:
+            text: The source of the expression
+            evaluate: Function of the bindings dictionary computing the result
+            variables: Names of the variables the expression uses
+        """
+        self.text = text
+        self.variables = variables
+        self._evaluate = evaluate
+
+    def __call__(self, bindings):
+        """
+        Evaluates the expression.
+
+        Parameters:
+            bindings: Dictionary of variable name to number or NumPy array
+
+        Returns:
+            int, float or numpy.ndarray: The result
+
+        Raises:
+            ValueError: If a variable is not bound
+        """
+        missing = [name for name in self.variables if name not in bindings]
+        if missing:
+            raise ValueError(f"Missing variable: {missing[0]}")
+        return self._evaluate(bindings)
+
+
+@functools.lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(text):
+    """
+    Parses and compiles an arithmetic expression, with an LRU cache.
+
+    Accepts numbers, variables, parentheses, unary `+`/`-`, the operators
+    `+`, `-` and `*`, and the calls `sum(a, b)`, `sub(a, b)` and
+    `mul(a, b)`. Anything else is rejected; nothing is ever passed to
+    `eval`. Repeated formulas are served from the cache without parsing.
+
+    Parameters:
+        text: The expression, e.g. "mul(price, qty) - discount"
+
+    Returns:
+        Expression: The compiled expression
+
+    Raises:
+        ValueError: If the expression is too long, nested deeper than
+            MAX_DEPTH, invalid or uses anything outside the whitelist
+    """
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Invalid expression: {text}")
+    variables = set()
+    evaluate, _ = _compile(tree.body, variables, 1)
+    return Expression(text, evaluate, tuple(sorted(variables)))
+
+
+def _compile(node, variables, depth):
+    """
+    Turns one whitelisted syntax node into a function of the bindings.
+
+    Sub-expressions without variables are computed once, here. Numbers
+    are converted to floats, as the bound values are.
+
+    Raises:
+        ValueError: If the node is nested deeper than MAX_DEPTH, or a
+            number is too large for a float
+
+    Returns:
+        tuple: The function, and whether its result is a constant
+    """
+    if depth > MAX_DEPTH:
+        raise ValueError(f"Expression nested deeper than {MAX_DEPTH} levels")
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        try:
+            value = float(node.value)
+        except OverflowError:
+            raise ValueError(f"Number too large: {ast.unparse(node)[:20]}...")
+        return (lambda bindings: value), True
+    if isinstance(node, ast.Name):
+        name = node.id
+        variables.add(name)
+        return (lambda bindings: bindings[name]), False
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand = _compile(node.operand, variables, depth + 1)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        operation, operands = multiplication, [((lambda bindings: -1), True), operand]
+    elif isinstance(node, ast.BinOp) and type(node.op) in OPERATORS:
+        operation = OPERATORS[type(node.op)]
+        operands = [_compile(node.left, variables, depth + 1), _compile(node.right, variables, depth + 1)]
+    elif (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and len(node.args) == 2
+        and not node.keywords
+    ):
+        operation = FUNCTIONS[node.func.id]
+        operands = [_compile(argument, variables, depth + 1) for argument in node.args]
+    else:
+        raise ValueError(f"Unsupported syntax: {ast.unparse(node)}")
+
+    (left, left_constant), (right, right_constant) = operands
+    if left_constant and right_constant:
+        value = operation(left(None), right(None))
+        return (lambda bindings: value), True
+    return (lambda bindings: operation(left(bindings), right(bindings))), False
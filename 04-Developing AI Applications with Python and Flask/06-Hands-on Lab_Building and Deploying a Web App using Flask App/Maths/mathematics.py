@@ -3,8 +3,8 @@ def summation(a, b):
     Adds two numbers and return the result
 
     Parameters:
-        a: The first Number
-        b: The second Number
+        a: The first Number (or NumPy array, element-wise)
+        b: The second Number (or NumPy array, element-wise)
 
     Returns:
         int or float: The sum of a and b
@@ -17,8 +17,8 @@ def subtraction(a, b):
     Subtracts two numbers and return the result
 
     Parameters:
-        a: The first Number
-        b: The second Number
+        a: The first Number (or NumPy array, element-wise)
+        b: The second Number (or NumPy array, element-wise)
 
     Returns:
         int or float: The result of a minus b
@@ -31,8 +31,8 @@ def multiplication(a, b):
     Multiplies two numbers and returns the result.
 
     Parameters:
-        a: The first Number
-        b: The second Number
+        a: The first Number (or NumPy array, element-wise)
+        b: The second Number (or NumPy array, element-wise)
 
     Returns:
         int or float: The product of a and b.
@@ -0,0 +1,61 @@
+"""Compare single-pair requests with batched ones.
+
+Usage:
+    python bench_batch.py
+
+Times /mul one pair per request, then /batch/mul with batches of 1, 100,
+10k and 1M pairs, sent as JSON and as packed binary, and reports the
+operations per second of each. Requests go through Flask's test client,
+so the figures include the WSGI and Flask overhead of every request but
+not the network.
+"""
+
+import time
+
+import numpy as np
+
+from server import BINARY_DTYPE, BINARY_MIMETYPE, app
+
+SINGLE_REQUESTS = 2000
+BATCH_SIZES = [1, 100, 10_000, 1_000_000]
+# Operations timed per batch size (at least one request)
+OPERATIONS_PER_SIZE = 2_000_000
+
+
+def rate(count, function, repeat):
+    """Run a function `repeat` times; return operations per second."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return count * repeat / (time.perf_counter() - start)
+
+
+def main():
+    client = app.test_client()
+    rng = np.random.default_rng(42)
+
+    single = rate(1, lambda: client.get("/mul", query_string={"num1": "3.5", "num2": "7"}), SINGLE_REQUESTS)
+    print(f"{'request':<22} {'batch':>10} {'ops/s':>14}")
+    print(f"{'/mul, one pair':<22} {1:>10,} {single:>14,.0f}")
+
+    for size in BATCH_SIZES:
+        num1 = rng.uniform(-1000, 1000, size).round(2)
+        num2 = rng.uniform(-1000, 1000, size).round(2)
+        repeat = max(1, min(OPERATIONS_PER_SIZE // size, SINGLE_REQUESTS))
+        payload = {"num1": num1.tolist(), "num2": num2.tolist()}
+        body = num1.astype(BINARY_DTYPE).tobytes() + num2.astype(BINARY_DTYPE).tobytes()
+
+        def send_json():
+            response = client.post("/batch/mul", json=payload)
+            assert len(response.json["results"]) == size
+
+        def send_binary():
+            response = client.post("/batch/mul", data=body, content_type=BINARY_MIMETYPE)
+            assert len(response.data) == size * BINARY_DTYPE.itemsize
+
+        print(f"{'/batch/mul, JSON':<22} {size:>10,} {rate(size, send_json, repeat):>14,.0f}")
+        print(f"{'/batch/mul, binary':<22} {size:>10,} {rate(size, send_binary, repeat):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure the result cache on dashboard-like traffic.
+
+Usage:
+    python bench_cache.py [REQUESTS]
+
+Sends REQUESTS (default 20k) /sum, /sub and /mul queries drawn from 200
+hot operand pairs (Zipf-distributed, like dashboards polling the same
+figures) plus 10% one-off pairs, with the cache disabled and enabled,
+then the same queries as revalidations carrying the ETag of an earlier
+response. Each mode is timed through Flask's test client and by calling
+the WSGI application directly with prepared environments; the second
+leaves out the client's own cost, which otherwise hides most of the time
+saved by answering cache hits before Flask. Neither includes the
+network; a reverse proxy honouring Cache-Control would answer the hot
+queries without reaching Python at all.
+"""
+
+import random
+import sys
+import time
+
+from werkzeug.test import EnvironBuilder
+
+import server
+from Maths.cache import LRUCache
+
+HOT_PAIRS = 200
+CACHE_SIZE = 1000
+
+
+def make_queries(count, seed=42):
+    """Return `count` (path, num1, num2) queries, mostly from the hot pairs."""
+    rng = random.Random(seed)
+    hot = [(rng.choice(["/sum", "/sub", "/mul"]), f"{rng.uniform(0, 1000):.2f}", str(rng.randint(1, 100))) for _ in range(HOT_PAIRS)]
+    weights = [1 / rank for rank in range(1, HOT_PAIRS + 1)]
+    queries = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            queries.append(("/mul", f"{rng.uniform(0, 1e6):.4f}", f"{rng.uniform(0, 1e6):.4f}"))
+        else:
+            queries.append(rng.choices(hot, weights)[0])
+    return queries
+
+
+def run(client, queries, etags=None):
+    """Send the queries; return requests per second and the responses' ETags."""
+    seen = {}
+    start = time.perf_counter()
+    for path, num1, num2 in queries:
+        headers = {"If-None-Match": etags[(path, num1, num2)]} if etags else None
+        response = client.get(path, query_string={"num1": num1, "num2": num2}, headers=headers)
+        seen[(path, num1, num2)] = response.headers.get("ETag")
+    return len(queries) / (time.perf_counter() - start), seen
+
+
+def run_wsgi(queries, etags=None):
+    """Call the WSGI application directly; return requests per second."""
+    environs = []
+    for path, num1, num2 in queries:
+        headers = {"If-None-Match": etags[(path, num1, num2)]} if etags else None
+        environs.append(EnvironBuilder(path=path, query_string={"num1": num1, "num2": num2}, headers=headers).get_environ())
+    start_response = lambda status, headers, exc_info=None: None
+    start = time.perf_counter()
+    for environ in environs:
+        b"".join(server.app.wsgi_app(dict(environ), start_response))
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main(count):
+    client = server.app.test_client()
+    queries = make_queries(count)
+    print(f"{'mode':<26} {'test client/s':>14} {'WSGI/s':>9} {'hit rate':>9}")
+    for label, size in (("no cache", 0), ("LRU cache", CACHE_SIZE)):
+        server.result_cache = LRUCache(size)
+        rate, etags = run(client, queries)
+        hit_rate = server.result_cache.stats()["hit_rate"]
+        server.result_cache = LRUCache(size)
+        wsgi_rate = run_wsgi(queries)
+        print(f"{label:<26} {rate:>14,.0f} {wsgi_rate:>9,.0f} {hit_rate:>9.1%}")
+    rate, _ = run(client, queries, etags)
+    wsgi_rate = run_wsgi(queries, etags)
+    print(f"{'LRU cache, revalidated 304':<26} {rate:>14,.0f} {wsgi_rate:>9,.0f} {server.result_cache.stats()['hit_rate']:>9.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
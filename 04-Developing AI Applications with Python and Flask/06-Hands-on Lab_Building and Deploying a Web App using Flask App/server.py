@@ -1,8 +1,33 @@
-from flask import Flask, render_template, request, jsonify
+import hashlib
+import json
+import os
+from urllib.parse import parse_qsl
+
+import numpy as np
+from flask import Flask, Response, make_response, render_template, request, jsonify
+from werkzeug.http import parse_etags, quote_etag
+from Maths.cache import LRUCache
+from Maths.expressions import compile_expression
 from Maths.mathematics import summation, subtraction, multiplication
 
 app = Flask("Mathematics Problem Solver")
 
+# Operations available to /batch, by the name of their single-pair route
+OPERATIONS = {"sum": summation, "sub": subtraction, "mul": multiplication}
+# Packed binary operands and results: little-endian float64
+BINARY_MIMETYPE = "application/octet-stream"
+BINARY_DTYPE = np.dtype("<f8")
+# JSON element types `parse_numbers` accepts (strings must hold a number)
+NUMBER_TYPES = {int, float, str}
+# A result never changes, so clients and proxies may keep it for a year
+RESULT_MAX_AGE = 365 * 24 * 3600
+
+# Single-pair routes whose results are cached, by path
+SINGLE_PAIR_PATHS = {"/sum": "sum", "/sub": "sub", "/mul": "mul"}
+# Formatted results of /sum, /sub and /mul with their ETags, one entry per
+# operation and parsed operands, bounded by MATHS_CACHE_SIZE entries
+result_cache = LRUCache(int(os.environ.get("MATHS_CACHE_SIZE", "10000")))
+
 def parse_number(value, name):
     """
     Parses a query parameter into a float.
@@ -24,6 +49,23 @@ def parse_number(value, name):
     except ValueError:
         raise ValueError(f"Invalid number for '{name}': {value}")
 
+def parse_expression(value):
+    """
+    Checks that an expression parameter is present.
+
+    Args:
+        value (str): The `expr` parameter value.
+
+    Returns:
+        str: The expression.
+
+    Raises:
+        ValueError: If the parameter is missing or not a string.
+    """
+    if not isinstance(value, str) or value.strip() == "":
+        raise ValueError("Missing parameter: expr")
+    return value
+
 def format_result(result):
     """
     Formats a numeric result for output.
@@ -40,66 +82,363 @@ def format_result(result):
         return str(int(result))
     return str(result)
 
-@app.route("/sum")
-def sum_route():
+def parse_numbers(values, name):
     """
-    Handles addition requests.
+    Parses a JSON value holding one or many operands into a float array.
 
-    Reads `num1` and `num2` from query parameters, performs summation,
-    and returns the formatted result.
+    Args:
+        values (list, number or str): A list of numbers (or numeric
+            strings), or a single one to apply to every pair.
+        name (str): The parameter name (used for error messages).
 
     Returns:
-        str: The sum result if successful.
+        numpy.ndarray: The operands as a float64 array (0-d for a single value).
+
+    Raises:
+        ValueError: If the parameter is missing, nested or not numeric.
+    """
+    if values is None or (isinstance(values, str) and values == ""):
+        raise ValueError(f"Missing parameter: {name}")
+    # NumPy would read None as NaN and true as 1; one pass over the types
+    # costs about as much as the `None in values` scan it replaces
+    types = set(map(type, values)) if isinstance(values, list) else {type(values)}
+    if type(None) in types:
+        raise ValueError(f"Missing value in '{name}'")
+    if not types <= NUMBER_TYPES:
+        raise ValueError(f"Invalid number in '{name}'")
+    try:
+        array = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid number in '{name}'")
+    if array.ndim > 1:
+        raise ValueError(f"'{name}' must be a number or a flat list of numbers")
+    return array
+
+def format_results(results):
+    """
+    Formats an array of results the way `format_result` formats one.
+
+    The whole numbers are found in one vectorized step and converted to
+    integers in bulk; the other values only need `str`.
+
+    Args:
+        results (numpy.ndarray): The calculation results.
+
+    Returns:
+        list: The formatted results as strings.
+    """
+    results = np.atleast_1d(results)
+    whole = np.isfinite(results) & (np.trunc(results) == results)
+    small = whole & (np.abs(results) < 2**63)
+    formatted = np.empty(len(results), dtype=object)
+    formatted[small] = list(map(str, results[small].astype(np.int64).tolist()))
+    # Whole numbers too large for int64 go through Python's arbitrary-size int
+    formatted[whole & ~small] = [str(int(result)) for result in results[whole & ~small].tolist()]
+    formatted[~whole] = list(map(str, results[~whole].tolist()))
+    return formatted.tolist()
+
+def cache_key(operation, query_string):
+    """
+    Returns the result cache key of a single-pair query string.
+
+    The operands are read the way `parse_number` reads them (the first
+    value of each parameter, through `float`), so a request is found under
+    the key its route stores.
+
+    Args:
+        operation (str): "sum", "sub" or "mul".
+        query_string (str): The raw query string of the request.
+
+    Returns:
+        tuple: The operation and both operands, or None if an operand is
+            missing or not a valid number (the route then answers).
+    """
+    values = {}
+    for name, value in parse_qsl(query_string, keep_blank_values=True):
+        values.setdefault(name, value)
+    try:
+        return (operation, float(values["num1"]), float(values["num2"]))
+    except (KeyError, ValueError):
+        return None
+
+def compute_result(operation, value1, value2):
+    """
+    Computes a single-pair operation, reusing cached results.
+
+    Results are cached under the operation and the parsed operands, so
+    "2", "2.0" and "2e0" share one entry.
+
+    Args:
+        operation (str): "sum", "sub" or "mul".
+        value1 (str): The `num1` query parameter value.
+        value2 (str): The `num2` query parameter value.
+
+    Returns:
+        tuple: The formatted result and its ETag.
+
+    Raises:
+        ValueError: If a parameter is missing or not a valid number.
+    """
+    num1 = parse_number(value1, "num1")
+    num2 = parse_number(value2, "num2")
+    key = (operation, num1, num2)
+    # Hits and misses are counted once per request, by serve_cached_result
+    entry = result_cache.get(key, record=False)
+    if entry is None:
+        result = format_result(OPERATIONS[operation](num1, num2))
+        entry = (result, hashlib.blake2b(result.encode(), digest_size=8).hexdigest())
+        result_cache.put(key, entry)
+    return entry
+
+def warm_cache(path):
+    """
+    Precomputes the results listed in a JSON file.
+
+    Those requests are then answered by `serve_cached_result`, without Flask.
+
+    Args:
+        path (str): File holding a list of `[operation, num1, num2]` entries,
+            e.g. `[["sum", "2", "3"], ["mul", "1.5", "4"]]`.
+
+    Returns:
+        int: The number of results computed.
+
+    Raises:
+        ValueError: If an entry names an unknown operation or holds an
+            invalid number.
+    """
+    with open(path, encoding="utf-8") as file:
+        entries = json.load(file)
+    for operation, num1, num2 in entries:
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation in {path}: {operation}")
+        compute_result(operation, str(num1), str(num2))
+    return len(entries)
+
+def caching_headers(etag):
+    """
+    Returns the HTTP caching headers of a single-pair result.
+
+    Args:
+        etag (str): The result's ETag, without quotes.
+
+    Returns:
+        list: `(name, value)` header pairs.
+    """
+    return [("ETag", quote_etag(etag)), ("Cache-Control", f"public, max-age={RESULT_MAX_AGE}, immutable")]
+
+def serve_cached_result(wsgi_app):
+    """
+    Wraps the WSGI application to answer cached single-pair queries.
+
+    A GET request to /sum, /sub or /mul whose operands have been answered
+    before is served from the result cache right here, without going
+    through Flask's request handling (or `format_result`); every other
+    request is passed on.
+
+    Args:
+        wsgi_app: The Flask application's WSGI callable.
+
+    Returns:
+        callable: The wrapping WSGI callable.
+    """
+
+    def middleware(environ, start_response):
+        operation = SINGLE_PAIR_PATHS.get(environ.get("PATH_INFO"))
+        if operation is None or environ.get("REQUEST_METHOD") != "GET":
+            return wsgi_app(environ, start_response)
+        key = cache_key(operation, environ.get("QUERY_STRING", ""))
+        entry = None if key is None else result_cache.get(key)
+        if entry is None:
+            return wsgi_app(environ, start_response)
+        result, etag = entry
+        if parse_etags(environ.get("HTTP_IF_NONE_MATCH")).contains(etag):
+            start_response("304 NOT MODIFIED", caching_headers(etag))
+            return []
+        body = result.encode()
+        headers = [("Content-Type", "text/html; charset=utf-8"), ("Content-Length", str(len(body)))]
+        start_response("200 OK", headers + caching_headers(etag))
+        return [body]
+
+    return middleware
+
+def operation_response(operation):
+    """
+    Answers a single-pair request, with HTTP caching headers.
+
+    Reads `num1` and `num2` from the query parameters. The result is
+    cached, so the next request for the same operands is answered by
+    `serve_cached_result`. The response is marked
+    public and immutable with an ETag derived from the result, so browsers
+    and reverse proxies can answer repeat queries themselves, and a
+    revalidation with a matching `If-None-Match` gets a 304.
+
+    Args:
+        operation (str): "sum", "sub" or "mul".
+
+    Returns:
+        Response: The formatted result, or a 304 response.
         Response: JSON error message with HTTP 400 if input is invalid.
     """
     try:
-        num1 = parse_number(request.args.get("num1"), "num1")
-        num2 = parse_number(request.args.get("num2"), "num2")
-        result = summation(num1, num2)
-        return format_result(result)
+        entry = compute_result(operation, request.args.get("num1"), request.args.get("num2"))
     except ValueError as e:
         return jsonify(error=str(e)), 400
+    result, etag = entry
+    response = make_response(result)
+    response.headers.extend(caching_headers(etag))
+    return response.make_conditional(request)
+
+@app.route("/sum")
+def sum_route():
+    """
+    Handles addition requests.
+
+    Reads `num1` and `num2` from query parameters, performs summation
+    (through the result cache), and returns the formatted result.
+
+    Returns:
+        Response: The sum result, with caching headers, if successful.
+        Response: JSON error message with HTTP 400 if input is invalid.
+    """
+    return operation_response("sum")
 
 @app.route("/sub")
 def sub_route():
     """
     Handles subtraction requests.
 
-    Reads `num1` and `num2` from query parameters, performs subtraction,
-    and returns the formatted result.
+    Reads `num1` and `num2` from query parameters, performs subtraction
+    (through the result cache), and returns the formatted result.
 
     Returns:
-        str: The subtraction result if successful.
+        Response: The subtraction result, with caching headers, if successful.
         Response: JSON error message with HTTP 400 if input is invalid.
     """
-    try:
-        num1 = parse_number(request.args.get("num1"), "num1")
-        num2 = parse_number(request.args.get("num2"), "num2")
-        result = subtraction(num1, num2)
-        return format_result(result)
-    except ValueError as e:
-        return jsonify(error=str(e)), 400
+    return operation_response("sub")
 
 @app.route("/mul")
 def mul_route():
     """
     Handles multiplication requests.
 
-    Reads `num1` and `num2` from query parameters, performs multiplication,
-    and returns the formatted result.
+    Reads `num1` and `num2` from query parameters, performs multiplication
+    (through the result cache), and returns the formatted result.
 
     Returns:
-        str: The multiplication result if successful.
+        Response: The multiplication result, with caching headers, if successful.
         Response: JSON error message with HTTP 400 if input is invalid.
     """
+    return operation_response("mul")
+
+@app.route("/batch/<operation>", methods=["POST"])
+def batch_route(operation):
+    """
+    Handles a batch of operations of one kind in a single request.
+
+    `operation` is "sum", "sub" or "mul". The operands arrive either as
+    JSON, `{"num1": [...], "num2": [...]}`, where either side may be a
+    single number applied to every pair, or as a packed binary body
+    (`application/octet-stream`): all `num1` values followed by all `num2`
+    values, as little-endian float64. The operation runs once over the
+    whole columns with NumPy.
+
+    Returns:
+        Response: For JSON, `{"results": [...]}` formatted like the
+            single-pair routes; for binary, the results as packed
+            little-endian float64.
+        Response: JSON error message with HTTP 400 if input is invalid,
+            or HTTP 404 if the operation is unknown.
+    """
+    function = OPERATIONS.get(operation)
+    if function is None:
+        return jsonify(error=f"Unknown operation: {operation}"), 404
     try:
-        num1 = parse_number(request.args.get("num1"), "num1")
-        num2 = parse_number(request.args.get("num2"), "num2")
-        result = multiplication(num1, num2)
-        return format_result(result)
+        if request.mimetype == BINARY_MIMETYPE:
+            body = request.get_data()
+            if len(body) % (2 * BINARY_DTYPE.itemsize):
+                raise ValueError("Binary body must hold two equal columns of float64 values")
+            num1, num2 = np.frombuffer(body, dtype=BINARY_DTYPE).reshape(2, -1)
+            with np.errstate(over="ignore", invalid="ignore"):
+                results = function(num1, num2)
+            return Response(results.astype(BINARY_DTYPE).tobytes(), mimetype=BINARY_MIMETYPE)
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object with 'num1' and 'num2'")
+        num1 = parse_numbers(payload.get("num1"), "num1")
+        num2 = parse_numbers(payload.get("num2"), "num2")
+        if num1.ndim and num2.ndim and len(num1) != len(num2):
+            raise ValueError("'num1' and 'num2' must have the same length")
+        # Overflow gives inf and inf - inf gives nan, as with single pairs
+        with np.errstate(over="ignore", invalid="ignore"):
+            results = function(num1, num2)
+        return jsonify(results=format_results(results))
     except ValueError as e:
         return jsonify(error=str(e)), 400
 
+@app.route("/eval", methods=["GET", "POST"])
+def eval_route():
+    """
+    Evaluates an arithmetic expression over the supported operations.
+
+    The expression (`expr`) may use numbers, variables, parentheses,
+    `+`, `-`, `*` and the calls `sum(a, b)`, `sub(a, b)` and `mul(a, b)`.
+    It is parsed against a whitelist (never `eval`) and compiled once;
+    compiled expressions are kept in an LRU cache, so repeated formulas
+    skip parsing.
+
+    A GET request binds each variable from the query parameter of the
+    same name. A POST request sends JSON, `{"expr": ..., "bindings": ...}`,
+    where `bindings` maps each variable to a number or a list of numbers
+    (or is a list of `{variable: number}` objects); the expression is then
+    evaluated over all of them in one vectorized pass.
+
+    Returns:
+        str: The formatted result, for GET.
+        Response: `{"results": [...]}` formatted like `/batch`, for POST.
+        Response: JSON error message with HTTP 400 if the expression or
+            the bindings are invalid.
+    """
+    try:
+        if request.method == "GET":
+            expression = compile_expression(parse_expression(request.args.get("expr")))
+            bindings = {name: parse_number(request.args.get(name), name) for name in expression.variables}
+            return format_result(expression(bindings))
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object with 'expr' and 'bindings'")
+        expression = compile_expression(parse_expression(payload.get("expr")))
+        columns = payload.get("bindings") or {}
+        if isinstance(columns, list):
+            # One object per evaluation: turn the rows into columns
+            if not all(isinstance(row, dict) for row in columns):
+                raise ValueError("'bindings' rows must be objects")
+            columns = {name: [row.get(name) for row in columns] for name in expression.variables}
+        if not isinstance(columns, dict):
+            raise ValueError("'bindings' must be an object or a list of objects")
+        bindings = {name: parse_numbers(columns.get(name), name) for name in expression.variables}
+        lengths = {len(values) for values in bindings.values() if values.ndim}
+        if len(lengths) > 1:
+            raise ValueError("Every list in 'bindings' must have the same length")
+        return jsonify(results=format_results(np.asarray(expression(bindings), dtype=np.float64)))
+    except (ValueError, OverflowError) as e:
+        return jsonify(error=str(e)), 400
+
+@app.route("/cache/stats")
+def cache_stats_route():
+    """
+    Reports the result cache counters.
+
+    A hit is a single-pair request answered from the cache before Flask;
+    a miss is a valid one that went on to the route.
+
+    Returns:
+        Response: JSON with the size, hits, misses, evictions and hit rate.
+    """
+    return jsonify(result_cache.stats())
+
 @app.route("/")
 def render_index_page():
     """
@@ -110,5 +449,12 @@ def render_index_page():
     """
     return render_template("index.html")
 
+# Answer repeated single-pair queries before they reach Flask
+app.wsgi_app = serve_cached_result(app.wsgi_app)
+
+# Precompute the hot operand pairs listed in the file named by MATHS_CACHE_WARMUP
+if os.environ.get("MATHS_CACHE_WARMUP"):
+    warm_cache(os.environ["MATHS_CACHE_WARMUP"])
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5500)
@@ -0,0 +1,64 @@
+import unittest
+import warnings
+
+import numpy as np
+
+from server import BINARY_MIMETYPE, app
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def batch(self, operation, num1, num2):
+        return self.client.post(f"/batch/{operation}", json={"num1": num1, "num2": num2})
+
+    def test_results_match_the_single_pair_routes(self):
+        num1 = [2, "3.5", -1e-3, 1e20, 0.1]
+        num2 = [3, "2", 4, 3, 0.2]
+        for operation in ("sum", "sub", "mul"):
+            with self.subTest(operation=operation):
+                results = self.batch(operation, num1, num2).get_json()["results"]
+                singles = [
+                    self.client.get(f"/{operation}", query_string={"num1": a, "num2": b}).get_data(as_text=True)
+                    for a, b in zip(num1, num2)
+                ]
+                self.assertEqual(results, singles)
+
+    def test_a_single_number_applies_to_every_pair(self):
+        self.assertEqual(self.batch("mul", [1, 2, 3], 2).get_json(), {"results": ["2", "4", "6"]})
+        self.assertEqual(self.batch("sub", 10, [1, 2]).get_json(), {"results": ["9", "8"]})
+
+    def test_mismatched_lengths_are_rejected(self):
+        response = self.batch("sum", [1, 2, 3], [1, 2])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("same length", response.get_json()["error"])
+        response = self.client.post("/batch/sum", data=np.zeros(3).tobytes(), content_type=BINARY_MIMETYPE)
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_numeric_elements_are_rejected(self):
+        for value in (["1", "x"], [1, None], [1, True], [1, [2]], [1, {}], False, "", {"a": 1}, [[1, 2], [3, 4]]):
+            with self.subTest(value=value):
+                response = self.batch("sum", value, 1)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("num1", response.get_json()["error"])
+        self.assertEqual(self.client.post("/batch/sum", data="[1, 2]", content_type="application/json").status_code, 400)
+
+    def test_overflow_and_undefined_results(self):
+        # No division is offered; these are the operations' non-finite cases
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(self.batch("mul", [1e308, 0], [10, 1]).get_json()["results"], ["inf", "0"])
+            self.assertEqual(self.batch("sub", ["inf", 1], ["inf", 1]).get_json()["results"], ["nan", "0"])
+            response = self.client.post(
+                "/batch/sum", data=np.array([1e308, 1.0, 1e308, 2.0]).tobytes(), content_type=BINARY_MIMETYPE
+            )
+        self.assertEqual(np.frombuffer(response.get_data(), dtype="<f8").tolist(), [float("inf"), 3.0])
+        self.assertEqual(self.client.get("/mul?num1=1e308&num2=10").get_data(as_text=True), "inf")
+
+    def test_unknown_operation_is_404(self):
+        self.assertEqual(self.batch("div", [1], [0]).status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from Maths.expressions import MAX_DEPTH, compile_expression
+from server import app
+
+
+class TestExpressions(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_nested_within_limit_evaluates(self):
+        expression = compile_expression("-" * (MAX_DEPTH - 1) + "x")
+        self.assertEqual(expression({"x": 2}), 2 if MAX_DEPTH % 2 else -2)
+
+    def test_too_deep_expressions_are_rejected(self):
+        for text in ("-" * 999 + "1", "1" + "+x" * 499, "sum(" * 150 + "1" + ",x)" * 150):
+            with self.assertRaises(ValueError):
+                compile_expression(text)
+
+    def test_eval_endpoint_answers_400_for_deep_expressions(self):
+        response = self.client.get("/eval", query_string={"expr": "-" * 999 + "1"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("nested deeper", response.get_json()["error"])
+
+    def test_eval_endpoint_answers_400_for_numbers_too_large_for_a_float(self):
+        big = "1" + "0" * 400
+        for response in (
+            self.client.post("/eval", json={"expr": big + "*x", "bindings": {"x": [1, 2]}}),
+            self.client.post("/eval", json={"expr": big}),
+            self.client.get("/eval", query_string={"expr": big + "*x", "x": "2"}),
+        ):
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("too large", response.get_json()["error"])
+
+    def test_constants_evaluate_like_bound_numbers(self):
+        response = self.client.get("/eval", query_string={"expr": "mul(3, x) + 1", "x": "2"})
+        self.assertEqual(response.get_data(as_text=True), "7")
+
+
+
+if __name__ == "__main__":
+    unittest.main()
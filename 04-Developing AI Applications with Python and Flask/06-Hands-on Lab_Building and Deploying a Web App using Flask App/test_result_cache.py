@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import server
+from Maths.cache import LRUCache
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(server, "result_cache", LRUCache(3))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = server.app.test_client()
+
+    def stats(self):
+        return self.client.get("/cache/stats").get_json()
+
+    def test_repeat_queries_are_hits_stored_once(self):
+        first = self.client.get("/sum?num1=2&num2=3")
+        self.assertEqual(first.get_data(as_text=True), "5")
+        self.assertIn("immutable", first.headers["Cache-Control"])
+        # Equal operands written differently share the entry
+        for query in ("num1=2&num2=3", "num1=2.0&num2=3e0", "num2=3&num1=2"):
+            response = self.client.get(f"/sum?{query}")
+            self.assertEqual(response.get_data(as_text=True), "5")
+            self.assertEqual(response.headers["ETag"], first.headers["ETag"])
+        self.assertEqual({key: self.stats()[key] for key in ("size", "hits", "misses")}, {"size": 1, "hits": 3, "misses": 1})
+
+    def test_matching_etag_gets_304(self):
+        etag = self.client.get("/mul?num1=1.5&num2=4").headers["ETag"]
+        for _ in range(2):
+            response = self.client.get("/mul?num1=1.5&num2=4", headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.get_data(), b"")
+            self.assertEqual(response.headers["ETag"], etag)
+        response = self.client.get("/mul?num1=1.5&num2=4", headers={"If-None-Match": '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(as_text=True), "6")
+
+    def test_route_answers_304_before_the_result_is_cached(self):
+        etag = self.client.get("/sub?num1=9&num2=4").headers["ETag"]
+        server.result_cache = LRUCache(3)
+        response = self.client.get("/sub?num1=9&num2=4", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_least_recently_used_results_are_evicted(self):
+        for num1 in range(4):
+            self.client.get(f"/sum?num1={num1}&num2=1")
+        stats = self.stats()
+        self.assertEqual((stats["size"], stats["evictions"]), (3, 1))
+        # The evicted result is computed again; the others are still hits
+        self.assertEqual(self.client.get("/sum?num1=0&num2=1").get_data(as_text=True), "1")
+        self.client.get("/sum?num1=3&num2=1")
+        stats = self.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 5, 2))
+
+    def test_invalid_queries_are_not_cached(self):
+        for query in ("num1=2", "num1=x&num2=1", "num1=&num2=1"):
+            self.assertEqual(self.client.get(f"/sum?{query}").status_code, 400)
+        self.assertEqual(self.stats()["size"], 0)
+
+    def test_warm_up_list_is_served_from_the_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "warmup.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump([["sum", "2", "3"], ["mul", 1.5, 4]], file)
+            self.assertEqual(server.warm_cache(path), 2)
+        self.assertEqual(self.stats()["size"], 2)
+        self.assertEqual(self.client.get("/mul?num1=1.5&num2=4").get_data(as_text=True), "6")
+        self.assertEqual(self.stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,6 @@
+from . import aggregates
+from . import backends
+from . import formats
+from . import ledger
+from . import locking
+from . import wal
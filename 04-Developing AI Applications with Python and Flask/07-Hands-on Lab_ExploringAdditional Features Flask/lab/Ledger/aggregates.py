@@ -0,0 +1,282 @@
+import bisect
+import datetime
+import functools
+import math
+
+GRANULARITIES = ("day", "week", "month")
+
+
+class RunningSum:
+    """Sum and count of a changing set of amounts.
+
+    Amounts are added and subtracted with Neumaier compensation, so a total
+    kept up to date over millions of edits stays as accurate as `math.fsum`
+    of the current amounts instead of accumulating rounding error.
+    """
+
+    __slots__ = ("count", "_sum", "_compensation")
+
+    def __init__(self):
+        """Start from an empty sum."""
+        self.count = 0
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def add(self, amount, count=1):
+        """Add an amount (use a negative amount and count to remove one)."""
+        total = self._sum + amount
+        if abs(self._sum) >= abs(amount):
+            self._compensation += (self._sum - total) + amount
+        else:
+            self._compensation += (amount - total) + self._sum
+        self._sum = total
+        self.count += count
+
+    @property
+    def value(self):
+        """Return the compensated sum."""
+        return self._sum + self._compensation
+
+
+class Rollup:
+    """Running sums per period, with the periods kept in sorted order.
+
+    Periods are identified by sortable keys (ISO dates or months), so the
+    buckets of a date range are found with a binary search and a report
+    touches only the buckets it returns.
+    """
+
+    __slots__ = ("buckets", "keys")
+
+    def __init__(self):
+        """Start with no buckets."""
+        self.buckets = {}
+        self.keys = []
+
+    def add(self, key, amount, count):
+        """Add to a period's bucket, creating or dropping the bucket as needed."""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = RunningSum()
+            bisect.insort(self.keys, key)
+        bucket.add(amount, count)
+        if bucket.count == 0:
+            del self.buckets[key]
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def range(self, first=None, last=None):
+        """Return the buckets with `first <= key <= last`, in key order.
+
+        Args:
+            first (str, optional): Smallest key; None for no lower bound.
+            last (str, optional): Largest key; None for no upper bound.
+
+        Returns:
+            list: `(key, RunningSum)` pairs.
+        """
+        start = 0 if first is None else bisect.bisect_left(self.keys, first)
+        stop = len(self.keys) if last is None else bisect.bisect_right(self.keys, last)
+        return [(key, self.buckets[key]) for key in self.keys[start:stop]]
+
+    def as_dict(self):
+        """Return the buckets as plain dictionaries in key order."""
+        return {key: {"total": bucket.value, "count": bucket.count} for key, bucket in self.range()}
+
+
+class LedgerAggregates:
+    """Balance figures kept up to date as a ledger changes.
+
+    Subscribes to a `TransactionLedger` and adjusts the total, the count and
+    the per-day, per-week and per-month rollups on every insert, edit or
+    delete (O(1), plus a sorted insert when a period gets its first
+    transaction).
+    The minimum and maximum come from the ledger's sorted amount index, so
+    no figure ever needs a scan of the transactions. The figures change
+    inside the ledger's write lock, so reads hold its read lock.
+    """
+
+    def __init__(self, ledger):
+        """Compute the figures for the current transactions and follow changes.
+
+        Args:
+            ledger (TransactionLedger): Ledger to summarize.
+        """
+        self.ledger = ledger
+        self.total = RunningSum()
+        self.by_day = Rollup()
+        self.by_week = Rollup()
+        self.by_month = Rollup()
+        for transaction in ledger:
+            self._apply(transaction, 1)
+        ledger.subscribe(self._on_change)
+
+    def _on_change(self, old, new):
+        """Ledger listener: take out the old row and put in the new one."""
+        if old is not None:
+            self._apply(old, -1)
+        if new is not None:
+            self._apply(new, 1)
+
+    def _apply(self, transaction, sign):
+        """Add (`sign=1`) or remove (`sign=-1`) one transaction.
+
+        Raises:
+            ValueError: If the date is not an ISO date; no figure is changed.
+        """
+        date = transaction["date"]
+        week = week_start(date)
+        if week is None:
+            raise ValueError(f"Invalid date: {date!r}")
+        amount = sign * transaction["amount"]
+        self.total.add(amount, sign)
+        self.by_day.add(date, amount, sign)
+        self.by_week.add(week, amount, sign)
+        self.by_month.add(date[:7], amount, sign)
+
+    def summary(self):
+        """Return the current figures.
+
+        Returns:
+            dict: 'count', 'total', 'min', 'max', and 'by_day'/'by_week'/
+                'by_month' mappings of ISO date, week start (Monday) or
+                month to `{"total", "count"}`.
+        """
+        with self.ledger.reading():
+            minimum, maximum = self.ledger.amount_range()
+            return {
+                "count": self.total.count,
+                "total": self.total.value,
+                "min": minimum,
+                "max": maximum,
+                "by_day": self.by_day.as_dict(),
+                "by_week": self.by_week.as_dict(),
+                "by_month": self.by_month.as_dict(),
+            }
+
+    def report(self, granularity, start=None, end=None):
+        """Return the per-period totals over a date range.
+
+        Reads the rollup buckets of the periods that overlap the range, so
+        a year by month touches 12 buckets whatever the ledger size. Periods
+        are reported whole: a range starting mid-month includes that month.
+
+        Args:
+            granularity (str): "day", "week" (starting on Monday) or "month".
+            start (str, optional): First ISO date; None for no lower bound.
+            end (str, optional): Last ISO date; None for no upper bound.
+
+        Returns:
+            dict: 'periods' as a list of `{"period", "total", "count"}` in
+                period order, with the 'total' and 'count' over all of them.
+
+        Raises:
+            ValueError: If the granularity is unknown or a date is not an ISO date.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularity must be one of {', '.join(GRANULARITIES)}")
+        first, last = (None if date is None else _period(granularity, date) for date in (start, end))
+        rollup = getattr(self, f"by_{granularity}")
+        with self.ledger.reading():
+            periods = [{"period": key, "total": bucket.value, "count": bucket.count} for key, bucket in rollup.range(first, last)]
+        return {
+            "periods": periods,
+            "total": math.fsum(period["total"] for period in periods),
+            "count": sum(period["count"] for period in periods),
+        }
+
+    def balance(self):
+        """Return the current total balance."""
+        with self.ledger.reading():
+            return self.total.value
+
+    def check(self):
+        """Compare the maintained figures with a full recompute.
+
+        This scans every transaction, so it is meant for tests and
+        troubleshooting rather than for each request.
+
+        Returns:
+            list: Descriptions of the figures that disagree; empty when the
+                aggregates are consistent.
+        """
+        # Hold the read lock throughout so the recompute and the figures match
+        with self.ledger.reading():
+            rows = list(self.ledger)
+            actual = self.summary()
+        amounts = [transaction["amount"] for transaction in rows]
+        by_day, by_week, by_month = {}, {}, {}
+        for transaction in rows:
+            date = transaction["date"]
+            for buckets, key in ((by_day, date), (by_week, week_start(date)), (by_month, date[:7])):
+                if key is not None:
+                    buckets.setdefault(key, []).append(transaction["amount"])
+
+        expected = {
+            "count": len(amounts),
+            "total": math.fsum(amounts),
+            "min": min(amounts, default=None),
+            "max": max(amounts, default=None),
+            "by_day": _recomputed(by_day),
+            "by_week": _recomputed(by_week),
+            "by_month": _recomputed(by_month),
+        }
+
+        mismatches = []
+        for name in ("count", "total", "min", "max"):
+            if not _same(actual[name], expected[name]):
+                mismatches.append(f"{name}: maintained {actual[name]}, recomputed {expected[name]}")
+        for name in ("by_day", "by_week", "by_month"):
+            for key in sorted(actual[name].keys() | expected[name].keys()):
+                got, want = actual[name].get(key), expected[name].get(key)
+                if got is None or want is None or got["count"] != want["count"] or not _same(got["total"], want["total"]):
+                    mismatches.append(f"{name}[{key}]: maintained {got}, recomputed {want}")
+        return mismatches
+
+
+@functools.lru_cache(maxsize=4096)
+def week_start(date):
+    """Return the Monday starting the ISO week of an ISO date.
+
+    Ledgers hold few distinct dates, so results are cached and most calls
+    do not parse the date at all.
+
+    Returns:
+        str or None: ISO date of the Monday, or None if `date` is not an
+            ISO date in the YYYY-MM-DD form.
+    """
+    try:
+        day = datetime.date.fromisoformat(date)
+    except (TypeError, ValueError):
+        return None
+    if day.isoformat() != date:
+        return None
+    return (day - datetime.timedelta(days=day.weekday())).isoformat()
+
+
+def _period(granularity, date):
+    """Return the rollup key of the period containing an ISO date.
+
+    Raises:
+        ValueError: If the date is not an ISO date.
+    """
+    try:
+        day = datetime.date.fromisoformat(date).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date: {date!r}")
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return week_start(day)
+    return day[:7]
+
+
+def _recomputed(buckets):
+    """Return lists of amounts per key as `{"total", "count"}` dictionaries."""
+    return {key: {"total": math.fsum(values), "count": len(values)} for key, values in buckets.items()}
+
+
+def _same(actual, expected):
+    """Compare two figures, allowing for float rounding."""
+    if actual is None or expected is None:
+        return actual is expected
+    return math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-6)
@@ -0,0 +1,448 @@
+import math
+
+import numpy as np
+
+from .ledger import TransactionLedger, _check_date, iter_pages
+from .locking import RWLock, read_locked, write_locked
+
+# Chunk size used when converting rows to and from NumPy arrays
+CHUNK_SIZE = 65536
+
+
+class ColumnarLedger:
+    """Transactions stored column by column in NumPy arrays.
+
+    Ids (int64), dates (datetime64[D]) and amounts (float64) live in three
+    contiguous arrays plus a liveness mask, about 25 bytes per transaction
+    instead of a dictionary, an int, a float and a string each. Arrays grow
+    by doubling, so appends are amortized O(1); deletes only clear the
+    liveness flag (a tombstone) and the arrays are compacted once more than
+    half of the used slots are dead.
+
+    Ids are kept in ascending order, so a slot is found with a binary
+    search instead of a per-row index, and a cursor page starts there too.
+    Range filters and sums run as vectorized NumPy operations over the
+    amount column.
+
+    The interface, including the readers-writer locking, matches
+    `TransactionLedger`: rows are handed out as `{"id", "date", "amount"}`
+    dictionaries, which are copies, so changes go through `update`.
+    """
+
+    def __init__(self, transactions=None):
+        """Create a ledger, optionally seeded with existing transactions.
+
+        Args:
+            transactions (iterable, optional): Dictionaries with 'id', 'date'
+                and 'amount' keys, in ascending id order.
+
+        Raises:
+            ValueError: If ids are not ascending, a date is not ISO formatted
+                or an amount is not finite.
+        """
+        self._ids = np.empty(0, dtype=np.int64)
+        self._dates = np.empty(0, dtype="datetime64[D]")
+        self._amounts = np.empty(0, dtype=np.float64)
+        self._alive = np.empty(0, dtype=bool)
+        self._size = 0
+        self._count = 0
+        self._next_id = 1
+        self._range = None
+        self._listeners = []
+        self.version = 0
+        self._lock = RWLock()
+        self.insert_many(transactions or ())
+
+    def __len__(self):
+        """Return the number of transactions."""
+        return self._count
+
+    @read_locked
+    def __contains__(self, transaction_id):
+        """Check whether a transaction with the given id exists."""
+        return self._slot(transaction_id) is not None
+
+    def __iter__(self):
+        """Iterate over the transactions in id order, one locked page at a time."""
+        return iter_pages(self)
+
+    def reading(self):
+        """Return a context manager holding the ledger's lock for reading."""
+        return self._lock.read()
+
+    @write_locked
+    def subscribe(self, callback):
+        """Register a function called after every insert, edit or delete.
+
+        Args:
+            callback (callable): Called as `callback(old, new)`, as for
+                `TransactionLedger.subscribe`.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, old, new):
+        """Pass a change on to every subscribed listener."""
+        for callback in self._listeners:
+            callback(old, new)
+
+    @read_locked
+    def amount_range(self):
+        """Return the smallest and largest amount.
+
+        Computed with one vectorized pass after a change, then cached.
+
+        Returns:
+            tuple: `(min, max)`, or `(None, None)` for an empty ledger.
+        """
+        if self._range is None:
+            if not self._count:
+                return None, None
+            amounts = self._amounts[: self._size][self._alive[: self._size]]
+            self._range = (float(amounts.min()), float(amounts.max()))
+        return self._range
+
+    @property
+    def next_id(self):
+        """Return the id the next `add` will use."""
+        return self._next_id
+
+    @write_locked
+    def advance_ids(self, next_id):
+        """Make the id counter start from at least `next_id`.
+
+        Used when restoring a ledger, so ids of transactions that were
+        deleted before the last snapshot are not handed out again.
+        """
+        self._next_id = max(self._next_id, next_id)
+
+    @read_locked
+    def page(self, after_id=0, limit=None):
+        """Return the transactions that follow a cursor, in id order.
+
+        Args:
+            after_id (int): Return transactions with a larger id than this.
+            limit (int, optional): Maximum number of transactions to return;
+                None returns all of them.
+
+        Returns:
+            list: The transactions, ordered by id.
+        """
+        start = int(np.searchsorted(self._ids[: self._size], after_id, side="right"))
+        rows = []
+        # Tombstones may sit between live rows, so read windows until the page is full
+        while start < self._size and (limit is None or len(rows) < limit):
+            stop = min(start + max(CHUNK_SIZE if limit is None else 2 * (limit - len(rows)), 16), self._size)
+            slots = np.flatnonzero(self._alive[start:stop]) + start
+            if limit is not None:
+                slots = slots[: limit - len(rows)]
+            rows.extend(self._rows(slots))
+            start = stop
+        return rows
+
+    @read_locked
+    def get(self, transaction_id):
+        """Return the transaction with the given id.
+
+        Args:
+            transaction_id (int): Identifier of the transaction.
+
+        Returns:
+            dict or None: A copy of the transaction if found, otherwise None.
+        """
+        slot = self._slot(transaction_id)
+        if slot is None:
+            return None
+        return self._row(slot)
+
+    @write_locked
+    def add(self, date, amount):
+        """Create a transaction with the next free id.
+
+        Args:
+            date (str): ISO date of the transaction.
+            amount (float): Signed amount.
+
+        Returns:
+            dict: The stored transaction.
+
+        Raises:
+            ValueError: If the date is not ISO formatted or the amount is not finite.
+        """
+        return self.insert({"id": self._next_id, "date": date, "amount": amount})
+
+    @write_locked
+    def add_many(self, records):
+        """Create a batch of transactions with consecutive new ids.
+
+        Args:
+            records (iterable): `(date, amount)` pairs.
+
+        Returns:
+            int: Number of transactions created.
+
+        Raises:
+            ValueError: If a date is not ISO formatted or an amount is not
+                finite; earlier chunks stay stored.
+        """
+        first_id = self._next_id
+        self.insert_many(
+            {"id": transaction_id, "date": date, "amount": amount}
+            for transaction_id, (date, amount) in enumerate(records, start=first_id)
+        )
+        return self._next_id - first_id
+
+    @write_locked
+    def insert(self, transaction):
+        """Store a transaction that already carries its id.
+
+        Args:
+            transaction (dict): Dictionary with 'id', 'date' and 'amount' keys.
+
+        Returns:
+            dict: The stored transaction.
+
+        Raises:
+            ValueError: If the id is not above every stored id, the date is
+                not ISO formatted or the amount is not finite.
+        """
+        self.insert_many([transaction])
+        return self._row(self._size - 1)
+
+    @write_locked
+    def insert_many(self, transactions):
+        """Store a batch of transactions that already carry their ids.
+
+        Rows are converted to arrays and validated a chunk at a time, then
+        appended with one copy per column. As with `TransactionLedger`, the
+        rows before an invalid one are stored before the error is raised.
+
+        Args:
+            transactions (iterable): Dictionaries with 'id', 'date' and
+                'amount' keys, in ascending id order.
+
+        Raises:
+            ValueError: If ids are not ascending, a date is not an ISO date
+                or an amount is not finite; the transactions before it stay
+                stored.
+        """
+        iterator = iter(transactions)
+        while True:
+            chunk = [transaction for _, transaction in zip(range(CHUNK_SIZE), iterator)]
+            if not chunk:
+                return
+            ids = np.fromiter((transaction["id"] for transaction in chunk), dtype=np.int64, count=len(chunk))
+            amounts = np.fromiter((transaction["amount"] for transaction in chunk), dtype=np.float64, count=len(chunk))
+            valid, error = self._check_chunk(chunk, ids, amounts)
+            if valid:
+                dates = np.array([transaction["date"] for transaction in chunk[:valid]], dtype="datetime64[D]")
+                self._append(ids[:valid], dates, amounts[:valid])
+            if error is not None:
+                raise error
+
+    def _check_chunk(self, chunk, ids, amounts):
+        """Find the first invalid row of a chunk, checking each row as
+        `TransactionLedger.insert` does: id, then date, then amount.
+
+        Returns:
+            tuple: The number of valid rows before it, and the ValueError
+                describing it (None if the whole chunk is valid).
+        """
+        bad_ids = np.flatnonzero(np.diff(ids, prepend=self._next_id - 1) <= 0)
+        bad_amounts = np.flatnonzero(~np.isfinite(amounts))
+        # Ids and amounts are checked at once; dates only up to the first bad row
+        limit = int(min([len(chunk), *bad_ids[:1], *bad_amounts[:1]]))
+        for position, transaction in enumerate(chunk[:limit]):
+            try:
+                _check_date(transaction["date"])
+            except ValueError as e:
+                return position, e
+        if limit == len(chunk):
+            return limit, None
+        if len(bad_ids) and bad_ids[0] == limit:
+            previous = int(ids[limit - 1]) if limit else self._next_id - 1
+            return limit, ValueError(f"Transaction IDs must be ascending and above {previous}")
+        try:
+            _check_date(chunk[limit]["date"])
+        except ValueError as e:
+            return limit, e
+        return limit, ValueError("Amount must be a finite number")
+
+    def _append(self, ids, dates, amounts):
+        """Append validated columns and notify the listeners."""
+        start, stop = self._size, self._size + len(ids)
+        self._reserve(stop)
+        self._ids[start:stop] = ids
+        self._dates[start:stop] = dates
+        self._amounts[start:stop] = amounts
+        self._alive[start:stop] = True
+        self._size = stop
+        self._count += len(ids)
+        self._next_id = int(ids[-1]) + 1
+        self._range = None
+        self.version += 1
+        if self._listeners:
+            for transaction in self._rows(np.arange(start, stop)):
+                self._notify(None, transaction)
+
+    @write_locked
+    def update(self, transaction_id, date, amount):
+        """Change the date and amount of a transaction.
+
+        Args:
+            transaction_id (int): Identifier of the transaction to edit.
+            date (str): New ISO date.
+            amount (float): New signed amount.
+
+        Returns:
+            dict or None: The updated transaction, or None if the id is unknown.
+
+        Raises:
+            ValueError: If the date is not ISO formatted or the amount is not finite.
+        """
+        slot = self._slot(transaction_id)
+        if slot is None:
+            return None
+        if not math.isfinite(amount):
+            raise ValueError("Amount must be a finite number")
+        _check_date(date)
+        date = np.datetime64(date, "D")
+        old = self._row(slot)
+        self._dates[slot] = date
+        self._amounts[slot] = amount
+        self._range = None
+        self.version += 1
+        new = self._row(slot)
+        self._notify(old, new)
+        return new
+
+    @write_locked
+    def remove(self, transaction_id):
+        """Delete a transaction.
+
+        Args:
+            transaction_id (int): Identifier of the transaction to delete.
+
+        Returns:
+            dict or None: The removed transaction, or None if the id is unknown.
+        """
+        slot = self._slot(transaction_id)
+        if slot is None:
+            return None
+        transaction = self._row(slot)
+        self._alive[slot] = False
+        self._count -= 1
+        self._range = None
+        self.version += 1
+        # Reclaim tombstones once they make up more than half of the used slots
+        if self._count < self._size // 2:
+            self._compact()
+        self._notify(transaction, None)
+        return transaction
+
+    @read_locked
+    def search(self, min_amount, max_amount, limit=None, offset=0):
+        """Find the transactions whose amount lies in a closed range.
+
+        The range filter is one vectorized pass over the amount column;
+        only the matches are sorted.
+
+        Args:
+            min_amount (float): Smallest amount to include.
+            max_amount (float): Largest amount to include.
+            limit (int, optional): Maximum number of transactions to return;
+                None returns every match from `offset` on.
+            offset (int): Number of matches to skip.
+
+        Returns:
+            tuple:
+                list: Matching transactions ordered by amount, then id.
+                int: Total number of matches in the range.
+        """
+        slots = np.flatnonzero(self._range_mask(min_amount, max_amount))
+        # Slots are in id order, so a stable sort by amount breaks ties by id
+        slots = slots[np.argsort(self._amounts[slots], kind="stable")]
+        stop = None if limit is None else offset + limit
+        return self._rows(slots[offset:stop]), len(slots)
+
+    @read_locked
+    def sum_range(self, min_amount, max_amount):
+        """Return the sum of the amounts in a closed range.
+
+        Args:
+            min_amount (float): Smallest amount to include.
+            max_amount (float): Largest amount to include.
+
+        Returns:
+            float: Sum of the matching amounts (pairwise summation).
+        """
+        mask = self._range_mask(min_amount, max_amount)
+        return float(self._amounts[: self._size][mask].sum())
+
+    def _range_mask(self, min_amount, max_amount):
+        """Return the liveness-and-range mask over the used slots."""
+        amounts = self._amounts[: self._size]
+        return self._alive[: self._size] & (amounts >= min_amount) & (amounts <= max_amount)
+
+    def _slot(self, transaction_id):
+        """Return the array slot of a live transaction, or None."""
+        slot = int(np.searchsorted(self._ids[: self._size], transaction_id))
+        if slot < self._size and self._ids[slot] == transaction_id and self._alive[slot]:
+            return slot
+        return None
+
+    def _row(self, slot):
+        """Return the transaction in one slot as a dictionary."""
+        return {
+            "id": int(self._ids[slot]),
+            "date": str(self._dates[slot]),
+            "amount": float(self._amounts[slot]),
+        }
+
+    def _rows(self, slots):
+        """Return the transactions in the given slots as dictionaries."""
+        ids = self._ids[slots].tolist()
+        dates = self._dates[slots].astype(str).tolist()
+        amounts = self._amounts[slots].tolist()
+        return [{"id": i, "date": d, "amount": a} for i, d, a in zip(ids, dates, amounts)]
+
+    def _reserve(self, size):
+        """Grow the arrays by doubling until they hold `size` slots."""
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 16)
+        for name in ("_ids", "_dates", "_amounts", "_alive"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def _compact(self):
+        """Drop tombstones, keeping the surviving rows in id order."""
+        keep = np.flatnonzero(self._alive[: self._size])
+        for name in ("_ids", "_dates", "_amounts"):
+            column = getattr(self, name)
+            column[: len(keep)] = column[keep]
+        self._alive[: len(keep)] = True
+        self._size = len(keep)
+
+
+def open_ledger(spec="dicts", transactions=None):
+    """Create the ledger backend named by a configuration string.
+
+    Args:
+        spec (str): "dicts" for the indexed in-memory `TransactionLedger`,
+            or "columnar" for the NumPy-backed `ColumnarLedger`.
+        transactions (iterable, optional): Transactions to start with.
+
+    Returns:
+        TransactionLedger or ColumnarLedger: The ledger.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if spec == "dicts":
+        return TransactionLedger(transactions)
+    if spec == "columnar":
+        return ColumnarLedger(transactions)
+    raise ValueError(f"Unknown ledger backend: {spec}")
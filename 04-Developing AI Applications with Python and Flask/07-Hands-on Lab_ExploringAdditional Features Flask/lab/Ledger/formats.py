@@ -0,0 +1,166 @@
+import csv
+import datetime
+import io
+import math
+import re
+
+# Characters of an OFX upload decoded and scanned at a time
+OFX_CHUNK_SIZE = 65536
+# OFX tags: "<NAME>value" (SGML, OFX 1.x) or "<NAME>value</NAME>" (XML, OFX 2.x)
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+# Columns written by `write_csv`; `read_csv` needs only the date and amount
+CSV_COLUMNS = ("id", "date", "amount")
+# Characters of CSV output collected before a chunk is handed out
+EXPORT_CHUNK_SIZE = 65536
+
+
+def parse_transaction(date, amount):
+    """Validate the fields of one imported transaction.
+
+    Args:
+        date (str): ISO date (YYYY-MM-DD).
+        amount (str): Signed decimal amount.
+
+    Returns:
+        tuple: `(date, amount)` as a normalized ISO string and a float.
+
+    Raises:
+        ValueError: If the date is not an ISO date or the amount is not a
+            finite number.
+    """
+    try:
+        date = datetime.date.fromisoformat(date.strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date: {date!r}")
+    try:
+        value = float(amount)
+    except ValueError:
+        raise ValueError(f"Invalid amount: {amount!r}")
+    if not math.isfinite(value):
+        raise ValueError(f"Invalid amount: {amount!r}")
+    return date, value
+
+
+def read_csv(stream):
+    """Parse a CSV upload one row at a time.
+
+    The first row may be a header naming the 'date' and 'amount' columns
+    (in any position, other columns such as 'id' are ignored); without one
+    the first two columns are the date and the amount. Nothing is read
+    ahead, so memory use does not depend on the size of the upload.
+
+    Args:
+        stream: Binary file-like object with UTF-8 text.
+
+    Yields:
+        tuple: `(line_number, record)`, where `record` is a `(date, amount)`
+            tuple or, for a malformed row, the ValueError describing it.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    reader = csv.reader(text)
+    date_column, amount_column = 0, 1
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # e.g. an unterminated quote; the reader resumes at the next line
+            yield reader.line_num, ValueError(f"Malformed CSV: {e}")
+            continue
+        if not row or not "".join(row).strip():
+            continue
+        if reader.line_num == 1:
+            header = [name.strip().lower() for name in row]
+            if "date" in header and "amount" in header:
+                date_column, amount_column = header.index("date"), header.index("amount")
+                continue
+        try:
+            if len(row) <= max(date_column, amount_column):
+                raise ValueError(f"Expected at least {max(date_column, amount_column) + 1} columns, got {len(row)}")
+            yield reader.line_num, parse_transaction(row[date_column], row[amount_column])
+        except ValueError as e:
+            yield reader.line_num, e
+
+
+def read_ofx(stream):
+    """Parse the statement transactions (`<STMTTRN>`) of an OFX upload.
+
+    Both SGML (OFX 1.x, where value elements have no closing tag) and XML
+    (OFX 2.x) files are scanned a chunk at a time. Each transaction's
+    `<DTPOSTED>` and `<TRNAMT>` become the date and amount; other fields
+    are ignored.
+
+    Args:
+        stream: Binary file-like object.
+
+    Yields:
+        tuple: `(line_number, record)` as for `read_csv`, numbered by the
+            line on which the transaction starts.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+    line_number, pending = 1, ""
+    fields = start = None
+    while True:
+        chunk = text.read(OFX_CHUNK_SIZE)
+        data = pending + chunk
+        # A value runs up to the next "<", so the last tag waits for more text
+        cut = data.rfind("<") if chunk else len(data)
+        if cut < 0:
+            line_number += data.count("\n")
+            pending = ""
+            continue
+        position = 0
+        for match in OFX_TAG.finditer(data, 0, cut):
+            line_number += data.count("\n", position, match.start())
+            position = match.start()
+            closing, name, value = match.groups()
+            name = name.upper()
+            if name == "STMTTRN":
+                if fields is not None:
+                    yield start, _ofx_transaction(fields)
+                fields = None if closing else {}
+                start = line_number
+            elif fields is not None and not closing and name in ("DTPOSTED", "TRNAMT"):
+                fields[name] = value.strip()
+        line_number += data.count("\n", position, cut)
+        pending = data[cut:]
+        if not chunk:
+            break
+    if fields is not None:
+        yield start, _ofx_transaction(fields)
+
+
+def _ofx_transaction(fields):
+    """Turn the fields of one `<STMTTRN>` into a record or an error."""
+    posted, amount = fields.get("DTPOSTED"), fields.get("TRNAMT")
+    if not posted or not amount:
+        return ValueError("Transaction without DTPOSTED or TRNAMT")
+    if len(posted) < 8 or not posted[:8].isdigit():
+        return ValueError(f"Invalid date: {posted!r}")
+    try:
+        return parse_transaction(f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}", amount)
+    except ValueError as e:
+        return e
+
+
+def write_csv(transactions):
+    """Format transactions as CSV text, a chunk of lines at a time.
+
+    Args:
+        transactions (iterable): Dictionaries with 'id', 'date' and 'amount' keys.
+
+    Yields:
+        str: About EXPORT_CHUNK_SIZE characters of CSV, starting with the
+            header line.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for transaction in transactions:
+        writer.writerow((transaction["id"], transaction["date"], transaction["amount"]))
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,377 @@
+import bisect
+import datetime
+import math
+
+from .locking import RWLock, read_locked, write_locked
+
+# Transactions read per locked page when iterating over a whole ledger
+ITER_CHUNK_SIZE = 1000
+
+
+class TransactionLedger:
+    """Transactions indexed by id and by amount.
+
+    `_rows` maps each id to its transaction dictionary (insertion ordered),
+    so lookups, edits and deletes run in O(1). `_by_amount` is a list of
+    `(amount, id)` pairs kept sorted with `bisect`, so an amount range is
+    located in O(log n) and its matches are read as one slice; `_ids` does
+    the same for id order, which cursor pagination (`page`) walks.
+
+    Ids come from a counter that only moves forward, so a deleted id is
+    never handed out again. Listeners registered with `subscribe` see every
+    change, which lets derived data (such as `Ledger.aggregates`) follow
+    the ledger without rescanning it.
+
+    Changes hold a readers-writer lock exclusively (listeners run inside
+    that write) and queries hold it shared, so request threads can read in
+    parallel and every change is applied atomically.
+    """
+
+    def __init__(self, transactions=None):
+        """Create a ledger, optionally seeded with existing transactions.
+
+        Args:
+            transactions (iterable, optional): Dictionaries with 'id', 'date'
+                and 'amount' keys.
+
+        Raises:
+            ValueError: If an id appears twice or an amount is not finite.
+        """
+        self._rows = {}
+        self._by_amount = []
+        self._ids = []
+        self._next_id = 1
+        self.version = 0
+        self._listeners = []
+        self._lock = RWLock()
+        self.insert_many(transactions or ())
+
+    def __len__(self):
+        """Return the number of transactions."""
+        return len(self._rows)
+
+    def __contains__(self, transaction_id):
+        """Check whether a transaction with the given id exists."""
+        return transaction_id in self._rows
+
+    def __iter__(self):
+        """Iterate over the transactions in id order, one locked page at a time."""
+        return iter_pages(self)
+
+    def reading(self):
+        """Return a context manager holding the ledger's lock for reading.
+
+        Use it to combine several reads, or reads of data kept up to date by
+        listeners, into one consistent view.
+        """
+        return self._lock.read()
+
+    @write_locked
+    def subscribe(self, callback):
+        """Register a function called after every insert, edit or delete.
+
+        Args:
+            callback (callable): Called as `callback(old, new)` with the
+                transaction before and after the change; `old` is None for
+                inserts and `new` is None for deletes.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, old, new):
+        """Pass a change on to every subscribed listener."""
+        for callback in self._listeners:
+            callback(old, new)
+
+    @read_locked
+    def amount_range(self):
+        """Return the smallest and largest amount, read from the amount index.
+
+        Returns:
+            tuple: `(min, max)`, or `(None, None)` for an empty ledger.
+        """
+        if not self._by_amount:
+            return None, None
+        return self._by_amount[0][0], self._by_amount[-1][0]
+
+    @property
+    def next_id(self):
+        """Return the id the next `add` will use."""
+        return self._next_id
+
+    @write_locked
+    def advance_ids(self, next_id):
+        """Make the id counter start from at least `next_id`.
+
+        Used when restoring a ledger, so ids of transactions that were
+        deleted before the last snapshot are not handed out again.
+        """
+        self._next_id = max(self._next_id, next_id)
+
+    @read_locked
+    def page(self, after_id=0, limit=None):
+        """Return the transactions that follow a cursor, in id order.
+
+        Runs in O(log n + k) for k returned transactions.
+
+        Args:
+            after_id (int): Return transactions with a larger id than this.
+            limit (int, optional): Maximum number of transactions to return;
+                None returns all of them.
+
+        Returns:
+            list: The transactions, ordered by id.
+        """
+        start = bisect.bisect_right(self._ids, after_id)
+        stop = None if limit is None else start + limit
+        return [self._rows[transaction_id] for transaction_id in self._ids[start:stop]]
+
+    @read_locked
+    def get(self, transaction_id):
+        """Return the transaction with the given id.
+
+        Args:
+            transaction_id (int): Identifier of the transaction.
+
+        Returns:
+            dict or None: The transaction if found, otherwise None.
+        """
+        return self._rows.get(transaction_id)
+
+    @write_locked
+    def add(self, date, amount):
+        """Create a transaction with the next free id.
+
+        Args:
+            date (str): ISO date of the transaction.
+            amount (float): Signed amount.
+
+        Returns:
+            dict: The stored transaction.
+
+        Raises:
+            ValueError: If the date is not an ISO date or the amount is not a
+                finite number.
+        """
+        return self.insert({"id": self._next_id, "date": date, "amount": amount})
+
+    @write_locked
+    def add_many(self, records):
+        """Create a batch of transactions with consecutive new ids.
+
+        Args:
+            records (iterable): `(date, amount)` pairs.
+
+        Returns:
+            int: Number of transactions created.
+
+        Raises:
+            ValueError: If a date is not an ISO date or an amount is not
+                finite; the transactions before it stay stored.
+        """
+        first_id = self._next_id
+        self.insert_many(
+            {"id": transaction_id, "date": date, "amount": amount}
+            for transaction_id, (date, amount) in enumerate(records, start=first_id)
+        )
+        return self._next_id - first_id
+
+    @write_locked
+    def insert(self, transaction):
+        """Store a transaction that already carries its id.
+
+        Args:
+            transaction (dict): Dictionary with 'id', 'date' and 'amount' keys.
+
+        Returns:
+            dict: The stored transaction.
+
+        Raises:
+            ValueError: If the id is already used, the date is not an ISO date
+                or the amount is not finite.
+        """
+        transaction_id = transaction["id"]
+        if transaction_id in self._rows:
+            raise ValueError(f"Transaction with ID {transaction_id} already exists")
+        _check_date(transaction["date"])
+        _check_amount(transaction["amount"])
+        self._rows[transaction_id] = transaction
+        bisect.insort(self._by_amount, (transaction["amount"], transaction_id))
+        if self._ids and transaction_id < self._ids[-1]:
+            bisect.insort(self._ids, transaction_id)
+        else:
+            self._ids.append(transaction_id)
+        self._next_id = max(self._next_id, transaction_id + 1)
+        self.version += 1
+        self._notify(None, transaction)
+        return transaction
+
+    @write_locked
+    def insert_many(self, transactions):
+        """Store a batch of transactions that already carry their ids.
+
+        The new index entries are appended and the indexes are sorted once,
+        instead of one `insort` (an O(n) list shift) per transaction.
+
+        Args:
+            transactions (iterable): Dictionaries with 'id', 'date' and
+                'amount' keys.
+
+        Raises:
+            ValueError: If an id is already used, a date is not an ISO date
+                or an amount is not finite; the transactions before it stay
+                stored.
+        """
+        added = []
+        try:
+            for transaction in transactions:
+                transaction_id = transaction["id"]
+                if transaction_id in self._rows:
+                    raise ValueError(f"Transaction with ID {transaction_id} already exists")
+                _check_date(transaction["date"])
+                _check_amount(transaction["amount"])
+                self._rows[transaction_id] = transaction
+                self._by_amount.append((transaction["amount"], transaction_id))
+                self._ids.append(transaction_id)
+                self._next_id = max(self._next_id, transaction_id + 1)
+                added.append(transaction)
+        finally:
+            self._by_amount.sort()
+            self._ids.sort()
+            self.version += 1
+            for transaction in added:
+                self._notify(None, transaction)
+
+    @write_locked
+    def update(self, transaction_id, date, amount):
+        """Change the date and amount of a transaction.
+
+        Args:
+            transaction_id (int): Identifier of the transaction to edit.
+            date (str): New ISO date.
+            amount (float): New signed amount.
+
+        Returns:
+            dict or None: The updated transaction, or None if the id is unknown.
+
+        Raises:
+            ValueError: If the date is not an ISO date or the amount is not a
+                finite number.
+        """
+        transaction = self._rows.get(transaction_id)
+        if transaction is None:
+            return None
+        _check_date(date)
+        _check_amount(amount)
+        old = dict(transaction)
+        if amount != transaction["amount"]:
+            self._unindex(transaction)
+            bisect.insort(self._by_amount, (amount, transaction_id))
+        transaction["date"] = date
+        transaction["amount"] = amount
+        self.version += 1
+        self._notify(old, transaction)
+        return transaction
+
+    @write_locked
+    def remove(self, transaction_id):
+        """Delete a transaction.
+
+        Args:
+            transaction_id (int): Identifier of the transaction to delete.
+
+        Returns:
+            dict or None: The removed transaction, or None if the id is unknown.
+        """
+        transaction = self._rows.pop(transaction_id, None)
+        if transaction is not None:
+            self._unindex(transaction)
+            del self._ids[bisect.bisect_left(self._ids, transaction_id)]
+            self.version += 1
+            self._notify(transaction, None)
+        return transaction
+
+    @read_locked
+    def search(self, min_amount, max_amount, limit=None, offset=0):
+        """Find the transactions whose amount lies in a closed range.
+
+        Runs in O(log n + k) for k returned transactions.
+
+        Args:
+            min_amount (float): Smallest amount to include.
+            max_amount (float): Largest amount to include.
+            limit (int, optional): Maximum number of transactions to return;
+                None returns every match from `offset` on.
+            offset (int): Number of matches to skip.
+
+        Returns:
+            tuple:
+                list: Matching transactions ordered by amount, then id.
+                int: Total number of matches in the range.
+        """
+        low = bisect.bisect_left(self._by_amount, (min_amount, -math.inf))
+        high = bisect.bisect_right(self._by_amount, (max_amount, math.inf))
+        start = low + offset
+        stop = high if limit is None else min(high, start + limit)
+        page = [self._rows[transaction_id] for _, transaction_id in self._by_amount[start:stop]]
+        return page, max(high - low, 0)
+
+    @read_locked
+    def sum_range(self, min_amount, max_amount):
+        """Return the sum of the amounts in a closed range.
+
+        Args:
+            min_amount (float): Smallest amount to include.
+            max_amount (float): Largest amount to include.
+
+        Returns:
+            float: Exact float sum (`math.fsum`) of the matching amounts.
+        """
+        low = bisect.bisect_left(self._by_amount, (min_amount, -math.inf))
+        high = bisect.bisect_right(self._by_amount, (max_amount, math.inf))
+        return math.fsum(amount for amount, _ in self._by_amount[low:high])
+
+    def _unindex(self, transaction):
+        """Drop a transaction's entry from the amount index."""
+        key = (transaction["amount"], transaction["id"])
+        position = bisect.bisect_left(self._by_amount, key)
+        del self._by_amount[position]
+
+
+def iter_pages(ledger, after_id=0, chunk_size=ITER_CHUNK_SIZE):
+    """Yield a ledger's transactions after a cursor, in id order.
+
+    Each page is read under the ledger's lock, but the lock is released
+    between pages, so walking a large ledger never holds off writers for
+    long; changes made meanwhile may or may not be seen.
+
+    Args:
+        ledger: `TransactionLedger` or `ColumnarLedger`.
+        after_id (int): Start after the transaction with this id.
+        chunk_size (int): Transactions read per page.
+
+    Yields:
+        dict: Each transaction.
+    """
+    while True:
+        rows = ledger.page(after_id, chunk_size)
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        after_id = rows[-1]["id"]
+
+
+def _check_date(date):
+    """Reject dates that are not full ISO dates (YYYY-MM-DD), which the
+    per-day, per-week and per-month rollups could not bucket."""
+    try:
+        valid = datetime.date.fromisoformat(date).isoformat() == date
+    except (TypeError, ValueError):
+        valid = False
+    if not valid:
+        raise ValueError(f"Invalid date: {date!r}")
+
+
+def _check_amount(amount):
+    """Reject amounts that cannot be ordered (NaN) or summed (infinity)."""
+    if not math.isfinite(amount):
+        raise ValueError("Amount must be a finite number")
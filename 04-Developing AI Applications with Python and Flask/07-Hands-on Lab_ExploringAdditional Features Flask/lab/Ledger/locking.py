@@ -0,0 +1,93 @@
+import contextlib
+import functools
+import threading
+
+
+class RWLock:
+    """Readers-writer lock: many readers at once, or a single writer.
+
+    Writers are preferred: once a writer waits, new readers queue behind it,
+    so a steady stream of reads cannot starve writes. A thread that already
+    holds the lock (for reading or writing) may take it again for reading,
+    and the writer may take it again for writing, which lets listeners
+    called during a write read the guarded object. Upgrading a read to a write is
+    not supported and deadlocks.
+    """
+
+    def __init__(self):
+        """Create an unlocked lock."""
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def read(self):
+        """Hold the lock for reading inside a `with` block."""
+        depth = getattr(self._local, "depth", 0)
+        if depth or self._writer == threading.get_ident():
+            # Nested read, or a read by the writer: already safe
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        """Hold the lock exclusively inside a `with` block."""
+        me = threading.get_ident()
+        if self._writer == me:
+            yield
+            return
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = None
+                self._cond.notify_all()
+
+
+def read_locked(method):
+    """Run a method while holding its object's `_lock` for reading."""
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.read():
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+def write_locked(method):
+    """Run a method while holding its object's `_lock` exclusively."""
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.write():
+            return method(self, *args, **kwargs)
+
+    return locked
@@ -0,0 +1,351 @@
+import itertools
+import json
+import os
+import re
+import threading
+import time
+
+SNAPSHOT_FILE = "snapshot.ndjson"
+LOG_PATTERN = re.compile(r"^wal\.(\d{6})\.log$")
+# Lines decoded per `json.loads` call during recovery
+DECODE_CHUNK = 65536
+
+
+class WriteAheadLog:
+    """Durable, append-only record of every ledger change.
+
+    The log subscribes to a ledger and appends one JSON line per insert,
+    edit ("put") or delete ("del"). `sync` makes everything logged so far
+    durable with group commit: the first waiting caller becomes the leader
+    and runs one `fsync` for every record written up to that point, while
+    callers arriving meanwhile wait for the leader and are usually covered
+    by its `fsync`, so concurrent requests share the cost of a flush.
+
+    Every `snapshot_every` records the log starts a new generation
+    (`wal.<generation>.log`) and a background thread writes the ledger to a
+    snapshot, so startup replays one snapshot plus a short tail of the log.
+    The thread reads the ledger a locked page at a time rather than holding
+    the ledger's lock throughout, so the snapshot may already include some
+    changes of the new generation; its records hold whole rows, so replaying
+    them over the snapshot still gives the exact state. The snapshot also
+    stores the id counter, so ids are never reused even after the
+    transactions holding them were deleted.
+    """
+
+    def __init__(self, directory, fsync=True, snapshot_every=100_000):
+        """Prepare a log in a directory (created if needed); `open` starts it.
+
+        Args:
+            directory (str): Directory holding the snapshot and log files.
+            fsync (bool): Whether `sync` calls `os.fsync`; when False data
+                only reaches the OS, which survives a process crash but not
+                a power loss.
+            snapshot_every (int): Records after which a snapshot is taken;
+                0 disables automatic snapshots.
+        """
+        self.directory = directory
+        self.fsync = fsync
+        self.snapshot_every = snapshot_every
+        self.ledger = None
+        self._cond = threading.Condition()
+        self._file = None
+        self._generation = 0
+        self._written = 0
+        self._durable = 0
+        self._syncing = False
+        self._snapshotting = False
+        self._snapshot_pending = False
+        self._since_snapshot = 0
+        self._counters = {"records": 0, "syncs": 0, "fsyncs": 0, "snapshots": 0, "replayed": 0, "recovery_ms": 0.0}
+        os.makedirs(directory, exist_ok=True)
+
+    def open(self, ledger, seed=None):
+        """Restore a ledger from disk, then log its changes from now on.
+
+        Args:
+            ledger: Empty `TransactionLedger` or `ColumnarLedger` to fill.
+            seed (iterable, optional): Transactions to start with when the
+                directory holds no snapshot or log yet; they are written to
+                a first snapshot.
+
+        Returns:
+            int: Number of log records replayed.
+        """
+        start = time.perf_counter()
+        self.ledger = ledger
+        logs = self._logs()
+        fresh = not logs and not os.path.exists(self._path(SNAPSHOT_FILE))
+        replayed = 0 if fresh else self._recover(logs)
+        self._counters["replayed"] = replayed
+        self._counters["recovery_ms"] = (time.perf_counter() - start) * 1000
+
+        if fresh:
+            ledger.insert_many(seed or ())
+        ledger.subscribe(self._record)
+        generation = None
+        with self._cond:
+            if fresh or (self.snapshot_every and replayed >= self.snapshot_every):
+                generation = self._start_snapshot_locked()
+            else:
+                self._file = open(self._path(_log_name(self._generation)), "a", encoding="utf-8")
+        if generation is not None:
+            self._write_snapshot(generation)
+        return replayed
+
+    def sync(self):
+        """Block until every record logged so far is durable (group commit)."""
+        with self._cond:
+            self._counters["syncs"] += 1
+            target = self._written
+            while self._durable < target:
+                if self._syncing:
+                    # Another caller is flushing; its fsync may cover our records
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                upto = self._written
+                try:
+                    self._file.flush()
+                    descriptor = self._file.fileno()
+                    self._cond.release()
+                    try:
+                        if self.fsync:
+                            os.fsync(descriptor)
+                    finally:
+                        self._cond.acquire()
+                    self._durable = max(self._durable, upto)
+                    self._counters["fsyncs"] += 1
+                finally:
+                    self._syncing = False
+                    self._cond.notify_all()
+
+    def snapshot(self):
+        """Start a new log generation and write the whole ledger to a snapshot."""
+        with self._cond:
+            # Wait for a background snapshot to finish before starting another
+            while self._snapshotting:
+                self._cond.wait()
+            generation = self._start_snapshot_locked()
+        self._write_snapshot(generation)
+
+    def close(self):
+        """Wait for a background snapshot, make the log durable and close it."""
+        self.sync()
+        with self._cond:
+            while self._snapshotting:
+                self._cond.wait()
+            self._file.close()
+
+    def stats(self):
+        """Return the log counters.
+
+        Returns:
+            dict: Records written, `sync` calls, actual fsyncs, snapshots
+                taken, records replayed at startup and the recovery time,
+                plus the current log generation.
+        """
+        with self._cond:
+            return dict(self._counters, generation=self._generation)
+
+    def _record(self, old, new):
+        """Ledger listener: append the change to the log.
+
+        Runs inside the ledger's write lock, so when a snapshot is due it
+        only starts a new log generation and leaves the snapshot itself to a
+        background thread. A snapshot falling due while another is still
+        being written is marked pending and started when that one finishes.
+        """
+        if new is None:
+            record = {"op": "del", "id": old["id"]}
+        else:
+            record = {"op": "put", "id": new["id"], "date": new["date"], "amount": new["amount"]}
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._cond:
+            self._file.write(line)
+            self._written += 1
+            self._since_snapshot += 1
+            self._counters["records"] += 1
+            if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+                if self._snapshotting:
+                    self._snapshot_pending = True
+                else:
+                    self._start_background_snapshot_locked()
+
+    def _start_snapshot_locked(self):
+        """Close the current log and start the generation a snapshot will
+        precede; the caller holds `_cond` and then calls `_write_snapshot`.
+
+        Returns:
+            int: The new log generation.
+        """
+        # Claim the snapshot first: waiting below releases `_cond`
+        self._snapshotting = True
+        self._snapshot_pending = False
+        # Wait for an fsync in progress, since the file it flushes is about to be closed
+        while self._syncing:
+            self._cond.wait()
+        # Until the snapshot is written, the old log is what makes its records durable
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+        self._generation += 1
+        self._file = open(self._path(_log_name(self._generation)), "a", encoding="utf-8")
+        self._durable = self._written
+        self._since_snapshot = 0
+        return self._generation
+
+    def _start_background_snapshot_locked(self):
+        """Start a new generation and write its snapshot on a background
+        thread; the caller holds `_cond`."""
+        generation = self._start_snapshot_locked()
+        threading.Thread(target=self._write_snapshot, args=(generation,), name="wal-snapshot", daemon=True).start()
+
+    def _write_snapshot(self, generation):
+        """Write the ledger to a snapshot preceding a log generation, then drop
+        the older logs; called without `_cond` or the ledger's lock."""
+        try:
+            temporary = self._path(SNAPSHOT_FILE + ".tmp")
+            with open(temporary, "w", encoding="utf-8") as snapshot:
+                header = {"generation": generation, "next_id": self.ledger.next_id}
+                snapshot.write(json.dumps(header) + "\n")
+                for transaction in self.ledger:
+                    snapshot.write(json.dumps(transaction, separators=(",", ":")) + "\n")
+                snapshot.flush()
+                if self.fsync:
+                    os.fsync(snapshot.fileno())
+            os.replace(temporary, self._path(SNAPSHOT_FILE))
+            self._sync_directory()
+
+            # The snapshot covers every earlier generation, so drop those logs
+            for name in self._logs():
+                if int(LOG_PATTERN.match(name).group(1)) < generation:
+                    os.remove(self._path(name))
+            with self._cond:
+                self._counters["snapshots"] += 1
+        finally:
+            with self._cond:
+                if self._snapshot_pending:
+                    # Another snapshot fell due while this one was written
+                    self._start_background_snapshot_locked()
+                else:
+                    self._snapshotting = False
+                self._cond.notify_all()
+
+    def _recover(self, logs):
+        """Load the snapshot and replay the logs after it into the ledger.
+
+        Replays into a dictionary first and loads the final rows with one
+        `insert_many`, so rows edited or deleted later never touch the
+        ledger's indexes.
+
+        Returns:
+            int: Number of log records replayed.
+        """
+        rows = {}
+        next_id = 1
+        generation = 0
+        snapshot_path = self._path(SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "rb") as snapshot:
+                header = json.loads(snapshot.readline())
+                generation, next_id = header["generation"], header["next_id"]
+                while True:
+                    lines = list(itertools.islice(snapshot, DECODE_CHUNK))
+                    if not lines:
+                        break
+                    for transaction in _decode(lines):
+                        rows[transaction["id"]] = transaction
+
+        replayed = 0
+        for name in logs:
+            log_generation = int(LOG_PATTERN.match(name).group(1))
+            if log_generation < generation:
+                continue
+            for record in self._read_log(name, last=name == logs[-1]):
+                if record["op"] == "put":
+                    rows[record["id"]] = {"id": record["id"], "date": record["date"], "amount": record["amount"]}
+                else:
+                    rows.pop(record["id"], None)
+                next_id = max(next_id, record["id"] + 1)
+                replayed += 1
+            generation = max(generation, log_generation)
+
+        self.ledger.insert_many(rows[transaction_id] for transaction_id in sorted(rows))
+        self.ledger.advance_ids(next_id)
+        self._generation = generation
+        self._written = self._durable = 0
+        self._since_snapshot = replayed
+        return replayed
+
+    def _read_log(self, name, last):
+        """Yield the records of one log file.
+
+        A crash can leave the final line of the newest log half written;
+        that line is cut off. A bad line anywhere else is corruption.
+
+        Raises:
+            ValueError: If a line other than the newest log's last one is invalid.
+        """
+        path = self._path(name)
+        good = 0
+        with open(path, "rb") as log:
+            while True:
+                lines = list(itertools.islice(log, DECODE_CHUNK))
+                if not lines:
+                    break
+                try:
+                    records = _decode(lines)
+                except ValueError:
+                    # Find the bad line, keeping the records before it
+                    records = []
+                    for line in lines:
+                        try:
+                            records.append(_decode([line])[0])
+                        except ValueError:
+                            if last and line is lines[-1] and not log.read(1):
+                                break
+                            raise ValueError(f"Corrupt record in {name} at byte {good}")
+                        good += len(line)
+                    yield from records
+                    break
+                good += sum(len(line) for line in lines)
+                yield from records
+        if good != os.path.getsize(path):
+            with open(path, "r+b") as log:
+                log.truncate(good)
+
+    def _logs(self):
+        """Return the log file names in generation order."""
+        return sorted(name for name in os.listdir(self.directory) if LOG_PATTERN.match(name))
+
+    def _path(self, name):
+        """Return the path of a file in the log directory."""
+        return os.path.join(self.directory, name)
+
+    def _sync_directory(self):
+        """Make renames and new files in the directory durable."""
+        if not self.fsync or not hasattr(os, "O_DIRECTORY"):
+            return
+        descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def _decode(lines):
+    """Decode complete JSON lines with a single parser call.
+
+    Raises:
+        ValueError: If a line is incomplete (no trailing newline) or invalid.
+    """
+    if not lines[-1].endswith(b"\n"):
+        raise ValueError("Incomplete record")
+    return json.loads(b"[" + b",".join(lines) + b"]")
+
+
+def _log_name(generation):
+    """Return the file name of a log generation."""
+    return f"wal.{generation:06d}.log"
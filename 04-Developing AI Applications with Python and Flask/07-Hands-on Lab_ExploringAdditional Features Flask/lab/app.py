@@ -1,31 +1,132 @@
 # Import libraries
-from flask import Flask, redirect, render_template, request, url_for
+import math
+import os
+import uuid
+
+from flask import Flask, Response, redirect, render_template, request, stream_with_context, url_for
+from Ledger.aggregates import LedgerAggregates
+from Ledger.backends import open_ledger
+from Ledger.formats import parse_transaction, read_csv, read_ofx, write_csv
+from Ledger.ledger import iter_pages
+from Ledger.wal import WriteAheadLog
 
 # Instantiate Flask functionality
 app = Flask(__name__)
 
 # Sample data
-transactions = [
+SAMPLE_TRANSACTIONS = [
     {"id": 1, "date": "2023-06-01", "amount": 100},
     {"id": 2, "date": "2023-06-02", "amount": -200},
     {"id": 3, "date": "2023-06-03", "amount": 300},
 ]
 
+# Transactions, kept in the ledger backend named by LEDGER_BACKEND ("dicts" or "columnar").
+# With LEDGER_WAL_DIR set, they are restored from and logged to that directory;
+# otherwise they live in memory only and start from the sample data.
+wal_directory = os.environ.get("LEDGER_WAL_DIR")
+if wal_directory:
+    transactions = open_ledger(os.environ.get("LEDGER_BACKEND", "dicts"))
+    wal = WriteAheadLog(wal_directory)
+    wal.open(transactions, seed=SAMPLE_TRANSACTIONS)
+else:
+    transactions = open_ledger(os.environ.get("LEDGER_BACKEND", "dicts"), SAMPLE_TRANSACTIONS)
+    wal = None
+# Total, count, min/max and per-day/per-month sums, updated on every change
+aggregates = LedgerAggregates(transactions)
+
+# Page size limits for the transactions list and search results
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Rows fetched from the ledger at a time while streaming the full list
+STREAM_CHUNK_SIZE = 1000
+# Valid rows of an import inserted into the ledger (and committed) together
+IMPORT_BATCH_SIZE = 10000
+# Malformed rows of an import listed in its response (all of them are counted)
+IMPORT_MAX_ERRORS = 100
+# Differs per process start, so ETags from an earlier run never match
+ETAG_EPOCH = uuid.uuid4().hex[:12]
+
+
+def parse_page_args(defaults_to_page=True):
+    """Read the `after_id` and `limit` query parameters.
+
+    Args:
+        defaults_to_page (bool): Whether a missing `limit` means
+            DEFAULT_PAGE_SIZE (True) or no limit (False).
+
+    Returns:
+        tuple: `(after_id, limit)`, or None if either value is invalid.
+    """
+    after_id = request.args.get("after_id", "0")
+    limit = request.args.get("limit", str(DEFAULT_PAGE_SIZE) if defaults_to_page else None)
+    if not after_id.isdigit():
+        return None
+    if limit is not None:
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+            return None
+        limit = int(limit)
+    return int(after_id), limit
+
+
+def commit():
+    """Wait until the ledger changes made so far are durable, if logging is on."""
+    if wal is not None:
+        wal.sync()
+
 
 # Read operation: List all transactions
 # Route to handle the Read of a new transaction
 @app.route("/", methods=["GET"])
 def get_transactions():
-    """Render the transactions list page.
+    """Render one page of the transactions list, or stream the whole list.
+
+    Pages are addressed with a cursor: `after_id` (default 0) is the last id
+    of the previous page and `limit` (default 50, max 500) the page size;
+    the page links to the next one. With `stream=1` the list from `after_id`
+    on (all of it unless `limit` is given) is rendered with Jinja's
+    `generate` and sent while it is produced, so neither the time to the
+    first byte nor the memory used grows with the ledger.
+
+    The ETag combines the ledger's change counter with a per-process token,
+    so a client revalidating an unchanged ledger gets a 304 response
+    without the page being rendered.
 
     Args:
         None
 
     Returns:
-        flask.Response: Rendered HTML page containing all transactions.
+        flask.Response: The rendered or streamed page, a 304 response if the
+            client's copy is current, or a 400 response if `after_id` or
+            `limit` is invalid.
     """
-    # Render the transactions list template with current data.
-    return render_template("transactions.html", transactions=transactions)
+    stream = request.args.get("stream") in ("1", "true")
+    page_args = parse_page_args(defaults_to_page=not stream)
+    if page_args is None:
+        return {"message": f"'after_id' must be 0 or more and 'limit' between 1 and {MAX_PAGE_SIZE}"}, 400
+    after_id, limit = page_args
+
+    etag = f"{ETAG_EPOCH}-{transactions.version}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    if stream:
+        rows = iter_pages(transactions, after_id, STREAM_CHUNK_SIZE) if limit is None else transactions.page(after_id, limit)
+        # The Jinja environment caches the compiled template after the first load
+        template = app.jinja_env.get_template("transactions.html")
+        response = Response(stream_with_context(template.generate(transactions=rows)), mimetype="text/html")
+    else:
+        # Fetch one extra row to learn whether a next page exists.
+        rows = transactions.page(after_id, limit + 1)
+        next_page = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_page = url_for("get_transactions", after_id=rows[-1]["id"], limit=limit)
+        # Render the transactions list template with the current page.
+        response = Response(render_template("transactions.html", transactions=rows, next_page=next_page))
+    response.set_etag(etag)
+    return response
 
 
 # Create operation: Display add transaction form
@@ -38,19 +139,18 @@ def add_transaction():
         None
 
     Returns:
-        flask.Response: Redirects to the transactions list after creation, or
-            renders the add transaction form for GET requests.
+        flask.Response: Redirects to the transactions list after creation,
+            renders the add transaction form for GET requests, or returns a
+            400 response if the date or amount is invalid.
     """
     # Check if the request method is POST (form submission)
     if request.method == "POST":
-        # Create a new transaction object using form field values
-        transaction = {
-            "id": len(transactions) + 1,
-            "date": request.form["date"],
-            "amount": float(request.form["amount"]),
-        }
-        # Append the new transaction to the transactions list
-        transactions.append(transaction)
+        # Create a new transaction from the validated form field values; the ledger assigns its id
+        try:
+            transactions.add(*parse_transaction(request.form["date"], request.form["amount"]))
+        except ValueError as e:
+            return {"message": str(e)}, 400
+        commit()
 
         # Redirect to the transactions list page after adding the new transaction
         return redirect(url_for("get_transactions"))
@@ -70,30 +170,27 @@ def edit_transaction(transaction_id):
 
     Returns:
         flask.Response: Redirects to the transactions list after a successful
-            update, renders the edit form for GET requests, or returns a 404
-            response if the transaction is not found.
+            update, renders the edit form for GET requests, or returns a 400
+            response if the date or amount is invalid or a 404 response if
+            the transaction is not found.
     """
     # Check if the request method is POST (form submission)
     if request.method == "POST":
-        # Extract the updated values from the form fields
-        date = request.form["date"]  # Get the 'date' field value from the form
-        amount = float(request.form["amount"])  # Get the 'amount' field value from the form and convert it to a float
-
-        # Find the transaction with the matching ID and update its values
-        for transaction in transactions:
-            if transaction["id"] == transaction_id:
-                transaction["date"] = date  # Update the 'date' field of the transaction
-                transaction["amount"] = amount  # Update the 'amount' field of the transaction
-                break  # Exit the loop once the transaction is found and updated
+        # Update the transaction with the matching ID from the validated form field values (unknown IDs are ignored)
+        try:
+            transactions.update(transaction_id, *parse_transaction(request.form["date"], request.form["amount"]))
+        except ValueError as e:
+            return {"message": str(e)}, 400
+        commit()
 
         # Redirect to the transactions list page after updating the transaction
         return redirect(url_for("get_transactions"))
 
-    # If the request method is GET, find the transaction with the matching ID and render the edit form
-    for transaction in transactions:
-        if transaction["id"] == transaction_id:
-            # Render the edit form template and pass the transaction to be edited
-            return render_template("edit.html", transaction=transaction)
+    # If the request method is GET, look up the transaction by ID and render the edit form
+    transaction = transactions.get(transaction_id)
+    if transaction is not None:
+        # Render the edit form template and pass the transaction to be edited
+        return render_template("edit.html", transaction=transaction)
 
     # If the transaction with the specified ID is not found, handle this case (optional)
     return {"message": "Transaction not found"}, 404
@@ -111,59 +208,247 @@ def delete_transaction(transaction_id):
     Returns:
         flask.Response: Redirects to the transactions list after deletion.
     """
-    # Find the transaction with the matching ID and remove it from the list
-    for transaction in transactions:
-        if transaction["id"] == transaction_id:
-            transactions.remove(transaction)  # Remove the transaction from the transactions list
-            break  # Exit the loop once the transaction is found and removed
+    # Remove the transaction with the matching ID (unknown IDs are ignored)
+    transactions.remove(transaction_id)
+    commit()
 
     # Redirect to the transactions list page after deleting the transaction
     return redirect(url_for("get_transactions"))
 
 
+# Bulk import: Add transactions from a CSV or OFX upload
+# Route to handle importing a statement file
+@app.route("/import", methods=["GET", "POST"])
+def import_transactions():
+    """Import transactions from an uploaded file or render the upload form.
+
+    The file comes as the `file` field of a multipart form, or as the raw
+    request body. It is read as CSV (a `date,amount` header is optional,
+    other columns such as `id` are ignored) unless the file name ends in
+    `.ofx`/`.qfx`, the body is `application/x-ofx` or `format=ofx` is
+    given. Rows are parsed and validated as they are read and inserted in
+    batches of `IMPORT_BATCH_SIZE` with new ids, so memory use does not
+    depend on the size of the file, and the balance aggregates and the
+    write-ahead log see every row.
+
+    Malformed rows are skipped without aborting the import and reported
+    by line number (the first `IMPORT_MAX_ERRORS` of them).
+
+    Args:
+        None
+
+    Returns:
+        flask.Response: JSON with the 'imported' and 'failed' row counts
+            and 'errors' as `{"line", "message"}` objects, the upload form
+            for a GET request, or a 400 response if no file was uploaded
+            or the format is unknown.
+    """
+    if request.method == "GET":
+        return render_template("import.html")
+
+    # Only a multipart body is parsed as a form; any other body is the file itself
+    if request.mimetype == "multipart/form-data":
+        upload = request.files.get("file")
+        if upload is None:
+            return {"message": "No file uploaded"}, 400
+        stream, name = upload.stream, (upload.filename or "").lower()
+    else:
+        stream, name = request.stream, ""
+    is_ofx = name.endswith((".ofx", ".qfx")) or request.mimetype == "application/x-ofx"
+    file_format = request.args.get("format", "ofx" if is_ofx else "csv")
+    readers = {"csv": read_csv, "ofx": read_ofx}
+    if file_format not in readers:
+        return {"message": f"Unknown import format: {file_format}"}, 400
+
+    # Parse, validate and insert as the file is read, so only one batch is held
+    summary = {"imported": 0, "failed": 0, "errors": []}
+    batch = []
+    for line_number, record in readers[file_format](stream):
+        if isinstance(record, ValueError):
+            summary["failed"] += 1
+            if len(summary["errors"]) < IMPORT_MAX_ERRORS:
+                summary["errors"].append({"line": line_number, "message": str(record)})
+            continue
+        batch.append(record)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            summary["imported"] += transactions.add_many(batch)
+            commit()
+            batch = []
+    summary["imported"] += transactions.add_many(batch)
+    commit()
+    return summary
+
+
+# Bulk export: Download every transaction as CSV
+# Route to handle exporting the ledger
+@app.route("/export")
+def export_transactions():
+    """Stream every transaction as CSV (`id,date,amount`), in id order.
+
+    The ledger is read one page at a time and each page is formatted as it
+    is sent, so memory use does not grow with the ledger. The file can be
+    imported again with `/import`, which assigns new ids.
+
+    Args:
+        None
+
+    Returns:
+        flask.Response: Streamed CSV attachment.
+    """
+    rows = iter_pages(transactions, 0, STREAM_CHUNK_SIZE)
+    return Response(
+        stream_with_context(write_csv(rows)),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=transactions.csv"},
+    )
+
+
 # Search operation: Search transactions by amount range
 # Route to handle searching transactions within a specified amount range
 @app.route("/search", methods=["GET", "POST"])
 def search_transactions():
     """Search transactions by amount range or render the search form.
 
+    The range comes from the submitted form (POST) or from the query string
+    (GET), which also accepts `limit` (default 50, max 500) and `offset`
+    (default 0) to page through the matches. A bound left out is open;
+    a given bound must be a finite number. Matches are read from the
+    ledger's amount index, ordered by amount. The total of all the matches
+    reads every one of them, so it is only computed when `with_total` is
+    given.
+
     Args:
         None
 
     Returns:
-        flask.Response: Renders the filtered transactions list for a POST
-            request or the search form for a GET request.
+        flask.Response: Renders one page of the matching transactions, the
+            search form for a GET request without a range, or a 400 response
+            if the range or paging values are invalid.
     """
-    # Handle form submission to filter transactions by amount range.
-    if request.method == "POST":
-        min_amount = float(request.form["min_amount"])
-        max_amount = float(request.form["max_amount"])
-        filtered_transactions = []
-        for transaction in transactions:
-            if min_amount <= transaction["amount"] <= max_amount:
-                filtered_transactions.append(transaction)
-                return render_template("transactions.html", transactions=filtered_transactions)
-    # Render the search form for GET requests.
-    return render_template("search.html")
+    params = request.form if request.method == "POST" else request.args
+    # Render the search form when no range was given.
+    if "min_amount" not in params and "max_amount" not in params:
+        return render_template("search.html")
+
+    try:
+        bounds = {name: float(params[name]) for name in ("min_amount", "max_amount") if name in params}
+    except ValueError:
+        return {"message": "Invalid amount range"}, 400
+    # NaN would match nothing and infinite bounds are spelled by leaving them out
+    if not all(math.isfinite(bound) for bound in bounds.values()):
+        return {"message": "Invalid amount range"}, 400
+    min_amount = bounds.get("min_amount", -math.inf)
+    max_amount = bounds.get("max_amount", math.inf)
+    limit = request.args.get("limit", str(DEFAULT_PAGE_SIZE))
+    offset = request.args.get("offset", "0")
+    if not limit.isdigit() or not offset.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+        return {"message": f"'limit' must be between 1 and {MAX_PAGE_SIZE} and 'offset' must be 0 or more"}, 400
+    limit, offset = int(limit), int(offset)
+    with_total = "with_total" in params
+
+    # Filter transactions by amount range, one page at a time.
+    page, total = transactions.search(min_amount, max_amount, limit=limit, offset=offset)
+    matches_total = transactions.sum_range(min_amount, max_amount) if with_total else None
+    # Paging links keep the range and whether the total is shown
+    query = dict(bounds, limit=limit)
+    if with_total:
+        query["with_total"] = 1
+    pages = {}
+    if offset > 0:
+        pages["previous_page"] = url_for("search_transactions", offset=max(offset - limit, 0), **query)
+    if offset + limit < total:
+        pages["next_page"] = url_for("search_transactions", offset=offset + limit, **query)
+    return render_template("transactions.html", transactions=page, matches=total, matches_total=matches_total, **pages)
 
 
 # Additional Feature: Calculate total balance
 # Route to calculate and display the total balance of all transactions
 @app.route("/balance")
 def total_balance():
-    """Calculate the total balance and render the transactions list.
+    """Render one page of the transactions list with the total balance.
+
+    The page is selected with the `after_id` and `limit` cursor parameters,
+    as for the transactions list, and the balance comes from the maintained
+    aggregates, so neither depends on the size of the ledger.
+
+    Args:
+        None
+
+    Returns:
+        flask.Response: Rendered HTML page including one page of transactions
+            and the total balance, or a 400 response if `after_id` or
+            `limit` is invalid.
+    """
+    page_args = parse_page_args()
+    if page_args is None:
+        return {"message": f"'after_id' must be 0 or more and 'limit' between 1 and {MAX_PAGE_SIZE}"}, 400
+    after_id, limit = page_args
+    # Read the maintained total balance (no scan of the transactions).
+    total = aggregates.balance()
+    # Fetch one extra row to learn whether a next page exists.
+    rows = transactions.page(after_id, limit + 1)
+    next_page = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_page = url_for("total_balance", after_id=rows[-1]["id"], limit=limit)
+    # Render the page with the total balance.
+    return render_template("transactions.html", transactions=rows, total_balance=total, next_page=next_page)
+
+
+# Additional Feature: Balance figures as JSON
+# Route to return the incrementally maintained aggregates
+@app.route("/balance/summary")
+def balance_summary():
+    """Return the balance aggregates as JSON.
+
+    The figures are maintained on every add, edit and delete, so serving
+    them does not scan the ledger. With `?check=1` the aggregates are also
+    compared against a full recompute, which does scan it.
+
+    Args:
+        None
+
+    Returns:
+        flask.Response: JSON with 'count', 'total', 'min', 'max', 'by_day',
+            'by_week' and 'by_month', plus 'consistent' and 'mismatches'
+            when checked.
+    """
+    summary = aggregates.summary()
+    if request.args.get("check") in ("1", "true"):
+        mismatches = aggregates.check()
+        summary["consistent"] = not mismatches
+        summary["mismatches"] = mismatches
+    return summary
+
+
+# Additional Feature: Totals per day, week or month
+# Route to return a time-bucketed report from the maintained rollups
+@app.route("/report")
+def period_report():
+    """Return the totals per period over a date range as JSON.
+
+    `granularity` is "day", "week" (weeks start on Monday) or "month"
+    (the default); `from` and `to` are optional ISO dates bounding the
+    range. The figures come from rollups updated on every add, edit and
+    delete, so a year by month reads 12 buckets instead of scanning the
+    ledger. Periods that overlap the range are reported whole.
 
     Args:
         None
 
     Returns:
-        flask.Response: Rendered HTML page including all transactions and the
-            computed total balance.
+        flask.Response: JSON with the 'granularity', 'from' and 'to' of the
+            request, 'periods' as `{"period", "total", "count"}` objects and
+            the overall 'total' and 'count', or a 400 response if the
+            granularity or a date is invalid.
     """
-    # Compute the total balance across all transactions.
-    total = sum(transaction["amount"] for transaction in transactions)
-    # Render the list with the computed total balance.
-    return render_template("transactions.html", transactions=transactions, total_balance=total)
+    granularity = request.args.get("granularity", "month")
+    start, end = request.args.get("from") or None, request.args.get("to") or None
+    try:
+        report = aggregates.report(granularity, start, end)
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    return {"granularity": granularity, "from": start, "to": end, **report}
 
 
 # Run the Flask app
@@ -0,0 +1,98 @@
+"""Measure bulk CSV import and export throughput and memory.
+
+Usage:
+    python bench_import.py [ROWS ...]
+
+Writes a CSV file per size (250k, 1M and 4M rows by default, one row in
+a thousand malformed), then streams it through `/import` into a fresh
+columnar ledger and reads it back through `/export`. Reports rows per
+second and, from a second run under tracemalloc, the peak memory of the
+import beyond the ledger itself (the upload is read from disk as the
+request body, so that overhead is what has to stay flat as the file
+grows) and the peak memory of the export.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import app
+from Ledger.backends import open_ledger
+from Ledger.aggregates import LedgerAggregates
+
+
+def write_file(path, rows, seed=42):
+    """Write `rows` CSV rows to `path`, one in a thousand malformed."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("date,amount\n")
+        for i in range(rows):
+            if i % 1000 == 999:
+                file.write("not-a-date,12.5\n")
+            else:
+                file.write(f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d},{rng.uniform(-5000, 5000):.2f}\n")
+
+
+def fresh_ledger():
+    """Give the app an empty columnar ledger, wired up the way it wires its own."""
+    app.transactions = open_ledger("columnar")
+    app.aggregates = LedgerAggregates(app.transactions)
+
+
+def measure(function):
+    """Run a function twice: once timed, once under tracemalloc.
+
+    Returns:
+        tuple: The result, seconds, peak traced bytes and the bytes still
+            allocated at the end (the data the function kept).
+    """
+    fresh_ledger()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    fresh_ledger()
+    tracemalloc.start()
+    result = function()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak, current
+
+
+def main(sizes):
+    client = app.app.test_client()
+    print(f"{'rows':>10} {'file MB':>8} {'import/s':>10} {'import extra MB':>16} {'export/s':>10} {'export peak MB':>15}")
+    for rows in sizes:
+        path = os.path.join(tempfile.mkdtemp(), "transactions.csv")
+        write_file(path, rows)
+        size = os.path.getsize(path)
+
+        def upload():
+            with open(path, "rb") as file:
+                return client.post("/import", input_stream=file, content_length=size, content_type="text/csv").json
+
+        try:
+            summary, import_time, import_peak, ledger_bytes = measure(upload)
+            assert summary["imported"] + summary["failed"] == rows, summary
+            assert not app.aggregates.check()
+
+            start = time.perf_counter()
+            sum(len(chunk) for chunk in client.get("/export").response)
+            export_time = time.perf_counter() - start
+            tracemalloc.start()
+            sum(len(chunk) for chunk in client.get("/export").response)
+            export_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{rows:>10,} {size / 2**20:>8.1f} {rows / import_time:>10,.0f} {(import_peak - ledger_bytes) / 2**20:>16.1f}"
+                f" {rows / export_time:>10,.0f} {export_peak / 2**20:>15.1f}"
+            )
+        finally:
+            os.remove(path)
+            os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [250_000, 1_000_000, 4_000_000])
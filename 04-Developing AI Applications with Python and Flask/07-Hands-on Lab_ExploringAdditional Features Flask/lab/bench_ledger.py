@@ -0,0 +1,114 @@
+"""Compare ledger backends for memory use and query throughput.
+
+Usage:
+    python bench_ledger.py [SIZE ...]
+
+Builds synthetic ledgers (100k and 1M transactions by default) as the
+original list of dictionaries, the indexed `TransactionLedger` and the
+NumPy-backed `ColumnarLedger`, then reports the memory each one holds and
+the time to build it, filter an amount range (first page of 50, plus the
+match count), sum that range and sum the whole ledger.
+"""
+
+import datetime
+import gc
+import math
+import random
+import sys
+import time
+import tracemalloc
+
+from Ledger.backends import ColumnarLedger
+from Ledger.ledger import TransactionLedger
+
+RANGE = (-100.0, 100.0)
+REPEAT = 10
+
+
+def make_transactions(size, seed=42):
+    """Generate `size` transactions spread over 2023 with random amounts."""
+    rng = random.Random(seed)
+    start = datetime.date(2023, 1, 1)
+    return [
+        {
+            "id": i + 1,
+            "date": (start + datetime.timedelta(days=rng.randrange(365))).isoformat(),
+            "amount": round(rng.uniform(-5000, 5000), 2),
+        }
+        for i in range(size)
+    ]
+
+
+class ListLedger:
+    """Original approach: a list of dictionaries scanned on every request."""
+
+    def __init__(self, transactions):
+        self.rows = list(transactions)
+
+    def search(self, min_amount, max_amount, limit=50):
+        matches = [row for row in self.rows if min_amount <= row["amount"] <= max_amount]
+        matches.sort(key=lambda row: (row["amount"], row["id"]))
+        return matches[:limit], len(matches)
+
+    def sum_range(self, min_amount, max_amount):
+        return math.fsum(row["amount"] for row in self.rows if min_amount <= row["amount"] <= max_amount)
+
+    def total(self):
+        return math.fsum(row["amount"] for row in self.rows)
+
+
+def build(backend, size):
+    """Build a ledger from freshly generated rows.
+
+    Returns:
+        tuple: The ledger, build time in seconds, and the bytes it holds
+            (the rows themselves count too, since the list and the indexed
+            ledger keep them alive while the columnar ledger does not).
+    """
+    gc.collect()
+    tracemalloc.start()
+    rows = make_transactions(size)
+    start = time.perf_counter()
+    ledger = backend(rows)
+    elapsed = time.perf_counter() - start
+    del rows
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ledger, elapsed, memory
+
+
+def timed(func, *args):
+    """Return the mean time of `func(*args)` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main(sizes):
+    backends = {
+        "list": (ListLedger, lambda ledger: ledger.total()),
+        "indexed": (TransactionLedger, lambda ledger: ledger.sum_range(-math.inf, math.inf)),
+        "columnar": (ColumnarLedger, lambda ledger: ledger.sum_range(-math.inf, math.inf)),
+    }
+    print(f"{'size':>9} {'backend':>9} {'MB':>8} {'build s':>8} {'search ms':>10} {'range sum ms':>13} {'total ms':>9}")
+    for size in sizes:
+        expected = None
+        for name, (backend, total) in backends.items():
+            ledger, elapsed, memory = build(backend, size)
+            result = ledger.search(*RANGE, limit=50)
+            if expected is None:
+                expected = result
+            assert result == expected, name
+            search = timed(ledger.search, *RANGE, 50)
+            range_sum = timed(ledger.sum_range, *RANGE)
+            whole = timed(total, ledger)
+            print(
+                f"{size:>9} {name:>9} {memory / 2**20:>8.1f} {elapsed:>8.2f} {search:>10.3f} {range_sum:>13.3f} {whole:>9.3f}"
+            )
+            del ledger
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,112 @@
+"""Compare rollup-backed period reports against scanning the ledger.
+
+Usage:
+    python bench_report.py [SIZE]
+
+Builds a columnar ledger of SIZE (default 10M) synthetic transactions
+spread over 2022-2024 and its `LedgerAggregates` rollups, then times:
+
+- reports for 2023 by month, week and day, read from the rollups, both
+  directly and through `/report`,
+- the same monthly report computed by scanning every transaction and
+  slicing its ISO date (what a report without rollups has to do), and by
+  a vectorized NumPy pass over the date and amount columns,
+- the cost the rollups add to each edit.
+"""
+
+import datetime
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+import app
+from Ledger.aggregates import LedgerAggregates
+from Ledger.backends import CHUNK_SIZE, ColumnarLedger
+
+REPEAT = 100
+EDITS = 20_000
+YEAR = ("2023-01-01", "2023-12-31")
+
+
+def make_transactions(size, seed=42):
+    """Yield `size` transactions spread over 2022-2024 with random amounts."""
+    rng = random.Random(seed)
+    start = datetime.date(2022, 1, 1)
+    days = [(start + datetime.timedelta(days=offset)).isoformat() for offset in range(3 * 365)]
+    for i in range(size):
+        yield {"id": i + 1, "date": rng.choice(days), "amount": round(rng.uniform(-5000, 5000), 2)}
+
+
+def timed(function, repeat=1):
+    """Return the result of a function and its mean run time in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def scan_report(ledger):
+    """Monthly totals for YEAR by reading every transaction."""
+    totals = {}
+    for transaction in ledger:
+        if YEAR[0] <= transaction["date"] <= YEAR[1]:
+            totals.setdefault(transaction["date"][:7], []).append(transaction["amount"])
+    return {month: math.fsum(amounts) for month, amounts in sorted(totals.items())}
+
+
+def numpy_report(ledger):
+    """Monthly totals for YEAR with one vectorized pass over the columns."""
+    with ledger.reading():
+        size = ledger._size
+        dates = ledger._dates[:size]
+        keep = ledger._alive[:size] & (dates >= np.datetime64(YEAR[0])) & (dates <= np.datetime64(YEAR[1]))
+        months = dates[keep].astype("datetime64[M]")
+        amounts = ledger._amounts[:size][keep]
+    first = np.datetime64(YEAR[0], "M")
+    sums = np.bincount((months - first).astype(np.int64), weights=amounts, minlength=12)
+    return {str(first + index): float(total) for index, total in enumerate(sums)}
+
+
+def main(size):
+    ledger, build_ms = timed(lambda: ColumnarLedger(make_transactions(size)))
+    aggregates, rollup_ms = timed(lambda: LedgerAggregates(ledger))
+    print(f"{size:,} transactions: ledger built in {build_ms / 1000:.1f} s, rollups in {rollup_ms / 1000:.1f} s")
+    print(
+        f"rollup buckets: {len(aggregates.by_day.keys):,} days, {len(aggregates.by_week.keys):,} weeks,"
+        f" {len(aggregates.by_month.keys):,} months"
+    )
+
+    app.transactions, app.aggregates = ledger, aggregates
+    client = app.app.test_client()
+    print(f"\n{'2023 report':<28} {'periods':>8} {'ms':>10}")
+    for granularity in ("month", "week", "day"):
+        report, elapsed = timed(lambda: aggregates.report(granularity, *YEAR), REPEAT)
+        print(f"{'rollups, ' + granularity:<28} {len(report['periods']):>8} {elapsed:>10.3f}")
+        query = {"granularity": granularity, "from": YEAR[0], "to": YEAR[1]}
+        _, elapsed = timed(lambda: client.get("/report", query_string=query), REPEAT)
+        print(f"{'/report, ' + granularity:<28} {len(report['periods']):>8} {elapsed:>10.3f}")
+
+    monthly = {period["period"]: period["total"] for period in aggregates.report("month", *YEAR)["periods"]}
+    vectorized, elapsed = timed(lambda: numpy_report(ledger), 5)
+    print(f"{'NumPy column scan, month':<28} {len(vectorized):>8} {elapsed:>10.3f}")
+    scanned, elapsed = timed(lambda: scan_report(ledger))
+    print(f"{'row scan, month':<28} {len(scanned):>8} {elapsed:>10.3f}")
+    for expected in (vectorized, scanned):
+        assert all(math.isclose(monthly[month], total, rel_tol=1e-9, abs_tol=1e-3) for month, total in expected.items())
+
+    # Edits notify the rollups; compare with the same edits on an unsubscribed ledger
+    rng = random.Random(1)
+    edits = [(rng.randrange(1, size + 1), f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", 1.0) for _ in range(EDITS)]
+    _, with_rollups = timed(lambda: [ledger.update(*edit) for edit in edits])
+    bare = ColumnarLedger(make_transactions(min(size, CHUNK_SIZE * 4)))
+    edits = [(transaction_id % len(bare) + 1, date, amount) for transaction_id, date, amount in edits]
+    _, without = timed(lambda: [bare.update(*edit) for edit in edits])
+    print(f"\nedit: {with_rollups / EDITS * 1000:.1f} us with rollups, {without / EDITS * 1000:.1f} us without")
+    assert not aggregates.check()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,129 @@
+"""Measure write-ahead log throughput and recovery time.
+
+Usage:
+    python bench_wal.py [OPERATIONS]
+
+Part 1 times durable writes (add + fsync'd commit) from 1, 4, 16 and 64
+threads, the way concurrent POST requests use the log; group commit lets
+one fsync cover the records of every thread waiting at that moment.
+
+Part 2 writes OPERATIONS (default 1M) adds, edits and deletes to a log
+without fsync, then times a restart that replays the whole log, and a
+restart from a snapshot of the same state.
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from Ledger.backends import open_ledger
+from Ledger.wal import WriteAheadLog
+
+THREADS = [1, 4, 16, 64]
+DURABLE_WRITES = 4000
+
+
+def durable_writes(directory, threads):
+    """Run DURABLE_WRITES adds spread over `threads` threads, each committed.
+
+    Returns:
+        tuple: Writes per second and the number of writes per fsync.
+    """
+    ledger = open_ledger("dicts")
+    wal = WriteAheadLog(directory, snapshot_every=0)
+    wal.open(ledger)
+
+    def worker(count):
+        for i in range(count):
+            ledger.add("2023-06-01", float(i))
+            wal.sync()
+
+    workers = [threading.Thread(target=worker, args=(DURABLE_WRITES // threads,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stats = wal.stats()
+    wal.close()
+    return stats["records"] / elapsed, stats["records"] / max(stats["fsyncs"], 1)
+
+
+def write_history(directory, operations, seed=42):
+    """Log `operations` random adds (70%), edits (20%) and deletes (10%).
+
+    Returns:
+        float: Records written per second (no fsync).
+    """
+    rng = random.Random(seed)
+    ledger = open_ledger("columnar")
+    wal = WriteAheadLog(directory, fsync=False, snapshot_every=0)
+    wal.open(ledger)
+    start = time.perf_counter()
+    for _ in range(operations):
+        roll = rng.random()
+        if roll < 0.7 or not len(ledger):
+            ledger.add(f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", round(rng.uniform(-5000, 5000), 2))
+        else:
+            transaction_id = rng.randrange(1, ledger.next_id)
+            if roll < 0.9:
+                ledger.update(transaction_id, "2023-12-31", round(rng.uniform(-5000, 5000), 2))
+            else:
+                ledger.remove(transaction_id)
+    wal.close()
+    return operations / (time.perf_counter() - start)
+
+
+def recover(directory, backend):
+    """Open the log into a fresh ledger.
+
+    Returns:
+        tuple: Recovery time in seconds, records replayed and the ledger.
+    """
+    ledger = open_ledger(backend)
+    wal = WriteAheadLog(directory, fsync=False, snapshot_every=0)
+    start = time.perf_counter()
+    replayed = wal.open(ledger)
+    elapsed = time.perf_counter() - start
+    return elapsed, replayed, ledger, wal
+
+
+def main(operations):
+    print(f"{'threads':>8} {'writes/s':>10} {'writes/fsync':>13}")
+    for threads in THREADS:
+        directory = tempfile.mkdtemp()
+        try:
+            rate, per_fsync = durable_writes(directory, threads)
+            print(f"{threads:>8} {rate:>10,.0f} {per_fsync:>13.1f}")
+        finally:
+            shutil.rmtree(directory)
+
+    directory = tempfile.mkdtemp()
+    try:
+        rate = write_history(directory, operations)
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"\nlogged {operations:,} operations at {rate:,.0f}/s ({size / 2**20:.0f} MB, no fsync)")
+        print(f"{'backend':>9} {'source':>9} {'rows':>9} {'replayed':>9} {'recovery s':>11}")
+        for backend in ("dicts", "columnar"):
+            elapsed, replayed, ledger, wal = recover(directory, backend)
+            print(f"{backend:>9} {'log':>9} {len(ledger):>9,} {replayed:>9,} {elapsed:>11.2f}")
+            wal.snapshot()
+            wal.close()
+            elapsed, replayed, ledger, wal = recover(directory, backend)
+            print(f"{backend:>9} {'snapshot':>9} {len(ledger):>9,} {replayed:>9,} {elapsed:>11.2f}")
+            wal.close()
+            # Put the log back for the next backend
+            shutil.rmtree(directory)
+            os.makedirs(directory)
+            write_history(directory, operations)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
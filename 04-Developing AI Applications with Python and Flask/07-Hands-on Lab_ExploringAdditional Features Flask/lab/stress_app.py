@@ -0,0 +1,121 @@
+"""Hammer the transactions app with concurrent reads and writes.
+
+Usage:
+    python stress_app.py [REQUESTS_PER_THREAD]
+
+Runs 1, 2, 4, 8 and 16 threads against the app's test client. Each thread
+adds (20% of requests), edits (10%) and deletes (5%) transactions and
+reads the rest of the time: list pages, the streamed full list, amount
+searches and balances. Afterwards it checks that:
+
+- no request failed with a server error,
+- every add got its own id and the ledger lists each id once, in order,
+- the maintained aggregates match a full recompute,
+- with LEDGER_WAL_DIR set, a ledger restored from the log equals the live one.
+
+Throughput is printed per thread count. LEDGER_BACKEND and LEDGER_WAL_DIR
+select the ledger as for the app.
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import app
+from Ledger.backends import open_ledger
+from Ledger.wal import WriteAheadLog
+
+THREADS = [1, 2, 4, 8, 16]
+
+
+def worker(seed, requests, errors, added):
+    """Send `requests` random requests; record failures and successful adds."""
+    rng = random.Random(seed)
+    client = app.app.test_client()
+    adds = 0
+    for _ in range(requests):
+        roll = rng.random()
+        amount = round(rng.uniform(-500, 500), 2)
+        date = f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        transaction_id = rng.randrange(1, app.transactions.next_id)
+        if roll < 0.2:
+            response = client.post("/add", data={"date": date, "amount": amount})
+            adds += response.status_code == 302
+        elif roll < 0.3:
+            response = client.post(f"/edit/{transaction_id}", data={"date": date, "amount": amount})
+        elif roll < 0.35:
+            response = client.get(f"/delete/{transaction_id}")
+        elif roll < 0.6:
+            response = client.get("/", query_string={"after_id": transaction_id, "limit": 50})
+        elif roll < 0.65:
+            response = client.get("/", query_string={"stream": 1})
+            response.get_data()
+        elif roll < 0.85:
+            response = client.get("/search", query_string={"min_amount": -amount - 50, "max_amount": -amount + 50, "limit": 20})
+        else:
+            response = client.get("/balance/summary")
+        if response.status_code >= 500:
+            errors.append(f"{response.request.method} {response.request.path}: {response.status_code}")
+    added.append(adds)
+
+
+def check(expected_next_id):
+    """Return the broken invariants after a run."""
+    problems = []
+    ledger = app.transactions
+    ids = [transaction["id"] for transaction in ledger]
+    if ids != sorted(set(ids)):
+        problems.append("ledger ids are duplicated or out of order")
+    if len(ids) != len(ledger):
+        problems.append(f"ledger lists {len(ids)} transactions, len {len(ledger)}")
+    if ledger.next_id != expected_next_id:
+        problems.append(f"next id is {ledger.next_id}, expected {expected_next_id} from the adds")
+    problems.extend(app.aggregates.check())
+    if app.wal is not None:
+        # Restore from a copy, so the live log is never snapshotted or appended to
+        app.wal.sync()
+        directory = tempfile.mkdtemp()
+        try:
+            with ledger.reading():
+                shutil.copytree(app.wal.directory, directory, dirs_exist_ok=True)
+                live = list(ledger)
+            restored = open_ledger("dicts")
+            WriteAheadLog(directory, fsync=False, snapshot_every=0).open(restored)
+            if list(restored) != live:
+                problems.append("ledger restored from the log differs from the live one")
+        finally:
+            shutil.rmtree(directory)
+    return problems
+
+
+def run(threads, requests):
+    """Run one round; return requests per second and the broken invariants."""
+    start_next_id = app.transactions.next_id
+    errors, added = [], []
+    workers = [threading.Thread(target=worker, args=(seed, requests, errors, added)) for seed in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return threads * requests / elapsed, errors + check(start_next_id + sum(added))
+
+
+def main(requests):
+    print(f"{'threads':>8} {'requests/s':>11} {'rows':>8} {'problems':>9}")
+    failed = False
+    for threads in THREADS:
+        rate, problems = run(threads, requests)
+        print(f"{threads:>8} {rate:>11,.0f} {len(app.transactions):>8,} {len(problems):>9}")
+        for problem in problems[:10]:
+            print(f"    {problem}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
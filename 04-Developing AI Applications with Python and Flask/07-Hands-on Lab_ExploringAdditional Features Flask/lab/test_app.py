@@ -0,0 +1,51 @@
+import unittest
+
+import app
+
+
+class TestBalancePage(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+        first_id = app.transactions.next_id
+        app.transactions.add_many([("2024-01-01", 1.0)] * 120)
+        self.addCleanup(lambda: [app.transactions.remove(i) for i in range(first_id, first_id + 120)])
+
+    def test_balance_renders_one_page_with_the_whole_balance(self):
+        response = self.client.get("/balance", query_string={"limit": 10})
+        page = response.get_data(as_text=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(page.count("/edit/"), 10)
+        self.assertIn(f"<td>{app.aggregates.balance()}</td>", page)
+        self.assertIn("/balance?after_id=", page)
+
+    def test_balance_rejects_invalid_page_arguments(self):
+        self.assertEqual(self.client.get("/balance", query_string={"limit": 0}).status_code, 400)
+        self.assertEqual(self.client.get("/balance", query_string={"after_id": "x"}).status_code, 400)
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+
+    def test_non_finite_bounds_are_rejected(self):
+        for query in ({"min_amount": "nan"}, {"max_amount": "NaN"}, {"min_amount": "-inf", "max_amount": "0"}, {"max_amount": "inf"}):
+            with self.subTest(query=query):
+                response = self.client.get("/search", query_string=query)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.get_json(), {"message": "Invalid amount range"})
+
+    def test_an_open_bound_is_left_out_of_the_paging_links(self):
+        first_id = app.transactions.next_id
+        app.transactions.add_many([("2024-01-01", 1e9)] * 3)
+        self.addCleanup(lambda: [app.transactions.remove(i) for i in range(first_id, first_id + 3)])
+        response = self.client.get("/search", query_string={"min_amount": "1e9", "limit": 2})
+        page = response.get_data(as_text=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(page.count("/edit/"), 2)
+        self.assertIn("/search?offset=2&amp;min_amount=1000000000.0&amp;limit=2", page)
+        self.assertNotIn("max_amount", page)
+        self.assertEqual(self.client.get("/search?min_amount=1000000000.0&limit=2&offset=2").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from Ledger.backends import ColumnarLedger
+from Ledger.ledger import TransactionLedger
+
+BACKENDS = (TransactionLedger, ColumnarLedger)
+
+
+def snapshot(ledger):
+    """Return everything the routes read from a ledger."""
+    return {
+        "rows": ledger.page(),
+        "count": len(ledger),
+        "next_id": ledger.next_id,
+        "range": ledger.amount_range(),
+        "search": ledger.search(-50, 50, limit=10, offset=5),
+        "sum": round(ledger.sum_range(-50, 50), 6),
+    }
+
+
+class TestLedgerBackends(unittest.TestCase):
+    def test_random_operations_give_the_same_results(self):
+        ledgers = [backend() for backend in BACKENDS]
+        rng = random.Random(7)
+        for _ in range(3000):
+            choice = rng.random()
+            date = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            amount = float(rng.randint(-100, 100))
+            transaction_id = rng.randint(1, max(ledgers[0].next_id, 1))
+            for ledger in ledgers:
+                if choice < 0.5:
+                    ledger.add(date, amount)
+                elif choice < 0.8:
+                    ledger.update(transaction_id, date, amount)
+                else:
+                    ledger.remove(transaction_id)
+        self.assertEqual(*[snapshot(ledger) for ledger in ledgers])
+
+    def test_invalid_dates_are_rejected_by_every_backend(self):
+        for backend in BACKENDS:
+            ledger = backend([{"id": 1, "date": "2024-01-01", "amount": 1.0}])
+            for date in ("", "2024-01", "20240101", "2024-02-30", None):
+                with self.subTest(backend=backend.__name__, date=date):
+                    with self.assertRaises(ValueError):
+                        ledger.add(date, 1.0)
+                    with self.assertRaises(ValueError):
+                        ledger.update(1, date, 1.0)
+            self.assertEqual(ledger.page(), [{"id": 1, "date": "2024-01-01", "amount": 1.0}])
+
+    def test_insert_many_keeps_the_rows_before_an_invalid_one(self):
+        rows = [{"id": i, "date": "2024-01-01", "amount": float(i)} for i in range(1, 6)]
+        for field, value in (("date", "20240101"), ("amount", float("nan")), ("id", 2)):
+            invalid = dict(rows[3], **{field: value})
+            for backend in BACKENDS:
+                with self.subTest(backend=backend.__name__, field=field):
+                    ledger = backend()
+                    with self.assertRaises(ValueError):
+                        ledger.insert_many(rows[:3] + [invalid] + rows[4:])
+                    self.assertEqual(ledger.page(), rows[:3])
+                    self.assertEqual(ledger.next_id, 4)
+
+    def test_listeners_see_the_same_changes(self):
+        changes = {}
+        for backend in BACKENDS:
+            ledger = backend()
+            seen = changes[backend] = []
+            # Copy the rows: the dictionary ledger passes its live rows
+            ledger.subscribe(lambda old, new, seen=seen: seen.append((old and dict(old), new and dict(new))))
+            ledger.add("2024-01-01", 5.0)
+            ledger.update(1, "2024-01-02", 6.0)
+            ledger.remove(1)
+            ledger.update(1, "2024-01-03", 7.0)
+        self.assertEqual(*changes.values())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from Ledger.backends import ColumnarLedger
+from Ledger.ledger import TransactionLedger
+from Ledger.wal import WriteAheadLog
+
+BACKENDS = (TransactionLedger, ColumnarLedger)
+
+
+class TestWriteAheadLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def open(self, backend=TransactionLedger, **options):
+        """Open a ledger from the test directory and return it with its log."""
+        options.setdefault("fsync", False)
+        ledger = backend()
+        wal = WriteAheadLog(self.directory, **options)
+        wal.open(ledger)
+        return ledger, wal
+
+    def logs(self):
+        return [os.path.join(self.directory, name) for name in sorted(os.listdir(self.directory)) if name.endswith(".log")]
+
+    def test_restart_restores_every_change_on_every_backend(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend.__name__):
+                shutil.rmtree(self.directory)
+                ledger, wal = self.open(backend, snapshot_every=37)
+                rng = random.Random(3)
+                for _ in range(500):
+                    roll = rng.random()
+                    if roll < 0.6 or not len(ledger):
+                        ledger.add(f"2024-01-{rng.randint(1, 28):02d}", float(rng.randint(-99, 99)))
+                    elif roll < 0.85:
+                        ledger.update(rng.randrange(1, ledger.next_id), "2024-02-01", float(rng.randint(-99, 99)))
+                    else:
+                        ledger.remove(rng.randrange(1, ledger.next_id))
+                expected = (ledger.page(), ledger.next_id)
+                wal.close()
+
+                restored, wal = self.open(backend, snapshot_every=37)
+                self.assertEqual((restored.page(), restored.next_id), expected)
+                wal.close()
+
+    def test_truncated_last_line_is_cut_off(self):
+        ledger, wal = self.open(snapshot_every=0)
+        ledger.add("2024-01-01", 1.0)
+        ledger.add("2024-01-02", 2.0)
+        wal.close()
+        log = self.logs()[-1]
+        size = os.path.getsize(log)
+        with open(log, "ab") as file:
+            file.write(b'{"op":"put","id":3,"da')
+
+        restored, wal = self.open(snapshot_every=0)
+        self.assertEqual([row["id"] for row in restored.page()], [1, 2])
+        self.assertEqual(os.path.getsize(log), size)
+        # New records follow the last complete one
+        restored.add("2024-01-03", 3.0)
+        wal.close()
+        restored, wal = self.open(snapshot_every=0)
+        self.assertEqual([row["id"] for row in restored.page()], [1, 2, 3])
+        wal.close()
+
+    def test_corrupt_middle_line_is_an_error(self):
+        ledger, wal = self.open(snapshot_every=0)
+        for day in range(1, 4):
+            ledger.add(f"2024-01-0{day}", 1.0)
+        wal.close()
+        log = self.logs()[-1]
+        with open(log, "rb") as file:
+            lines = file.readlines()
+        lines[1] = b"garbage\n"
+        with open(log, "wb") as file:
+            file.writelines(lines)
+
+        with self.assertRaisesRegex(ValueError, "Corrupt record"):
+            self.open(snapshot_every=0)
+
+    def test_replay_spans_generations(self):
+        ledger, wal = self.open(snapshot_every=0)
+        ledger.add("2024-01-01", 1.0)
+        wal.snapshot()
+        ledger.add("2024-01-02", 2.0)
+        wal.close()
+        # A crash before the next snapshot was written leaves a newer generation
+        self.assertEqual(os.path.basename(self.logs()[-1]), "wal.000002.log")
+        with open(os.path.join(self.directory, "wal.000003.log"), "w") as file:
+            file.write('{"op":"put","id":2,"date":"2024-01-05","amount":5.0}\n')
+            file.write('{"op":"del","id":1}\n')
+
+        restored, wal = self.open(snapshot_every=0)
+        self.assertEqual(restored.page(), [{"id": 2, "date": "2024-01-05", "amount": 5.0}])
+        self.assertEqual(wal.stats()["replayed"], 3)
+        self.assertEqual(wal.stats()["generation"], 3)
+        wal.close()
+
+    def test_deleted_ids_are_never_reused(self):
+        for snapshot in (False, True):
+            with self.subTest(snapshot=snapshot):
+                shutil.rmtree(self.directory)
+                ledger, wal = self.open(snapshot_every=0)
+                ledger.add("2024-01-01", 1.0)
+                ledger.add("2024-01-02", 2.0)
+                ledger.remove(2)
+                if snapshot:
+                    wal.snapshot()
+                wal.close()
+
+                restored, wal = self.open(snapshot_every=0)
+                self.assertEqual(restored.next_id, 3)
+                self.assertEqual(restored.add("2024-01-03", 3.0)["id"], 3)
+                wal.close()
+
+    def test_snapshot_due_during_another_is_deferred(self):
+        snapshot_every = 50
+        ledger, wal = self.open(snapshot_every=snapshot_every)
+        ledger.add_many([("2024-01-01", 1.0)] * 20000)
+        for i in range(2000):
+            ledger.update(i + 1, "2024-01-02", float(i))
+        wal.close()
+
+        _, wal = self.open(snapshot_every=snapshot_every)
+        self.assertLess(wal.stats()["replayed"], snapshot_every)
+        wal.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
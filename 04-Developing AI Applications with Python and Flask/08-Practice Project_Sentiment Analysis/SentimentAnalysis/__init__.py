@@ -1 +1,3 @@
+from . import backends
+from . import cache
 from . import sentiment_analysis
@@ -0,0 +1,146 @@
+import asyncio
+
+import httpx
+
+from .backends import LexiconBackend
+from .sentiment_analysis import HEADERS, RETRY_STATUS_CODES, TIMEOUT, URL, parse_response
+
+
+class AsyncSentimentClient:
+    """Asynchronous client for the Watson SentimentPredict API.
+
+    All calls share one `httpx.AsyncClient` connection pool, and a semaphore
+    bounds the number of requests in flight, so thousands of callers can
+    await results on a single event loop without a thread each.
+    """
+
+    name = "watson"
+
+    def __init__(self, url=URL, concurrency=100, timeout=TIMEOUT, retries=0, backoff=0.5):
+        """Create a client; the connection pool is opened on first use.
+
+        Args:
+            url (str): SentimentPredict endpoint.
+            concurrency (int): Maximum number of requests in flight.
+            timeout (float): Per-request timeout in seconds.
+            retries (int): Extra attempts after the first one.
+            backoff (float): Delay before the first retry, doubled each time.
+        """
+        self.url = url
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._client = None
+        self._semaphore = None
+
+    def _get_client(self):
+        """Return the shared HTTP client, creating it inside the running loop."""
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+            self._client = httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._client
+
+    async def analyze(self, text_to_analyse):
+        """Return `{"label": ..., "score": ...}` for one text."""
+        client = self._get_client()
+        myobj = {"raw_document": {"text": text_to_analyse}}
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                # Wait longer before each new attempt (0.5s, 1s, 2s, ...)
+                if attempt:
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                try:
+                    response = await client.post(self.url, json=myobj)
+                except httpx.TransportError:
+                    if attempt == self.retries:
+                        raise
+                    continue
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.retries:
+                    break
+        return parse_response(response)
+
+    async def analyze_batch(self, texts):
+        """Return one result per text, in input order."""
+        return await asyncio.gather(*(self.analyze(text) for text in texts))
+
+    async def aclose(self):
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class AsyncLocalBackend:
+    """Async interface over the local lexicon scorer.
+
+    Scoring takes microseconds, so it runs inline on the event loop.
+    """
+
+    name = "local"
+
+    def __init__(self, backend=None):
+        """Wrap a synchronous backend (a `LexiconBackend` by default)."""
+        self.backend = backend or LexiconBackend()
+
+    async def analyze(self, text_to_analyse):
+        """Return `{"label": ..., "score": ...}` for one text."""
+        return self.backend.analyze(text_to_analyse)
+
+    async def analyze_batch(self, texts):
+        """Return one result per text, in input order."""
+        return self.backend.analyze_batch(texts)
+
+    async def aclose(self):
+        """Nothing to release."""
+
+
+class AsyncFallbackBackend:
+    """Async backend using `primary`, and `fallback` when the primary fails."""
+
+    name = "auto"
+
+    def __init__(self, primary, fallback):
+        """Combine two async backends."""
+        self.primary = primary
+        self.fallback = fallback
+
+    async def analyze(self, text_to_analyse):
+        """Return `{"label": ..., "score": ...}` for one text."""
+        try:
+            return await self.primary.analyze(text_to_analyse)
+        except httpx.HTTPError:
+            return await self.fallback.analyze(text_to_analyse)
+
+    async def analyze_batch(self, texts):
+        """Return one result per text, in input order."""
+        return await asyncio.gather(*(self.analyze(text) for text in texts))
+
+    async def aclose(self):
+        """Close both backends."""
+        await self.primary.aclose()
+        await self.fallback.aclose()
+
+
+def get_async_backend(name="watson", url=URL, concurrency=100):
+    """Create an async sentiment backend by name.
+
+    Args:
+        name (str): "watson", "local" or "auto", as for `get_backend`.
+        url (str): SentimentPredict endpoint for the remote backends.
+        concurrency (int): Maximum number of remote requests in flight.
+
+    Returns:
+        AsyncSentimentClient, AsyncLocalBackend or AsyncFallbackBackend: The backend.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if name == "watson":
+        return AsyncSentimentClient(url, concurrency=concurrency)
+    if name == "local":
+        return AsyncLocalBackend()
+    if name == "auto":
+        return AsyncFallbackBackend(AsyncSentimentClient(url, concurrency=concurrency), AsyncLocalBackend())
+    raise ValueError(f"Unknown sentiment backend: {name}")
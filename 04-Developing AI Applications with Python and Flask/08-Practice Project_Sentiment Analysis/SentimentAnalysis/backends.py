@@ -0,0 +1,243 @@
+import math
+import re
+
+import numpy as np
+import requests
+
+from .sentiment_analysis import URL, sentiment_analyzer, sentiment_analyzer_batch
+
+# Valence of common opinion words, on a -4 (very negative) to +4 (very positive) scale
+LEXICON = {
+    "love": 3.2, "loved": 2.9, "loves": 2.7, "like": 1.5, "liked": 1.8, "likes": 1.6,
+    "enjoy": 2.2, "enjoyed": 2.3, "great": 3.1, "good": 1.9, "nice": 1.8, "fine": 0.8,
+    "excellent": 3.2, "amazing": 2.8, "awesome": 3.1, "wonderful": 2.7, "fantastic": 2.6,
+    "best": 3.2, "better": 1.9, "happy": 2.7, "glad": 2.0, "pleased": 1.9, "fun": 2.3,
+    "beautiful": 2.9, "perfect": 2.7, "recommend": 1.5, "helpful": 1.8, "easy": 1.9,
+    "fast": 1.3, "thanks": 1.9, "thank": 1.5, "win": 2.8, "cool": 1.3, "brilliant": 2.8,
+    "hate": -2.7, "hated": -3.2, "hates": -1.9, "dislike": -1.6, "bad": -2.5, "worse": -2.1,
+    "worst": -3.1, "awful": -2.0, "terrible": -2.1, "horrible": -2.5, "poor": -2.1,
+    "sad": -2.1, "angry": -2.3, "annoying": -1.7, "annoyed": -1.6, "boring": -1.3,
+    "broken": -2.1, "bug": -0.9, "buggy": -1.8, "slow": -0.9, "hard": -0.4, "ugly": -2.3,
+    "useless": -1.8, "waste": -1.8, "fail": -2.5, "failed": -2.3, "fails": -2.2,
+    "problem": -1.7, "problems": -1.7, "disappointed": -1.9, "disappointing": -2.2,
+    "wrong": -2.1, "sucks": -1.5, "crash": -1.7, "crashes": -1.7, "pain": -2.3,
+}
+
+# Words that flip the valence of the opinion word following them
+NEGATIONS = {"not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "cannot", "without"}
+
+# Words that strengthen (or soften) the opinion word following them
+BOOSTERS = {
+    "very": 0.293, "really": 0.293, "so": 0.293, "extremely": 0.293, "absolutely": 0.293,
+    "totally": 0.293, "incredibly": 0.293, "super": 0.293, "quite": 0.1,
+    "slightly": -0.293, "somewhat": -0.293, "barely": -0.293, "kind": -0.293,
+}
+
+# Scores with an absolute value below this are labeled neutral
+NEUTRAL_THRESHOLD = 0.05
+
+TOKEN_PATTERN = re.compile(r"[a-z']+")
+
+# Texts of a batch are joined with this separator and tokenized in one pass
+BATCH_SEPARATOR = "\x01"
+BATCH_TOKEN_PATTERN = re.compile(r"[a-z']+|\x01")
+
+
+class WatsonBackend:
+    """Backend calling the remote Watson SentimentPredict API."""
+
+    name = "watson"
+
+    def __init__(self, url=URL, concurrency=8):
+        """Create a client for the given endpoint.
+
+        Args:
+            url (str): SentimentPredict endpoint.
+            concurrency (int): Requests in flight for `analyze_batch`.
+        """
+        self.url = url
+        self.concurrency = concurrency
+
+    def analyze(self, text_to_analyse):
+        """Return `{"label": ..., "score": ...}` for one text."""
+        return sentiment_analyzer(text_to_analyse, url=self.url)
+
+    def analyze_batch(self, texts):
+        """Return one result per text, in input order."""
+        return sentiment_analyzer_batch(texts, concurrency=self.concurrency, url=self.url)
+
+
+class LexiconBackend:
+    """Local, offline backend scoring texts with a VADER-style lexicon.
+
+    Each opinion word adds its valence, scaled by a preceding booster and
+    flipped by a negation in the three words before it. The sum is
+    normalized to the -1..1 range with `s / sqrt(s**2 + alpha)`.
+
+    `analyze_batch` applies the same rules to a whole batch at once: the
+    tokens of every text are laid out in flat NumPy arrays and the booster,
+    negation and per-text sums are computed with array operations.
+    """
+
+    name = "local"
+
+    def __init__(self, lexicon=LEXICON, alpha=15):
+        """Create a scorer for the given lexicon.
+
+        Args:
+            lexicon (dict): Word to valence mapping.
+            alpha (float): Normalization constant; higher values need more
+                opinion words to approach a score of +/-1.
+        """
+        self.lexicon = lexicon
+        self.alpha = alpha
+
+        # Lookup tables for score_batch: every known word gets an id, with
+        # id 0 for unknown words, id 1 for unknown "...n't" negations and
+        # id -1 for the separator between two texts
+        words = sorted(set(lexicon) | set(BOOSTERS) | NEGATIONS)
+        self._word_ids = {word: i for i, word in enumerate(words, start=2)}
+        self._word_ids[BATCH_SEPARATOR] = -1
+        self._valences = np.array([0.0, 0.0] + [lexicon.get(word, 0.0) for word in words])
+        self._boosts = np.array([0.0, 0.0] + [BOOSTERS.get(word, 0.0) for word in words])
+        self._negations = np.array([False, True] + [word in NEGATIONS for word in words])
+
+    def score(self, text):
+        """Return the normalized sentiment score of a text (-1 to 1)."""
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        total = 0.0
+        for i, token in enumerate(tokens):
+            valence = self.lexicon.get(token)
+            if valence is None:
+                continue
+            if i and tokens[i - 1] in BOOSTERS:
+                boost = BOOSTERS[tokens[i - 1]]
+                valence += boost if valence > 0 else -boost
+            window = tokens[max(0, i - 3):i]
+            if any(word in NEGATIONS or word.endswith("n't") for word in window):
+                valence *= -0.74
+            total += valence
+        return total / math.sqrt(total * total + self.alpha)
+
+    def score_batch(self, texts):
+        """Return the normalized scores of many texts as a NumPy array.
+
+        Args:
+            texts (list): Texts to score.
+
+        Returns:
+            numpy.ndarray: One float64 score per text, same as `score`.
+        """
+        # Tokenize the whole batch with a single regex pass
+        joined = BATCH_SEPARATOR.join(text.replace(BATCH_SEPARATOR, " ") for text in texts).lower()
+        word_ids = self._word_ids
+        ids = np.fromiter(
+            (word_ids.get(token) or token.endswith("n't") for token in BATCH_TOKEN_PATTERN.findall(joined)),
+            dtype=np.int64,
+        )
+        separators = ids == -1
+        doc = np.cumsum(separators)[~separators]
+        ids = ids[~separators]
+        count = len(ids)
+        valence = self._valences[ids]
+        boost = self._boosts[ids]
+        negation = self._negations[ids]
+
+        # Position of every token inside its own text, so shifted arrays
+        # never look across the boundary between two texts
+        lengths = np.bincount(doc, minlength=len(texts))
+        position = np.arange(count) - (np.cumsum(lengths) - lengths)[doc]
+
+        # A booster right before an opinion word pushes it away from zero
+        previous_boost = np.zeros(count)
+        previous_boost[1:] = boost[:-1]
+        previous_boost[position == 0] = 0.0
+        valence = np.where(valence != 0.0, valence + np.sign(valence) * previous_boost, 0.0)
+
+        # A negation in the three words before an opinion word flips it
+        negated = np.zeros(count, dtype=bool)
+        for shift in (1, 2, 3):
+            negated[shift:] |= negation[:-shift] & (position[shift:] >= shift)
+        valence = np.where(negated, valence * -0.74, valence)
+
+        totals = np.bincount(doc, weights=valence, minlength=len(texts))
+        return totals / np.sqrt(totals * totals + self.alpha)
+
+    @staticmethod
+    def _label(score):
+        """Return the label for a normalized score."""
+        if score >= NEUTRAL_THRESHOLD:
+            return "SENT_POSITIVE"
+        if score <= -NEUTRAL_THRESHOLD:
+            return "SENT_NEGATIVE"
+        return "SENT_NEUTRAL"
+
+    def analyze(self, text_to_analyse):
+        """Return `{"label": ..., "score": ...}` for one text.
+
+        Empty input gives a None label and score, like the remote API's
+        status code 500 answer.
+        """
+        if not text_to_analyse or not text_to_analyse.strip():
+            return {"label": None, "score": None}
+        score = self.score(text_to_analyse)
+        return {"label": self._label(score), "score": round(score, 4)}
+
+    def analyze_batch(self, texts):
+        """Return one result per text, in input order, scoring the whole
+        batch in one vectorized pass."""
+        texts = [text or "" for text in texts]
+        scores = np.round(self.score_batch(texts), 4).tolist()
+        return [
+            {"label": self._label(score), "score": score} if text.strip() else {"label": None, "score": None}
+            for text, score in zip(texts, scores)
+        ]
+
+
+class FallbackBackend:
+    """Backend using `primary`, and `fallback` when the primary is unreachable."""
+
+    name = "auto"
+
+    def __init__(self, primary, fallback):
+        """Combine two backends; both must have `analyze` and `analyze_batch`."""
+        self.primary = primary
+        self.fallback = fallback
+
+    def analyze(self, text_to_analyse):
+        """Return `{"label": ..., "score": ...}` for one text."""
+        try:
+            return self.primary.analyze(text_to_analyse)
+        except requests.RequestException:
+            return self.fallback.analyze(text_to_analyse)
+
+    def analyze_batch(self, texts):
+        """Return one result per text, in input order."""
+        texts = list(texts)
+        try:
+            return self.primary.analyze_batch(texts)
+        except requests.RequestException:
+            return self.fallback.analyze_batch(texts)
+
+
+def get_backend(name="watson", url=URL):
+    """Create a sentiment backend by name.
+
+    Args:
+        name (str): "watson" (remote API), "local" (offline lexicon) or
+            "auto" (remote API, falling back to the lexicon when it fails).
+        url (str): SentimentPredict endpoint for the remote backends.
+
+    Returns:
+        WatsonBackend, LexiconBackend or FallbackBackend: The backend.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if name == "watson":
+        return WatsonBackend(url)
+    if name == "local":
+        return LexiconBackend()
+    if name == "auto":
+        return FallbackBackend(WatsonBackend(url), LexiconBackend())
+    raise ValueError(f"Unknown sentiment backend: {name}")
@@ -0,0 +1,195 @@
+import functools
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# Writes to the on-disk tier between two purges of its expired rows
+PURGE_EVERY = 1000
+
+
+def normalize(text):
+    """Return the canonical form of a text used as cache key.
+
+    Unicode is NFC-normalized and runs of whitespace collapse to one space,
+    so texts that only differ in spacing share one cache entry.
+
+    Args:
+        text (str): Text to analyze.
+
+    Returns:
+        str: Normalized text.
+    """
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def text_key(text):
+    """Return the SHA-256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize(text).encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """Two-tier cache of sentiment results keyed on the normalized text hash.
+
+    The first tier is an in-memory LRU bounded by `max_size` entries. The
+    optional second tier is a SQLite file that survives restarts and can be
+    shared by several worker processes. Entries in both tiers expire after
+    `ttl` seconds; expired rows are deleted from the file when it is opened
+    and every `PURGE_EVERY` writes, so it does not grow without bound.
+    """
+
+    SCHEMA = """
+        PRAGMA journal_mode = WAL;
+        CREATE TABLE IF NOT EXISTS sentiment_cache (
+            key TEXT PRIMARY KEY,
+            label TEXT,
+            score REAL,
+            expires REAL NOT NULL
+        );
+    """
+
+    def __init__(self, max_size=10000, ttl=3600, path=None, clock=time.time):
+        """Create an empty cache.
+
+        Args:
+            max_size (int): Maximum number of entries kept in memory.
+            ttl (float): Seconds an entry stays valid.
+            path (str, optional): SQLite file for the on-disk tier.
+            clock (callable): Returns the current time in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._writes = 0
+        if path:
+            self._db.executescript(self.SCHEMA)
+            self.purge_expired()
+
+    @property
+    def _db(self):
+        """Return this thread's SQLite connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def __len__(self):
+        """Return the number of entries in the memory tier."""
+        return len(self._entries)
+
+    def get(self, text):
+        """Return the cached result for a text, or None.
+
+        Args:
+            text (str): Text to analyze.
+
+        Returns:
+            dict or None: `{"label": ..., "score": ...}` if cached and fresh.
+        """
+        key = text_key(text)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return dict(result)
+                del self._entries[key]
+                self._counters["expirations"] += 1
+
+        if self.path:
+            row = self._db.execute("SELECT label, score, expires FROM sentiment_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[2] > now:
+                result = {"label": row[0], "score": row[1]}
+                with self._lock:
+                    self._counters["disk_hits"] += 1
+                    self._store(key, result, row[2])
+                return dict(result)
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def put(self, text, result):
+        """Cache the result for a text in both tiers.
+
+        Args:
+            text (str): Analyzed text.
+            result (dict): `{"label": ..., "score": ...}` returned by the analyzer.
+        """
+        key = text_key(text)
+        expires = self._clock() + self.ttl
+        result = {"label": result["label"], "score": result["score"]}
+        with self._lock:
+            self._store(key, result, expires)
+            self._writes += 1
+            purge = self._writes % PURGE_EVERY == 0
+        if self.path:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?, ?, ?)",
+                (key, result["label"], result["score"], expires),
+            )
+            if purge:
+                self.purge_expired()
+
+    def _store(self, key, result, expires):
+        """Insert into the LRU tier, evicting the oldest entries if full."""
+        self._entries[key] = (result, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def purge_expired(self):
+        """Drop expired entries from the on-disk tier.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        if not self.path:
+            return 0
+        return self._db.execute("DELETE FROM sentiment_cache WHERE expires <= ?", (self._clock(),)).rowcount
+
+    def stats(self):
+        """Return the cache counters.
+
+        Returns:
+            dict: Hit, disk hit, miss, eviction and expiration counts, the
+                number of entries in memory and the hit ratio.
+        """
+        with self._lock:
+            stats = dict(self._counters, size=len(self._entries), max_size=self.max_size)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def wrap(self, analyzer):
+        """Return `analyzer` with results served from this cache.
+
+        Args:
+            analyzer (callable): Function taking a text and returning
+                `{"label": ..., "score": ...}`.
+
+        Returns:
+            callable: Cached version of `analyzer`.
+        """
+
+        @functools.wraps(analyzer)
+        def cached_analyzer(text_to_analyse, *args, **kwargs):
+            result = self.get(text_to_analyse)
+            if result is None:
+                result = analyzer(text_to_analyse, *args, **kwargs)
+                self.put(text_to_analyse, result)
+            return result
+
+        return cached_analyzer
@@ -0,0 +1,151 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+
+class MicroBatcher:
+    """Group individual sentiment requests into batched backend calls.
+
+    Callers submit one text each and wait for its result. A background
+    thread takes the first pending text, keeps collecting until it holds
+    `max_batch_size` texts or `max_wait_ms` milliseconds have passed since
+    that first text arrived, then hands the whole batch to `batch_func` and
+    routes each result back to its caller.
+
+    Larger batches and longer waits amortize per-call overhead (higher
+    throughput) at the cost of extra queueing delay (higher p99 latency);
+    `max_batch_size=1` disables batching.
+    """
+
+    def __init__(self, batch_func, max_batch_size=32, max_wait_ms=2.0):
+        """Start the dispatcher thread.
+
+        Args:
+            batch_func (callable): Takes a list of texts and returns one
+                result per text, in order (e.g. a backend's `analyze_batch`).
+            max_batch_size (int): Maximum number of texts per batch.
+            max_wait_ms (float): Longest time the first text of a batch
+                waits for more texts to join it.
+        """
+        self.batch_func = batch_func
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "batches": 0, "errors": 0, "largest_batch": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text_to_analyse):
+        """Queue a text for the next batch.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the text's result.
+
+        Raises:
+            RuntimeError: If the dispatcher was closed.
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((text_to_analyse, future, time.monotonic()))
+        return future
+
+    def analyze(self, text_to_analyse):
+        """Return the result for one text, blocking until its batch ran."""
+        return self.submit(text_to_analyse).result()
+
+    async def analyze_async(self, text_to_analyse):
+        """Return the result for one text without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text_to_analyse))
+
+    def close(self):
+        """Stop the dispatcher thread after the pending texts are processed."""
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        """Return the dispatcher counters.
+
+        Returns:
+            dict: Requests, batches, failed batches, the largest and the
+                average batch size, and the configured limits.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats["average_batch"] = stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_wait_ms"] = self.max_wait * 1000
+        return stats
+
+    def _collect(self):
+        """Block for the first pending text, then gather a batch.
+
+        Returns:
+            list or None: `(text, future, queued_at)` tuples, or None once closed.
+        """
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Process what we have, then stop on the next collect
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        """Dispatcher loop: collect a batch, run it, deliver the results."""
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            try:
+                self._process(batch)
+            except BaseException as e:
+                # Never let one batch stop the dispatcher: fail whoever is still waiting
+                for _, future, _ in batch:
+                    if not future.done():
+                        try:
+                            future.set_exception(e)
+                        except InvalidStateError:
+                            pass
+
+    def _process(self, batch):
+        """Run one batch and deliver each result to its caller.
+
+        Callers that cancelled while their text was queued are dropped; the
+        others can no longer cancel, so each gets a result or an exception.
+        """
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        texts = [text for text, _, _ in batch]
+        try:
+            results = list(self.batch_func(texts))
+            if len(results) != len(batch):
+                raise RuntimeError(f"batch_func returned {len(results)} results for {len(batch)} texts")
+        except BaseException as e:
+            with self._lock:
+                self._counters["errors"] += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+        with self._lock:
+            self._counters["requests"] += len(batch)
+            self._counters["batches"] += 1
+            self._counters["largest_batch"] = max(self._counters["largest_batch"], len(batch))
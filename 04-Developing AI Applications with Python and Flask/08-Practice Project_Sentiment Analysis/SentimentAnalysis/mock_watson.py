@@ -0,0 +1,114 @@
+"""Local stand-in for the Watson SentimentPredict endpoint.
+
+It answers with the same JSON shape as the real service, using a few
+keywords to pick the label, so the client can be tested and benchmarked
+without network access.
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PATH = "/v1/watson.runtime.nlp.v1/NlpService/SentimentPredict"
+
+
+def classify(text):
+    """Return a (label, score) pair for the text based on keywords."""
+    words = text.lower().split()
+    if any(word in ("love", "like", "great", "good") for word in words):
+        return "SENT_POSITIVE", 0.99
+    if any(word in ("hate", "bad", "awful", "terrible") for word in words):
+        return "SENT_NEGATIVE", -0.99
+    return "SENT_NEUTRAL", 0.0
+
+
+class MockWatsonServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a listen backlog sized for load tests."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class MockWatsonHandler(BaseHTTPRequestHandler):
+    """Request handler mimicking SentimentPredict."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            fail = server.failures > 0
+            if fail:
+                server.failures -= 1
+        if server.latency:
+            time.sleep(server.latency)
+        if fail:
+            self._reply(503, {"error": "Service unavailable"})
+            return
+
+        text = json.loads(body).get("raw_document", {}).get("text") or ""
+        if not text.strip():
+            # The real service answers empty input with status code 500
+            self._reply(500, {"code": 3, "details": "Invalid input"})
+            return
+        label, score = classify(text)
+        self._reply(200, {"documentSentiment": {"label": label, "score": score}})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Keep test and benchmark output quiet
+        pass
+
+
+def start_mock_server(latency=0.0, failures=0, port=0, keep_alive=True):
+    """Start the stand-in server in a background thread.
+
+    Args:
+        latency (float): Seconds to wait before answering each request.
+        failures (int): Number of initial requests answered with status 503.
+        port (int): Port to listen on; 0 picks a free one.
+        keep_alive (bool): Keep connections open between requests (HTTP/1.1);
+            when False every response closes its connection (HTTP/1.0).
+
+    Returns:
+        tuple:
+            MockWatsonServer: The running server (call `shutdown()` to stop).
+            str: URL of its SentimentPredict endpoint.
+    """
+    handler = MockWatsonHandler
+    if not keep_alive:
+        handler = type("MockWatsonCloseHandler", (MockWatsonHandler,), {"protocol_version": "HTTP/1.0"})
+    server = MockWatsonServer(("127.0.0.1", port), handler)
+    server.latency = latency
+    server.failures = failures
+    server.requests = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}{PATH}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for Watson SentimentPredict.")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each answer")
+    parser.add_argument("--no-keep-alive", action="store_true", help="close the connection after each response")
+    args = parser.parse_args()
+    server, url = start_mock_server(latency=args.latency, port=args.port, keep_alive=not args.no_keep_alive)
+    print(f"Mock Watson listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,32 +1,163 @@
+import itertools
 import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import requests
+from requests.adapters import HTTPAdapter
 
+# URL of the Watson sentiment analysis API
+URL = "https://sn-watson-sentiment-bert.labs.skills.network/v1/watson.runtime.nlp.v1/NlpService/SentimentPredict"
 
-def sentiment_analyzer(text_to_analyse):
-    # Define the URL for the sentiment analysis API
-    url = "https://sn-watson-sentiment-bert.labs.skills.network/v1/watson.runtime.nlp.v1/NlpService/SentimentPredict"
+# Headers with the required model ID for the API
+HEADERS = {"grpc-metadata-mm-model-id": "sentiment_aggregated-bert-workflow_lang_multi_stock"}
 
-    # Create the payload with the text to be analyzed
-    myobj = {"raw_document": {"text": text_to_analyse}}
+# Seconds to wait for the API to connect and to answer
+TIMEOUT = 10
 
-    # Set the headers with the required model ID for the API
-    header = {"grpc-metadata-mm-model-id": "sentiment_aggregated-bert-workflow_lang_multi_stock"}
+# Status codes worth retrying: the request may succeed on a later attempt
+RETRY_STATUS_CODES = {429, 502, 503, 504}
 
-    # Make a POST request to the API with the payload and headers
-    response = requests.post(url, json=myobj, headers=header)
+# Shared session, so keep-alive connections are reused between calls
+_session = None
+_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size=10):
+    """Return the shared HTTP session, creating it on first use.
+
+    A call asking for a larger pool replaces the session and closes the
+    old one, releasing its connections.
+
+    Args:
+        pool_size (int): Number of keep-alive connections kept per host.
+
+    Returns:
+        requests.Session: Session with a connection pool of `pool_size`.
+    """
+    global _session, _pool_size
+    with _session_lock:
+        if _session is None or _pool_size < pool_size:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(HEADERS)
+            if _session is not None:
+                _session.close()
+            _session, _pool_size = session, pool_size
+        return _session
 
-    # Parse the response from the API
-    formatted_response = json.loads(response.text)
 
-    # If the response status code is 200, extract the label and score from the response
-    if response.status_code == 200:
-        label = formatted_response["documentSentiment"]["label"]
-        score = formatted_response["documentSentiment"]["score"]
+def parse_response(response):
+    """Extract the label and score from an API response.
+
+    Args:
+        response (requests.Response): Response of the SentimentPredict endpoint.
+
+    Returns:
+        dict: `{"label": ..., "score": ...}`, with both set to None when the
+            API answered with status code 500 (invalid input).
+
+    Raises:
+        requests.HTTPError: If the API answered with any other error status.
+    """
     # If the response status code is 500, set label and score to None
-    elif response.status_code == 500:
-        label = None
-        score = None
+    if response.status_code == 500:
+        return {"label": None, "score": None}
+    response.raise_for_status()
 
-    # Return the label and score in a dictionary
+    # Parse the response from the API and extract the label and score
+    formatted_response = json.loads(response.text)
+    label = formatted_response["documentSentiment"]["label"]
+    score = formatted_response["documentSentiment"]["score"]
     return {"label": label, "score": score}
+
+
+def sentiment_analyzer(text_to_analyse, url=URL, timeout=TIMEOUT, retries=0, backoff=0.5):
+    # Create the payload with the text to be analyzed
+    myobj = {"raw_document": {"text": text_to_analyse}}
+
+    session = get_session()
+    for attempt in range(retries + 1):
+        # Wait longer before each new attempt (0.5s, 1s, 2s, ...)
+        if attempt:
+            time.sleep(backoff * 2 ** (attempt - 1))
+        try:
+            # Make a POST request to the API over the pooled session
+            response = session.post(url, json=myobj, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            continue
+        if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+            break
+
+    # Return the label and score in a dictionary
+    return parse_response(response)
+
+
+def sentiment_analyzer_batch(
+    texts, concurrency=8, url=URL, timeout=TIMEOUT, retries=3, backoff=0.5, return_exceptions=False
+):
+    """Analyze many texts with a bounded number of concurrent requests.
+
+    Requests share one pooled session, so connections are reused instead of
+    paying for a TCP/TLS handshake per text. At most `concurrency` requests
+    are in flight at once (texts are read from the iterable as slots free
+    up), and each is retried with exponential backoff on connection errors,
+    timeouts and retryable status codes.
+
+    A text that still fails after its retries stops the batch: no further
+    request is sent and the error is raised at once, without waiting for
+    the requests in flight. With `return_exceptions`, the error is put in
+    that text's place instead and the other results are kept.
+
+    Args:
+        texts (iterable): Texts to analyze.
+        concurrency (int): Maximum number of requests in flight.
+        url (str): SentimentPredict endpoint.
+        timeout (float): Per-request timeout in seconds.
+        retries (int): Extra attempts per text after the first one.
+        backoff (float): Delay before the first retry, doubled each time.
+        return_exceptions (bool): Return the errors of failed texts in
+            their place instead of raising the first one.
+
+    Returns:
+        list: One `{"label": ..., "score": ...}` dictionary (or, with
+            `return_exceptions`, exception) per text, in input order.
+
+    Raises:
+        requests.RequestException: The first error of a text, unless
+            `return_exceptions` is set.
+    """
+    get_session(concurrency)
+    texts = enumerate(texts)
+    results = {}
+    pending = {}
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def submit(count):
+        for index, text in itertools.islice(texts, count):
+            future = executor.submit(sentiment_analyzer, text, url=url, timeout=timeout, retries=retries, backoff=backoff)
+            pending[future] = index
+
+    try:
+        submit(concurrency)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results[index] = e
+            submit(len(done))
+    finally:
+        # On an error, leave the requests in flight to finish on their own
+        executor.shutdown(wait=False, cancel_futures=True)
+    return [results[index] for index in range(len(results))]
@@ -0,0 +1,181 @@
+import asyncio
+import functools
+import threading
+
+from .cache import text_key
+
+
+class _Call:
+    """An in-flight call shared by the callers of one key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    """An in-flight coroutine call shared by the tasks of one key."""
+
+    def __init__(self):
+        self.task = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one underlying call.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight wait for it and get the same result, or the
+    same exception. Once the call finishes the key is forgotten, so later
+    calls run again (put a cache in front to reuse finished results).
+
+    Threads and asyncio tasks are tracked separately: `do` blocks the
+    calling thread, `do_async` awaits a future on the running event loop.
+    """
+
+    def __init__(self):
+        """Create a group with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self._counters = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key, func, *args, **kwargs):
+        """Run `func(*args, **kwargs)` once for all threads asking for `key`.
+
+        Returns:
+            The function's result (dictionaries are copied per caller).
+
+        Raises:
+            Exception: Whatever the leader's call raised.
+        """
+        with self._lock:
+            self._counters["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters["executions"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _copy(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, func, *args, **kwargs):
+        """Await `func(*args, **kwargs)` once for all tasks asking for `key`.
+
+        The call runs as its own task, and every caller (the first one
+        included) awaits it through `asyncio.shield`, so a caller that is
+        cancelled, e.g. because its client disconnected, only stops waiting.
+        The call itself is cancelled once no caller is waiting for it.
+
+        Returns:
+            The coroutine's result (dictionaries are copied per caller).
+
+        Raises:
+            Exception: Whatever the call raised.
+        """
+        loop = asyncio.get_running_loop()
+        calls_key = (loop, key)
+        with self._lock:
+            self._counters["calls"] += 1
+            call = self._async_calls.get(calls_key)
+            if call is None:
+                call = self._async_calls[calls_key] = _AsyncCall()
+                call.task = loop.create_task(self._execute(calls_key, call, func(*args, **kwargs)))
+                self._counters["executions"] += 1
+            else:
+                self._counters["coalesced"] += 1
+            call.waiters += 1
+
+        try:
+            return _copy(await asyncio.shield(call.task))
+        except asyncio.CancelledError:
+            with self._lock:
+                abandoned = call.waiters == 1 and self._async_calls.get(calls_key) is call
+                if abandoned:
+                    # Later callers start a fresh call instead of joining a cancelled one
+                    del self._async_calls[calls_key]
+            if abandoned:
+                call.task.cancel()
+            raise
+        finally:
+            with self._lock:
+                call.waiters -= 1
+
+    async def _execute(self, calls_key, call, coroutine):
+        """Run a shared call's coroutine, then forget the call."""
+        try:
+            return await coroutine
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                if self._async_calls.get(calls_key) is call:
+                    del self._async_calls[calls_key]
+
+    def stats(self):
+        """Return the call counters.
+
+        Returns:
+            dict: Total calls, underlying executions, coalesced calls,
+                failed executions and calls currently in flight.
+        """
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._calls) + len(self._async_calls))
+
+    def wrap(self, analyzer):
+        """Return `analyzer` with concurrent calls for the same normalized
+        text coalesced.
+
+        Args:
+            analyzer (callable): Function taking a text and returning
+                `{"label": ..., "score": ...}`.
+
+        Returns:
+            callable: Coalescing version of `analyzer`.
+        """
+
+        @functools.wraps(analyzer)
+        def coalesced_analyzer(text_to_analyse, *args, **kwargs):
+            return self.do(text_key(text_to_analyse), analyzer, text_to_analyse, *args, **kwargs)
+
+        return coalesced_analyzer
+
+    def wrap_async(self, analyzer):
+        """Return the coroutine function `analyzer` with concurrent calls for
+        the same normalized text coalesced.
+        """
+
+        @functools.wraps(analyzer)
+        async def coalesced_analyzer(text_to_analyse, *args, **kwargs):
+            return await self.do_async(text_key(text_to_analyse), analyzer, text_to_analyse, *args, **kwargs)
+
+        return coalesced_analyzer
+
+
+def _copy(result):
+    """Give each waiting caller its own copy of a dictionary result."""
+    return dict(result) if isinstance(result, dict) else result
@@ -0,0 +1,137 @@
+"""Executing this function initiates the asynchronous (ASGI) version of
+the sentiment analysis application, deployed on localhost:5000.
+
+The routes match server.py, but handlers are coroutines awaiting an async
+sentiment client, so a single worker keeps many upstream calls in flight
+instead of parking one thread per request. Run it under an ASGI server,
+e.g. `hypercorn --workers 2 --bind 0.0.0.0:5000 asgi_server:app`; Quart and
+Hypercorn are listed in requirements.txt.
+"""
+
+import asyncio
+import os
+
+from quart import Quart, render_template, request
+from SentimentAnalysis.async_client import get_async_backend
+from SentimentAnalysis.backends import get_backend
+from SentimentAnalysis.cache import SentimentCache
+from SentimentAnalysis.dispatcher import MicroBatcher
+from SentimentAnalysis.sentiment_analysis import URL
+from SentimentAnalysis.singleflight import SingleFlight
+
+app = Quart("Sentiment Analyzer")
+
+# Async sentiment backend, configured like server.py through SENTIMENT_BACKEND
+# and SENTIMENT_URL; SENTIMENT_CONCURRENCY bounds upstream calls per worker
+backend = get_async_backend(
+    os.environ.get("SENTIMENT_BACKEND", "watson"),
+    url=os.environ.get("SENTIMENT_URL", URL),
+    concurrency=int(os.environ.get("SENTIMENT_CONCURRENCY", 100)),
+)
+
+# Cache of sentiment results, configured like server.py
+cache = SentimentCache(
+    max_size=int(os.environ.get("SENTIMENT_CACHE_SIZE", 10000)),
+    ttl=float(os.environ.get("SENTIMENT_CACHE_TTL", 3600)),
+    path=os.environ.get("SENTIMENT_CACHE_PATH"),
+)
+
+# Micro-batching, configured like server.py: batches run on the synchronous
+# backend in the dispatcher thread and results are awaited without blocking
+batcher = None
+backend_analyze = backend.analyze
+if int(os.environ.get("SENTIMENT_BATCH_SIZE", 1)) > 1:
+    batcher = MicroBatcher(
+        get_backend(os.environ.get("SENTIMENT_BACKEND", "watson"), url=os.environ.get("SENTIMENT_URL", URL)).analyze_batch,
+        max_batch_size=int(os.environ["SENTIMENT_BATCH_SIZE"]),
+        max_wait_ms=float(os.environ.get("SENTIMENT_BATCH_WAIT_MS", 2)),
+    )
+    backend_analyze = batcher.analyze_async
+
+# Concurrent cache misses for the same text share one backend call
+flight = SingleFlight()
+coalesced_analyze = flight.wrap_async(backend_analyze)
+
+
+async def analyze(text_to_analyze):
+    """This function returns the cached result for the text, or awaits
+    the backend and caches its answer. With the on-disk tier enabled, cache
+    reads and writes query SQLite, so they run in a worker thread instead
+    of blocking the event loop.
+    """
+    if cache.path:
+        response = await asyncio.to_thread(cache.get, text_to_analyze)
+    else:
+        response = cache.get(text_to_analyze)
+    if response is None:
+        response = await coalesced_analyze(text_to_analyze)
+        if cache.path:
+            await asyncio.to_thread(cache.put, text_to_analyze, response)
+        else:
+            cache.put(text_to_analyze, response)
+    return response
+
+
+@app.route("/sentimentAnalyzer")
+async def sent_analyzer():
+    """This code receives the text from the HTML interface and
+    awaits sentiment analysis over it from the async backend. The
+    output returned shows the label and its confidence score for the
+    provided text.
+    """
+    # Retrieve the text to analyze from the request arguments
+    text_to_analyze = request.args.get("textToAnalyze")
+    # Await the cached backend and store the response
+    response = await analyze(text_to_analyze)
+    # Extract the label and score from the response
+    label = response["label"]
+    score = response["score"]
+    # Check if the label is None, indicating an error or invalid input
+    if label is None:
+        return "Invalid input! Try again."
+    else:
+        # Return a formatted string with the sentiment label and score
+        return "The given text has been identified as {} with a score of {}.".format(label.split("_")[1], score)
+
+
+@app.route("/cacheStats")
+async def cache_stats():
+    """This function returns the counters of the sentiment result cache
+    as JSON.
+    """
+    return cache.stats()
+
+
+@app.route("/coalescingStats")
+async def coalescing_stats():
+    """This function returns how many sentiment requests were coalesced
+    into a call already in flight, as JSON.
+    """
+    return flight.stats()
+
+
+@app.route("/batchingStats")
+async def batching_stats():
+    """This function returns the micro-batching counters as JSON, or
+    an empty object when batching is disabled.
+    """
+    return batcher.stats() if batcher else {}
+
+
+@app.route("/")
+async def render_index_page():
+    """This function initiates the rendering of the main application
+    page over the ASGI channel
+    """
+    return await render_template("index.html")
+
+
+@app.after_serving
+async def close_backend():
+    """This function closes the backend's connection pool on shutdown."""
+    await backend.aclose()
+
+
+if __name__ == "__main__":
+    """This functions executes the ASGI app and deploys it on localhost:5000"""
+    app.run(host="0.0.0.0", port=5000)
@@ -0,0 +1,59 @@
+"""Compare the local lexicon backend with the remote API path.
+
+Usage:
+    python bench_backends.py [DOCS] [--remote]
+
+The remote path runs against the local Watson stand-in (no network or
+model time, so it only measures the HTTP round trip) unless `--remote`
+is given, in which case it calls the real service.
+"""
+
+import random
+import statistics
+import sys
+import time
+
+from SentimentAnalysis.backends import LexiconBackend, WatsonBackend
+from SentimentAnalysis.mock_watson import start_mock_server
+from SentimentAnalysis.sentiment_analysis import URL
+
+WORDS = "i you we the product service support python code team day really very not love hate good bad slow fast great awful".split()
+
+
+def make_docs(count, seed=7):
+    """Generate `count` short reviews from a small vocabulary."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 30))) for _ in range(count)]
+
+
+def measure(backend, docs):
+    """Return (median latency in ms, docs per second) over single calls."""
+    latencies = []
+    start = time.perf_counter()
+    for doc in docs:
+        began = time.perf_counter()
+        backend.analyze(doc)
+        latencies.append((time.perf_counter() - began) * 1000)
+    elapsed = time.perf_counter() - start
+    return statistics.median(latencies), len(docs) / elapsed
+
+
+def main(count, remote):
+    docs = make_docs(count)
+    server = None
+    if remote:
+        url = URL
+    else:
+        server, url = start_mock_server()
+    remote_docs = docs[:min(count, 500)]
+    print(f"{'backend':>10} {'docs':>8} {'p50 ms':>10} {'docs/s':>12}")
+    for name, backend, sample in (("local", LexiconBackend(), docs), ("remote", WatsonBackend(url), remote_docs)):
+        p50, rate = measure(backend, sample)
+        print(f"{name:>10} {len(sample):>8} {p50:>10.4f} {rate:>12,.0f}")
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--remote"]
+    main(int(args[0]) if args else 50_000, "--remote" in sys.argv)
@@ -0,0 +1,96 @@
+"""Measure the throughput / latency trade-off of micro-batching.
+
+Usage:
+    python bench_batching.py [CLIENTS] [REQUESTS] [OVERHEAD_US]
+
+Many client threads send single texts to the local lexicon backend, either
+directly or through a MicroBatcher with a range of batch sizes and wait
+windows. Every backend call also burns OVERHEAD_US microseconds of CPU
+(default 50) to stand in for the fixed cost of a call: request encoding,
+a system call, a model invocation. Bigger batches pay that cost once for
+many texts and raise throughput; longer windows add queueing delay to the
+tail latency.
+"""
+
+import random
+import statistics
+import sys
+import threading
+import time
+
+from SentimentAnalysis.backends import LexiconBackend
+from SentimentAnalysis.dispatcher import MicroBatcher
+
+WORDS = "i you we the product service support python not really very love hate good bad slow fast great awful".split()
+BATCH_SIZES = [1, 8, 32, 128]
+WAITS_MS = [0.5, 2, 10]
+
+
+def make_docs(count, seed=3):
+    """Generate `count` short reviews from a small vocabulary."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 30))) for _ in range(count)]
+
+
+def with_overhead(func, overhead_us):
+    """Return `func` preceded by a busy wait of `overhead_us` microseconds."""
+    overhead = overhead_us / 1e6
+
+    def call(arg):
+        deadline = time.perf_counter() + overhead
+        while time.perf_counter() < deadline:
+            pass
+        return func(arg)
+
+    return call
+
+
+def run(analyze, docs, clients):
+    """Send every doc through `analyze` from `clients` threads.
+
+    Returns:
+        tuple: Docs per second, p50 and p99 latency in ms.
+    """
+    latencies = []
+    chunks = [docs[i::clients] for i in range(clients)]
+
+    def client(chunk):
+        local = []
+        for doc in chunk:
+            began = time.perf_counter()
+            analyze(doc)
+            local.append((time.perf_counter() - began) * 1000)
+        latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(docs) / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def main(clients, requests, overhead_us):
+    backend = LexiconBackend()
+    analyze = with_overhead(backend.analyze, overhead_us)
+    analyze_batch = with_overhead(backend.analyze_batch, overhead_us)
+    docs = make_docs(requests)
+    print(f"{clients} client threads, {requests} requests, {overhead_us}us overhead per backend call")
+    print(f"{'batch':>6} {'wait ms':>8} {'docs/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'avg batch':>10}")
+    rate, p50, p99 = run(analyze, docs, clients)
+    print(f"{'none':>6} {'-':>8} {rate:>10,.0f} {p50:>8.3f} {p99:>8.3f} {'-':>10}")
+    for size in BATCH_SIZES:
+        for wait in WAITS_MS:
+            batcher = MicroBatcher(analyze_batch, max_batch_size=size, max_wait_ms=wait)
+            rate, p50, p99 = run(batcher.analyze, docs, clients)
+            average = batcher.stats()["average_batch"]
+            batcher.close()
+            print(f"{size:>6} {wait:>8} {rate:>10,.0f} {p50:>8.3f} {p99:>8.3f} {average:>10.1f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [64, 50_000, 50][len(args):]))
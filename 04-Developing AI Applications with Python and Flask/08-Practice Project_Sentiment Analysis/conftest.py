@@ -0,0 +1,12 @@
+import unittest
+from unittest import mock
+
+import pytest
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    """Collect test modules that call `unittest.main()` unguarded at import
+    (test_sentiment_analysis.py) without letting it run and exit pytest."""
+    with mock.patch.object(unittest, "main"):
+        yield
@@ -0,0 +1,129 @@
+"""Load test the sync (WSGI) and async (ASGI) sentiment apps.
+
+Usage:
+    python load_test.py [--workers 2] [--concurrency 10 50 200] [--latency 0.2] [--requests 400]
+
+Starts the local Watson stand-in with a fixed upstream latency, then for
+each mode serves the app with the same number of worker processes
+(gunicorn sync workers for server.py, hypercorn for asgi_server.py) and
+fires requests at increasing client concurrency. Sync workers handle one
+request at a time, so their throughput is capped at roughly
+`workers / latency`; async workers overlap the upstream waits.
+Requires gunicorn, hypercorn and httpx (see requirements.txt).
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from SentimentAnalysis.mock_watson import PATH
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SERVERS = {
+    "sync": ["gunicorn", "--workers", "{workers}", "--bind", "127.0.0.1:{port}", "server:app"],
+    "async": ["hypercorn", "--workers", "{workers}", "--bind", "127.0.0.1:{port}", "asgi_server:app"],
+}
+
+
+def free_port():
+    """Return a TCP port nobody is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=15):
+    """Block until something accepts connections on the port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port}")
+
+
+def start(command, env=None):
+    """Start a subprocess in this directory with its output discarded."""
+    return subprocess.Popen(command, cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def fire(url, total, concurrency):
+    """Send `total` requests with `concurrency` in flight.
+
+    Returns:
+        tuple: Requests per second, p50 and p99 latency in ms, error count.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=0)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+
+        async def one(i):
+            nonlocal errors
+            async with semaphore:
+                began = time.perf_counter()
+                try:
+                    response = await client.get(url, params={"textToAnalyze": f"I love request {i}"})
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - began) * 1000)
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start_time
+
+    latencies.sort()
+    return total / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1], errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--latency", type=float, default=0.2, help="upstream latency in seconds")
+    parser.add_argument("--requests", type=int, default=400)
+    args = parser.parse_args()
+
+    upstream_port = free_port()
+    upstream = start([sys.executable, "-m", "SentimentAnalysis.mock_watson", "--port", str(upstream_port),
+                      "--latency", str(args.latency), "--no-keep-alive"])
+    # Disable the result cache so every request reaches the upstream
+    env = dict(os.environ, SENTIMENT_URL=f"http://127.0.0.1:{upstream_port}{PATH}", SENTIMENT_BACKEND="watson",
+               SENTIMENT_CACHE_SIZE="0")
+    try:
+        wait_for_port(upstream_port)
+        print(f"workers={args.workers} upstream latency={args.latency * 1000:.0f}ms")
+        print(f"{'mode':>6} {'clients':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for mode, template in SERVERS.items():
+            port = free_port()
+            command = [part.format(workers=args.workers, port=port) for part in template]
+            server = start(command, env=env)
+            try:
+                wait_for_port(port)
+                url = f"http://127.0.0.1:{port}/sentimentAnalyzer"
+                for concurrency in args.concurrency:
+                    rate, p50, p99, errors = asyncio.run(fire(url, args.requests, concurrency))
+                    print(f"{mode:>6} {concurrency:>8} {rate:>8.1f} {p50:>8.0f} {p99:>8.0f} {errors:>7}")
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        upstream.terminate()
+        upstream.wait()
+
+
+if __name__ == "__main__":
+    main()
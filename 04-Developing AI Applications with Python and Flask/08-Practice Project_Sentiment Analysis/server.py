@@ -3,23 +3,58 @@ analysis to be executed over the Flask channel and deployed on
 localhost:5000.
 """
 
+import os
+
 from flask import Flask, render_template, request
-from SentimentAnalysis.sentiment_analysis import sentiment_analyzer
+from SentimentAnalysis.backends import get_backend
+from SentimentAnalysis.cache import SentimentCache
+from SentimentAnalysis.dispatcher import MicroBatcher
+from SentimentAnalysis.sentiment_analysis import URL
+from SentimentAnalysis.singleflight import SingleFlight
 
 app = Flask("Sentiment Analyzer")
 
+# Sentiment backend: "watson" (remote API, default), "local" (offline
+# lexicon scorer) or "auto" (remote API with the local scorer as fallback)
+backend = get_backend(os.environ.get("SENTIMENT_BACKEND", "watson"), url=os.environ.get("SENTIMENT_URL", URL))
+
+# Cache of sentiment results, sized from the environment. Setting
+# SENTIMENT_CACHE_PATH adds an on-disk tier shared by all workers.
+cache = SentimentCache(
+    max_size=int(os.environ.get("SENTIMENT_CACHE_SIZE", 10000)),
+    ttl=float(os.environ.get("SENTIMENT_CACHE_TTL", 3600)),
+    path=os.environ.get("SENTIMENT_CACHE_PATH"),
+)
+
+# Micro-batching: with SENTIMENT_BATCH_SIZE above 1, concurrent requests are
+# grouped into one backend batch call, waiting at most SENTIMENT_BATCH_WAIT_MS
+# for the batch to fill
+batcher = None
+backend_analyze = backend.analyze
+if int(os.environ.get("SENTIMENT_BATCH_SIZE", 1)) > 1:
+    batcher = MicroBatcher(
+        backend.analyze_batch,
+        max_batch_size=int(os.environ["SENTIMENT_BATCH_SIZE"]),
+        max_wait_ms=float(os.environ.get("SENTIMENT_BATCH_WAIT_MS", 2)),
+    )
+    backend_analyze = batcher.analyze
+
+# Concurrent cache misses for the same text share one backend call
+flight = SingleFlight()
+analyze = cache.wrap(flight.wrap(backend_analyze))
+
 
 @app.route("/sentimentAnalyzer")
 def sent_analyzer():
     """This code receives the text from the HTML interface and
-    runs sentiment analysis over it using sentiment_analysis()
-    function. The output returned shows the label and its confidence
-    score for the provided text.
+    runs sentiment analysis over it using the configured backend.
+    The output returned shows the label and its confidence score for
+    the provided text.
     """
     # Retrieve the text to analyze from the request arguments
     text_to_analyze = request.args.get("textToAnalyze")
-    # Pass the text to the sentiment_analyzer function and store the response
-    response = sentiment_analyzer(text_to_analyze)
+    # Pass the text to the cached backend and store the response
+    response = analyze(text_to_analyze)
     # Extract the label and score from the response
     label = response["label"]
     score = response["score"]
@@ -31,6 +66,30 @@ def sent_analyzer():
         return "The given text has been identified as {} with a score of {}.".format(label.split("_")[1], score)
 
 
+@app.route("/cacheStats")
+def cache_stats():
+    """This function returns the hit, miss and eviction counters of the
+    sentiment result cache as JSON.
+    """
+    return cache.stats()
+
+
+@app.route("/coalescingStats")
+def coalescing_stats():
+    """This function returns how many sentiment requests were coalesced
+    into a call already in flight, as JSON.
+    """
+    return flight.stats()
+
+
+@app.route("/batchingStats")
+def batching_stats():
+    """This function returns the micro-batching counters as JSON, or
+    an empty object when batching is disabled.
+    """
+    return batcher.stats() if batcher else {}
+
+
 @app.route("/")
 def render_index_page():
     """This function initiates the rendering of the main application
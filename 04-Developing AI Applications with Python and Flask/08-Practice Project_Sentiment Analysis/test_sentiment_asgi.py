@@ -0,0 +1,72 @@
+import asyncio
+import importlib
+import importlib.util
+import os
+import unittest
+from unittest import mock
+
+from SentimentAnalysis.cache import SentimentCache
+from SentimentAnalysis.mock_watson import start_mock_server
+
+
+@unittest.skipUnless(importlib.util.find_spec("quart"), "asgi_server.py needs Quart")
+class TestAsgiServer(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # asgi_server reads its configuration at import, so point it at the stand-in first
+        cls.server, url = start_mock_server()
+        environment = {"SENTIMENT_BACKEND": "watson", "SENTIMENT_URL": url, "SENTIMENT_BATCH_SIZE": "1"}
+        with mock.patch.dict(os.environ, environment):
+            os.environ.pop("SENTIMENT_CACHE_PATH", None)
+            cls.asgi_server = importlib.reload(importlib.import_module("asgi_server"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    async def asyncSetUp(self):
+        # Runs the app's startup and shutdown hooks, which close the connection pool
+        self.test_app = self.asgi_server.app.test_app()
+        await self.test_app.startup()
+        self.client = self.test_app.test_client()
+        patcher = mock.patch.object(self.asgi_server, "cache", SentimentCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.test_app.shutdown()
+
+    async def analyze(self, text):
+        response = await self.client.get("/sentimentAnalyzer", query_string={"textToAnalyze": text})
+        self.assertEqual(response.status_code, 200)
+        return await response.get_data(as_text=True)
+
+    async def test_labels_come_from_the_backend(self):
+        self.assertEqual(
+            await self.analyze("I love working with Python"),
+            "The given text has been identified as POSITIVE with a score of 0.99.",
+        )
+        self.assertIn("NEGATIVE", await self.analyze("I hate working with Python"))
+        self.assertIn("NEUTRAL", await self.analyze("I am neutral on Python"))
+
+    async def test_repeated_text_is_answered_from_the_cache(self):
+        before = self.server.requests
+        for _ in range(3):
+            self.assertIn("POSITIVE", await self.analyze("good code"))
+        self.assertEqual(self.server.requests - before, 1)
+        stats = await (await self.client.get("/cacheStats")).get_json()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+    async def test_concurrent_requests_share_one_upstream_call(self):
+        self.server.latency = 0.2
+        self.addCleanup(setattr, self.server, "latency", 0.0)
+        before = self.server.requests
+        answers = await asyncio.gather(*(self.analyze("a great day") for _ in range(5)))
+        self.assertEqual(set(answers), {"The given text has been identified as POSITIVE with a score of 0.99."})
+        self.assertEqual(self.server.requests - before, 1)
+        stats = await (await self.client.get("/coalescingStats")).get_json()
+        self.assertGreaterEqual(stats["coalesced"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
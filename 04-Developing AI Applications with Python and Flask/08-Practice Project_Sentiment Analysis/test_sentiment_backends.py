@@ -0,0 +1,32 @@
+import unittest
+
+from SentimentAnalysis.backends import FallbackBackend, LexiconBackend, WatsonBackend
+
+
+class TestLexiconBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = LexiconBackend()
+
+    def test_labels_match_remote_contract(self):
+        # Same cases as test_sentiment_analysis.py, answered offline
+        self.assertEqual(self.backend.analyze("I love working with Python")["label"], "SENT_POSITIVE")
+        self.assertEqual(self.backend.analyze("I hate working with Python")["label"], "SENT_NEGATIVE")
+        self.assertEqual(self.backend.analyze("I am neutral on Python")["label"], "SENT_NEUTRAL")
+
+    def test_negation_and_boosters(self):
+        self.assertEqual(self.backend.analyze("This is not good")["label"], "SENT_NEGATIVE")
+        self.assertGreater(self.backend.score("very good"), self.backend.score("good"))
+
+    def test_empty_input_returns_none(self):
+        self.assertEqual(self.backend.analyze("   "), {"label": None, "score": None})
+
+
+class TestFallbackBackend(unittest.TestCase):
+    def test_unreachable_service_falls_back_to_local(self):
+        # Nothing listens on port 9 of localhost, so the remote call fails fast
+        backend = FallbackBackend(WatsonBackend("http://127.0.0.1:9/SentimentPredict"), LexiconBackend())
+        self.assertEqual(backend.analyze("I love working with Python")["label"], "SENT_POSITIVE")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from SentimentAnalysis import sentiment_analysis
+from SentimentAnalysis.mock_watson import start_mock_server
+from SentimentAnalysis.sentiment_analysis import get_session, sentiment_analyzer, sentiment_analyzer_batch
+
+
+class TestSentimentAnalyzerBatch(unittest.TestCase):
+    def setUp(self):
+        # Serve a local stand-in for the Watson endpoint
+        self.server, self.url = start_mock_server(latency=0.05)
+        self.addCleanup(self.server.shutdown)
+
+    def test_results_keep_input_order(self):
+        texts = ["I love working with Python", "I hate working with Python", "I am neutral on Python"] * 4
+        results = sentiment_analyzer_batch(texts, concurrency=6, url=self.url)
+        labels = [result["label"] for result in results]
+        self.assertEqual(labels, ["SENT_POSITIVE", "SENT_NEGATIVE", "SENT_NEUTRAL"] * 4)
+
+    def test_requests_run_concurrently(self):
+        start = time.perf_counter()
+        sentiment_analyzer_batch(["I love Python"] * 16, concurrency=8, url=self.url)
+        # 16 requests of 50ms each take ~100ms with 8 in flight, 800ms serially
+        self.assertLess(time.perf_counter() - start, 0.4)
+
+    def test_invalid_input_returns_none(self):
+        results = sentiment_analyzer_batch(["", "I love Python"], url=self.url)
+        self.assertEqual(results[0], {"label": None, "score": None})
+        self.assertEqual(results[1]["label"], "SENT_POSITIVE")
+
+    def test_retries_unavailable_upstream(self):
+        self.server.failures = 2
+        result = sentiment_analyzer("I love Python", url=self.url, retries=3, backoff=0.01)
+        self.assertEqual(result["label"], "SENT_POSITIVE")
+        self.assertEqual(self.server.requests, 3)
+
+    def test_failure_is_raised_without_waiting_for_the_batch(self):
+        self.server.latency = 0.2
+        self.server.failures = 1
+        start = time.perf_counter()
+        with self.assertRaises(requests.HTTPError):
+            sentiment_analyzer_batch(iter(["I love Python"] * 16), concurrency=2, url=self.url, retries=0)
+        # The 16 requests take 1.6s two at a time; the first one fails at once
+        self.assertLess(time.perf_counter() - start, 0.6)
+        # No request is sent after the failure
+        self.assertLessEqual(self.server.requests, 3)
+
+    def test_return_exceptions_keeps_the_other_results(self):
+        self.server.failures = 1
+        results = sentiment_analyzer_batch(["I love Python"] * 3, concurrency=1, url=self.url, retries=0, return_exceptions=True)
+        self.assertIsInstance(results[0], requests.HTTPError)
+        self.assertEqual([result["label"] for result in results[1:]], ["SENT_POSITIVE"] * 2)
+
+    def test_larger_pool_closes_the_old_session(self):
+        old = get_session()
+        with mock.patch.object(old, "close") as close:
+            new = get_session(sentiment_analysis._pool_size + 1)
+        close.assert_called_once_with()
+        self.assertIsNot(new, old)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from SentimentAnalysis import cache as cache_module
+from SentimentAnalysis.cache import SentimentCache, text_key
+
+POSITIVE = {"label": "SENT_POSITIVE", "score": 0.9}
+NEGATIVE = {"label": "SENT_NEGATIVE", "score": -0.8}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSentimentCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.db")
+
+    def test_hit_returns_a_copy_and_is_counted(self):
+        cache = SentimentCache(clock=self.clock)
+        self.assertIsNone(cache.get("I love Python"))
+        cache.put("I love Python", POSITIVE)
+        result = cache.get(" I  love   Python ")
+        self.assertEqual(result, POSITIVE)
+        result["label"] = "changed"
+        self.assertEqual(cache.get("I love Python"), POSITIVE)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (2, 1, 1))
+        self.assertAlmostEqual(stats["hit_ratio"], 2 / 3)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SentimentCache(max_size=2, clock=self.clock)
+        cache.put("a", POSITIVE)
+        cache.put("b", NEGATIVE)
+        cache.get("a")
+        cache.put("c", POSITIVE)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), POSITIVE)
+        self.assertEqual(cache.get("c"), POSITIVE)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_entries_expire_after_the_ttl(self):
+        cache = SentimentCache(ttl=60, clock=self.clock)
+        cache.put("a", POSITIVE)
+        self.clock.now += 59
+        self.assertEqual(cache.get("a"), POSITIVE)
+        self.clock.now += 1
+        self.assertIsNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual((stats["expirations"], stats["misses"], stats["size"]), (1, 1, 0))
+
+    def test_disk_tier_survives_a_new_cache(self):
+        SentimentCache(path=self.path, clock=self.clock).put("a", POSITIVE)
+        cache = SentimentCache(path=self.path, clock=self.clock)
+        self.assertEqual(cache.get("a"), POSITIVE)
+        self.assertEqual(cache.get("a"), POSITIVE)
+        stats = cache.stats()
+        self.assertEqual((stats["disk_hits"], stats["hits"], stats["misses"]), (1, 1, 0))
+
+    def test_expired_disk_rows_are_not_served(self):
+        SentimentCache(ttl=60, path=self.path, clock=self.clock).put("a", POSITIVE)
+        self.clock.now += 60
+        cache = SentimentCache(ttl=60, path=self.path, clock=self.clock)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_expired_disk_rows_are_purged_on_open(self):
+        SentimentCache(ttl=60, path=self.path, clock=self.clock).put("a", POSITIVE)
+        self.clock.now += 60
+        SentimentCache(ttl=60, path=self.path, clock=self.clock)
+        self.assertEqual(self._disk_keys(), set())
+
+    def test_expired_disk_rows_are_purged_while_writing(self):
+        cache = SentimentCache(ttl=60, path=self.path, clock=self.clock)
+        with mock.patch.object(cache_module, "PURGE_EVERY", 3):
+            cache.put("a", POSITIVE)
+            self.clock.now += 60
+            cache.put("b", POSITIVE)
+            self.assertEqual(self._disk_keys(), {text_key("a"), text_key("b")})
+            cache.put("c", POSITIVE)
+        self.assertEqual(self._disk_keys(), {text_key("b"), text_key("c")})
+
+    def test_wrap_calls_the_analyzer_once_per_text(self):
+        cache = SentimentCache(clock=self.clock)
+        calls = []
+
+        def analyzer(text):
+            calls.append(text)
+            return POSITIVE
+
+        cached = cache.wrap(analyzer)
+        self.assertEqual([cached("a"), cached("a "), cached("b")], [POSITIVE] * 3)
+        self.assertEqual(calls, ["a", "b"])
+
+    def _disk_keys(self):
+        with sqlite3.connect(self.path) as connection:
+            return {key for (key,) in connection.execute("SELECT key FROM sentiment_cache")}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from SentimentAnalysis.backends import LexiconBackend
+from SentimentAnalysis.dispatcher import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def setUp(self):
+        self.backend = LexiconBackend()
+
+    def start(self, batch_func, **kwargs):
+        batcher = MicroBatcher(batch_func, **kwargs)
+        self.addCleanup(batcher.close)
+        return batcher
+
+    def test_vectorized_batch_matches_single_calls(self):
+        texts = ["I love Python", "This is not good", "very good", "   ", "I am neutral on Python"]
+        self.assertEqual(self.backend.analyze_batch(texts), [self.backend.analyze(text) for text in texts])
+
+    def test_concurrent_requests_share_batches(self):
+        batcher = self.start(self.backend.analyze_batch, max_batch_size=16, max_wait_ms=50)
+        texts = [f"I {'love' if i % 2 else 'hate'} request {i}" for i in range(64)]
+        with ThreadPoolExecutor(max_workers=64) as executor:
+            results = list(executor.map(batcher.analyze, texts))
+        self.assertEqual(results, [self.backend.analyze(text) for text in texts])
+        stats = batcher.stats()
+        self.assertEqual(stats["requests"], 64)
+        self.assertLess(stats["batches"], 64)
+        self.assertLessEqual(stats["largest_batch"], 16)
+
+    def test_errors_propagate_to_every_caller(self):
+        def broken(texts):
+            raise RuntimeError("backend down")
+
+        batcher = self.start(broken, max_wait_ms=20)
+        futures = [batcher.submit(text) for text in ("a", "b", "c")]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result()
+        self.assertGreaterEqual(batcher.stats()["errors"], 1)
+
+    def test_asyncio_callers(self):
+        batcher = self.start(self.backend.analyze_batch, max_wait_ms=20)
+
+        async def main():
+            return await asyncio.gather(*(batcher.analyze_async(text) for text in ("I love it", "I hate it")))
+
+        results = asyncio.run(main())
+        self.assertEqual([result["label"] for result in results], ["SENT_POSITIVE", "SENT_NEGATIVE"])
+
+    def test_cancelled_caller_does_not_stop_the_dispatcher(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow(texts):
+            started.set()
+            release.wait(5)
+            return self.backend.analyze_batch(texts)
+
+        batcher = self.start(slow, max_wait_ms=1)
+
+        async def main():
+            cancelled = asyncio.ensure_future(batcher.analyze_async("I love it"))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            cancelled.cancel()
+            release.set()
+            with self.assertRaises(asyncio.CancelledError):
+                await cancelled
+            return await asyncio.wait_for(batcher.analyze_async("I hate it"), 5)
+
+        self.assertEqual(asyncio.run(main())["label"], "SENT_NEGATIVE")
+
+    def test_caller_cancelled_while_queued_is_skipped(self):
+        started, release = threading.Event(), threading.Event()
+        seen = []
+
+        def slow(texts):
+            seen.append(texts)
+            started.set()
+            release.wait(5)
+            return self.backend.analyze_batch(texts)
+
+        batcher = self.start(slow, max_batch_size=1, max_wait_ms=1)
+        first = batcher.submit("first")
+        started.wait(5)
+        queued = batcher.submit("queued")
+        self.assertTrue(queued.cancel())
+        release.set()
+        self.assertEqual(first.result(5)["label"], self.backend.analyze("first")["label"])
+        self.assertEqual(batcher.submit("I love it").result(5)["label"], "SENT_POSITIVE")
+        self.assertNotIn(["queued"], seen)
+
+    def test_missing_results_fail_the_callers(self):
+        batcher = self.start(lambda texts: [], max_wait_ms=1)
+        with self.assertRaises(RuntimeError):
+            batcher.submit("a").result(5)
+        self.assertEqual(batcher.stats()["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from SentimentAnalysis.mock_watson import start_mock_server
+from SentimentAnalysis.sentiment_analysis import sentiment_analyzer
+from SentimentAnalysis.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.server, self.url = start_mock_server(latency=0.1)
+        self.addCleanup(self.server.shutdown)
+        self.flight = SingleFlight()
+
+    def test_threads_share_one_upstream_call(self):
+        analyze = self.flight.wrap(lambda text: sentiment_analyzer(text, url=self.url))
+        # Same text up to whitespace, so all ten calls coalesce
+        texts = ["I love Python", " I  love Python "] * 5
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(analyze, texts))
+        self.assertTrue(all(result["label"] == "SENT_POSITIVE" for result in results))
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(self.flight.stats()["coalesced"], 9)
+
+    def test_invalid_input_result_is_shared(self):
+        analyze = self.flight.wrap(lambda text: sentiment_analyzer(text, url=self.url))
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(analyze, [""] * 4))
+        self.assertEqual(results, [{"label": None, "score": None}] * 4)
+        self.assertEqual(self.server.requests, 1)
+
+    def test_errors_propagate_to_every_caller(self):
+        started = threading.Event()
+
+        def failing(text):
+            started.set()
+            time.sleep(0.1)
+            raise ConnectionError("upstream down")
+
+        analyze = self.flight.wrap(failing)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(analyze, "text")]
+            started.wait()
+            futures += [executor.submit(analyze, "text") for _ in range(2)]
+            for future in futures:
+                self.assertRaises(ConnectionError, future.result)
+        self.assertEqual(self.flight.stats()["executions"], 1)
+
+    def test_asyncio_tasks_share_one_call(self):
+        calls = []
+
+        async def slow_analyzer(text):
+            calls.append(text)
+            await asyncio.sleep(0.05)
+            return {"label": "SENT_NEUTRAL", "score": 0.0}
+
+        analyze = self.flight.wrap_async(slow_analyzer)
+
+        async def main():
+            return await asyncio.gather(*(analyze("same text") for _ in range(20)))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"label": "SENT_NEUTRAL", "score": 0.0}] * 20)
+        self.assertEqual(self.flight.stats()["in_flight"], 0)
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        calls = []
+
+        async def slow_analyzer(text):
+            calls.append(text)
+            await asyncio.sleep(0.05)
+            return {"label": "SENT_POSITIVE", "score": 0.9}
+
+        analyze = self.flight.wrap_async(slow_analyzer)
+
+        async def main():
+            leader = asyncio.ensure_future(analyze("same text"))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(analyze("same text"))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        self.assertEqual(asyncio.run(main()), {"label": "SENT_POSITIVE", "score": 0.9})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.flight.stats()["in_flight"], 0)
+
+    def test_call_is_cancelled_when_every_caller_is(self):
+        finished = []
+
+        async def slow_analyzer(text):
+            await asyncio.sleep(0.05)
+            finished.append(text)
+            return {"label": "SENT_NEUTRAL", "score": 0.0}
+
+        analyze = self.flight.wrap_async(slow_analyzer)
+
+        async def main():
+            callers = [asyncio.ensure_future(analyze("same text")) for _ in range(3)]
+            await asyncio.sleep(0)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            # A new caller starts a fresh call rather than joining the cancelled one
+            return await analyze("same text")
+
+        self.assertEqual(asyncio.run(main()), {"label": "SENT_NEUTRAL", "score": 0.0})
+        self.assertEqual(finished, ["same text"])
+        self.assertEqual(self.flight.stats()["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()